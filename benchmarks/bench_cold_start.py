@@ -0,0 +1,60 @@
+"""Benchmark the first validation of a short-lived process.
+
+Every run starts a new interpreter which imports the validator and validates
+one request, loading the schemas either from the precompiled artifact or
+from the YAML file.
+
+Usage:
+    python -m benchmarks.bench_cold_start
+
+"""
+
+# Import built-in modules
+from __future__ import print_function
+import subprocess
+import sys
+import time
+
+VALIDATE = ('import time\n'
+            'from rayvision_api.validator import validate_data\n'
+            'start = time.time()\n'
+            'validate_data({"taskIds": [1]}, "queryTaskInfo")\n'
+            'print(time.time() - start)\n')
+
+# Make the artifact look missing so that the YAML file is parsed.
+WITHOUT_ARTIFACT = ('from rayvision_api import schema_artifact\n'
+                    'schema_artifact.read_artifact = lambda path: None\n')
+
+
+def measure(code, runs=10):
+    """Run the code in new processes.
+
+    Args:
+        code (str): The code to run, printing the time of the validation.
+        runs (int, optional): The number of processes.
+
+    Returns:
+        tuple: The median wall time of the processes and of the first
+            validation, in seconds.
+
+    """
+    processes = []
+    validations = []
+    for _ in range(runs):
+        start = time.time()
+        output = subprocess.check_output([sys.executable, '-c', code])
+        processes.append(time.time() - start)
+        validations.append(float(output.decode('utf-8').split()[-1]))
+    return (sorted(processes)[runs // 2], sorted(validations)[runs // 2])
+
+
+def main():
+    for name, code in (('artifact', VALIDATE),
+                       ('yaml', WITHOUT_ARTIFACT + VALIDATE)):
+        process, validation = measure(code)
+        print('{:8} {:.1f} ms per process, {:.1f} ms for the first '
+              'validation'.format(name, process * 1000, validation * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""Benchmark the signing of the requests.
+
+Compare the current signing path with the one of the 1.x releases, which
+deep-copied the headers and the body four times per request, and the
+allocations of signing the whole string with the streamed signature, and
+the signing of the small polling requests with and without the precomputed
+signing context of the connection.
+
+Usage:
+    python -m benchmarks.bench_signature
+
+"""
+
+# Import built-in modules
+from __future__ import print_function
+import collections
+import copy
+import json
+import timeit
+import tracemalloc
+
+# Import local modules
+from rayvision_api import signature
+from rayvision_api.constants import HEADERS
+
+DOMAIN = 'task.renderbus.com'
+API_URL = '/api/render/task/taskJsonFile'
+ACCESS_KEY = 'fa5sd565as2fd65'
+
+
+def legacy_generate_headers_body_str(domain_name, api_url, header, body):
+    """str: The signing string as generated by the 1.x releases."""
+    header = copy.deepcopy(header)
+    body = copy.deepcopy(body)
+    try:
+        header.pop('signature')
+        header.pop('Content-Type')
+    except KeyError:
+        pass
+    copy_header = copy.deepcopy(header)
+    body = copy.deepcopy(body)
+    copy_header.update(body)
+    new_header = signature.formatted_headers(copy_header)
+    header_body_dict = collections.OrderedDict(
+        (key, new_header[key]) for key in sorted(new_header))
+    header_body_list = [
+        '{0}={1}'.format(key, value)
+        for key, value in header_body_dict.items()
+    ]
+    return '[POST]{domain_name}:{api_url}&{header_body_str}'.format(
+        domain_name=domain_name,
+        api_url=api_url,
+        header_body_str='&'.join(header_body_list)
+    )
+
+
+def get_headers():
+    """dict: The headers of a request, as prepared by the connection."""
+    headers = dict(HEADERS)
+    headers.update({'accessId': 'df6d1d6s3dc56ds6', 'platform': '2',
+                    'UTCTimestamp': '1590000000', 'nonce': '123456'})
+    return headers
+
+
+def get_task_json_body(size_mb=4):
+    """dict: The body of a ``taskJsonFile`` request of about the size."""
+    layers = {
+        'layer{}'.format(index): {
+            'renderable': '1',
+            'frames': '1-100[1]',
+            'cameras': ['camera{}'.format(camera) for camera in range(20)],
+            'padding': 'x' * 500,
+        }
+        for index in range(size_mb * 1024 * 1024 // 800)
+    }
+    return {
+        'taskId': '1658434',
+        'fileName': 'task.json',
+        'content': json.dumps({'scene_info_render': layers}),
+    }
+
+
+def get_nested_body(count=2000):
+    """dict: A nested body, e.g. the plugins of the render environments."""
+    return {
+        'renderEnvs': [
+            {'envId': index, 'pluginIds': list(range(10))}
+            for index in range(count)
+        ],
+    }
+
+
+def count_deepcopies(func, *args):
+    """int: Count the calls of ``copy.deepcopy`` done by the function."""
+    calls = []
+    deepcopy = copy.deepcopy
+
+    def _counting_deepcopy(*deepcopy_args, **kwargs):
+        calls.append(1)
+        return deepcopy(*deepcopy_args, **kwargs)
+
+    copy.deepcopy = _counting_deepcopy
+    try:
+        func(*args)
+    finally:
+        copy.deepcopy = deepcopy
+    return len(calls)
+
+
+def measure_peak(func, *args):
+    """int: Get the peak of the memory allocated by the function."""
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def sign_whole_string(domain_name, api_url, header, body):
+    """bytes: Sign the whole formatted string."""
+    return signature.generate_signature(
+        ACCESS_KEY,
+        signature.generate_headers_body_str(domain_name, api_url, header,
+                                            body))
+
+
+def sign_streamed(domain_name, api_url, header, body):
+    """bytes: Feed the formatted string to the HMAC piece by piece."""
+    return signature.generate_headers_body_signature(ACCESS_KEY, domain_name,
+                                                     api_url, header, body)
+
+
+def bench_signing_context(number=20000):
+    """Compare the signatures of small requests with the signing context."""
+    headers = get_headers()
+    dynamic_headers = {'UTCTimestamp': headers['UTCTimestamp'],
+                       'nonce': headers['nonce']}
+    body = {'taskIds': [1658434], 'language': '0'}
+    api_url = '/api/render/task/queryTaskInfo'
+    context = signature.SigningContext(ACCESS_KEY, DOMAIN, headers)
+
+    def _sign_without_context():
+        return signature.generate_headers_body_signature(
+            ACCESS_KEY, DOMAIN, api_url, headers, body)
+
+    def _sign_with_context():
+        return context.sign(api_url, dynamic_headers, body)
+
+    assert _sign_without_context() == _sign_with_context()
+    print('queryTaskInfo body')
+    for name, func in (('without context', _sign_without_context),
+                       ('with context', _sign_with_context)):
+        seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+        print('  {:16} {:.2f} us per signature'.format(name, seconds * 1e6))
+
+
+def main():
+    headers = get_headers()
+    for title, body in (('taskJsonFile body', get_task_json_body()),
+                        ('nested body', get_nested_body())):
+        args = (DOMAIN, API_URL, headers, body)
+        legacy = legacy_generate_headers_body_str(*args)
+        current = signature.generate_headers_body_str(*args)
+        assert (signature.generate_signature(ACCESS_KEY, legacy) ==
+                signature.generate_signature(ACCESS_KEY, current))
+        print('{} ({:.1f} MB encoded)'.format(title,
+                                               len(json.dumps(body)) / 1e6))
+        for name, func in (('legacy', legacy_generate_headers_body_str),
+                           ('current', signature.generate_headers_body_str)):
+            seconds = min(timeit.repeat(lambda: func(*args), number=5,
+                                        repeat=3)) / 5
+            print('  {:8} deepcopy calls: {}, {:.2f} ms per call'.format(
+                name, count_deepcopies(func, *args), seconds * 1000))
+        assert sign_whole_string(*args) == sign_streamed(*args)
+        for name, func in (('whole', sign_whole_string),
+                           ('streamed', sign_streamed)):
+            seconds = min(timeit.repeat(lambda: func(*args), number=5,
+                                        repeat=3)) / 5
+            print('  {:8} peak allocation: {:.2f} MB, {:.2f} ms per '
+                  'signature'.format(name, measure_peak(func, *args) / 1e6,
+                                     seconds * 1000))
+    bench_signing_context()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark the submission of a sequence of shots.
+
+Compare ``submit_job`` called for each shot, three serial requests per job,
+with ``submit_jobs`` which allocates the task IDs at once and submits the
+jobs concurrently, against a local server answering with a fixed latency.
+
+Usage:
+    python -m benchmarks.bench_submit
+
+"""
+
+# Import built-in modules
+from __future__ import print_function
+from itertools import count
+import json
+import threading
+import time
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler
+    from BaseHTTPServer import HTTPServer
+    from SocketServer import ThreadingMixIn
+except ImportError:
+    from http.server import BaseHTTPRequestHandler
+    from http.server import HTTPServer
+    from socketserver import ThreadingMixIn
+
+# Import local modules
+from rayvision_api.connect import Connect
+from rayvision_api.operators import RenderJobs
+
+LATENCY = 0.02
+TASK_IDS = count(1000000)
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        body = json.loads(self.rfile.read(
+            int(self.headers['Content-Length'])).decode('utf-8'))
+        time.sleep(LATENCY)
+        data = {}
+        if self.path.endswith('createTask'):
+            data = {'taskIdList': [next(TASK_IDS)
+                                   for _ in range(body['count'])]}
+        content = json.dumps({'code': 200, 'message': 'success',
+                              'data': data}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+def main(shots=500, max_workers=16):
+    server = _Server(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    domain = '127.0.0.1:{}'.format(server.server_address[1])
+    connect = Connect('access_id', 'access_key', 'http', domain, '2',
+                      pool_maxsize=max_workers)
+    render_jobs = RenderJobs(connect)
+    jobs_info = [{'task_info': {'frames': '1-100'}, 'shot': index}
+                 for index in range(shots)]
+    print('{} shots, {:.0f} ms per request'.format(shots, LATENCY * 1000))
+
+    start = time.time()
+    for job_info in jobs_info:
+        render_jobs.submit_job(job_info)
+    print('{:26} {:6.2f} s'.format('submit_job loop', time.time() - start))
+
+    start = time.time()
+    submissions = render_jobs.submit_jobs(jobs_info, max_workers=max_workers)
+    assert all(submission.ok for submission in submissions)
+    print('{:26} {:6.2f} s'.format(
+        'submit_jobs ({} workers)'.format(max_workers), time.time() - start))
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark the encoding of the task.json uploads.
+
+Compare the encoding of a synthetic scene info of about 50 MB by the 1.x
+releases, which encoded the task info, encoded the whole body again and
+left the text body to be encoded to bytes when sent, with the body written
+in slices straight to bytes, with and without the gzip compression.
+
+The task info is still held as a JSON string along with the body, the
+signature covers it, so the peak stays about twice the size of the task
+info without the compression.
+
+Usage:
+    python -m benchmarks.bench_upload
+
+"""
+
+# Import built-in modules
+from __future__ import print_function
+import gc
+import json
+import time
+import tracemalloc
+
+# Import local modules
+from rayvision_api.connect import Connect
+from rayvision_api.url import ApiUrl
+
+SIZE = 50 * 1024 * 1024
+
+
+def get_job_info(size=SIZE):
+    """dict: Get the task info of a layered scene of about ``size`` bytes."""
+    layer = {
+        'renderable': '1',
+        'frames': '1-250[1]',
+        'camera': ['|persp|perspShape', '|shot_cam|shot_camShape'],
+        'option': 'arnold',
+        'image_format': 'exr',
+        'common': {'width': '1920', 'height': '1080', 'all_camera': []},
+        'paths': ['D:/project/assets/textures/set_{:04d}/diffuse.<UDIM>.tx'
+                  .format(index) for index in range(20)],
+    }
+    layer_size = len(json.dumps(layer))
+    # The layers are listed by both the scene info sections.
+    layers = {'layer_{:06d}'.format(index): dict(layer)
+              for index in range(size // layer_size // 2)}
+    return {
+        'software_config': {'cg_name': 'Maya', 'cg_version': '2018'},
+        'task_info': {'frames_per_task': '1', 'ram': '64'},
+        'scene_info_render': {'renderlayer': layers},
+        'scene_info': {'renderlayer': layers},
+    }
+
+
+def legacy_encode(connect, job_info):
+    """bytes: Encode the upload as the 1.x releases did."""
+    data = {'taskId': '1000', 'fileName': 'task.json',
+            'content': json.dumps(job_info)}
+    body = json.dumps(data)
+    connect.signing_context.sign(ApiUrl.taskJsonFile, {}, data)
+    # The text body was encoded by ``http.client`` when sent.
+    return body.encode('iso-8859-1')
+
+
+def encode(connect, job_info):
+    """bytes: Encode the upload as ``RenderJobs._post_json`` does."""
+    data = {'taskId': '1000', 'fileName': 'task.json',
+            'content': json.dumps(job_info, separators=(',', ':'))}
+    return connect.prepare(ApiUrl.taskJsonFile, data, validator=False).body
+
+
+def measure(function, *args):
+    """tuple: The result, the seconds and the peak of the allocations.
+
+    The allocations are traced by a second call, the tracing slows down the
+    encoding of the small objects.
+
+    """
+    gc.collect()
+    start = time.time()
+    result = function(*args)
+    elapsed = time.time() - start
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    job_info = get_job_info()
+    print('task info: {:.1f} MB'.format(
+        len(json.dumps(job_info)) / 1024.0 / 1024))
+    connect = Connect('access_id', 'access_key', 'https',
+                      'task.renderbus.com', '2')
+    compressed = Connect('access_id', 'access_key', 'https',
+                         'task.renderbus.com', '2', compress_min_size=1024)
+    for name, function, args in (
+            ('1.x double encoding', legacy_encode, (connect, job_info)),
+            ('sliced body', encode, (connect, job_info)),
+            ('sliced body, gzip', encode, (compressed, job_info))):
+        body, elapsed, peak = measure(function, *args)
+        print('{:22} {:6.2f} s  peak {:6.1f} MB  body {:6.1f} MB'.format(
+            name, elapsed, peak / 1024.0 / 1024, len(body) / 1024.0 / 1024))
+        del body
+
+
+if __name__ == '__main__':
+    main()
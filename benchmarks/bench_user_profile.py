@@ -0,0 +1,76 @@
+"""Benchmark the attribute access of the user profile.
+
+Compare the ``__getattribute__`` wrapped in ``lru_cache(maxsize=2)`` of the
+1.x releases with the ``__getattr__`` fallback to the profile index.
+
+Usage:
+    python -m benchmarks.bench_user_profile
+
+"""
+
+# Import built-in modules
+from __future__ import print_function
+from functools import lru_cache
+import timeit
+
+# Import local modules
+from rayvision_api.connect import Connect
+from rayvision_api.operators import UserProfile
+
+USER_INFO = {
+    'userId': 10001136,
+    'userName': 'rayvision',
+    'email': 'rayvision@example.com',
+    'taskOverTime': 12,
+    'input_bid': '10201',
+}
+
+
+class LegacyUserProfile(UserProfile):
+    """The user profile with the attribute access of the 1.x releases."""
+
+    @lru_cache(maxsize=2)
+    def __getattribute__(self, attribute):
+        _getattr = super(UserProfile, self).__getattribute__
+        try:
+            value = _getattr(attribute)
+        except AttributeError:
+            try:
+                value = self.profile[attribute]
+            except KeyError:
+                raise AttributeError(attribute)
+        return value
+
+
+def main(number=200000):
+    connect = Connect('access_id', 'access_key', 'https',
+                      'task.renderbus.com', '2')
+    print('{:16} {:>10} {:>10}'.format('attribute', 'legacy', 'current'))
+    profiles = []
+    for profile_class in (LegacyUserProfile, UserProfile):
+        user_profile = profile_class(connect, auto_login=False)
+        user_profile._merge_user_info([USER_INFO])  # pylint: disable=protected-access
+        profiles.append(user_profile)
+    for attribute in ('_connect', 'profile', 'user_name', 'task_over_time'):
+        timings = []
+        for user_profile in profiles:
+            code = 'user_profile.{}'.format(attribute)
+            seconds = min(timeit.repeat(code, number=number, repeat=3,
+                                        globals={'user_profile':
+                                                 user_profile})) / number
+            timings.append(seconds * 1e9)
+        print('{:16} {:>7.0f} ns {:>7.0f} ns'.format(attribute, *timings))
+    # Alternate the attributes, the two slots of the legacy cache thrash.
+    code = ('user_profile.user_name; user_profile.email; '
+            'user_profile.task_over_time')
+    timings = []
+    for user_profile in profiles:
+        seconds = min(timeit.repeat(code, number=number, repeat=3,
+                                    globals={'user_profile':
+                                             user_profile})) / number
+        timings.append(seconds * 1e9)
+    print('{:16} {:>7.0f} ns {:>7.0f} ns'.format('3 attributes', *timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark the validation of the data of the requests.
+
+Compare the validation of the 1.x releases, which read the schema file and
+built a new ``cerberus.Validator`` for every request, with the validators
+prepared once by the schema registry, and the cerberus validators with
+the compiled check functions over all the schema names.
+
+Usage:
+    python -m benchmarks.bench_validator
+
+"""
+
+# Import built-in modules
+from __future__ import print_function
+import timeit
+
+# Import third-party modules
+from cerberus import Validator
+
+# Import local modules
+from rayvision_api.constants import API_VERSION
+from rayvision_api.file_operator import read_yaml
+from rayvision_api.paths import get_schema_file
+from rayvision_api.validator import SchemaRegistry
+from rayvision_api.validator import validate_data
+
+REQUESTS = (
+    ('queryTaskInfo', {'taskIds': [1658434]}),
+    ('queryTaskFrames', {'taskId': '1658434', 'pageNum': 1,
+                         'pageSize': 100}),
+    ('getTaskList', {'pageNum': 1, 'pageSize': 50, 'statusList': [0, 5]}),
+)
+
+
+def legacy_validate_data(data, schema_name):
+    """dict: Validate the data as the 1.x releases did."""
+    schema = read_yaml(get_schema_file('schema_v{}'.format(API_VERSION)))
+    validator = Validator(schema[schema_name])
+    validator.allow_unknown = True
+    if not validator.validate(data):
+        raise ValueError(
+            'Validation failure(s): {0}'.format(validator.errors))
+    return data
+
+
+# A valid value of each type of the simple schemas.
+SAMPLE_VALUES = {
+    'dict': {'key': 'value'},
+    'integer': 1,
+    'list': [1, 2, 3],
+    'number': 1.5,
+    'string': 'value',
+}
+
+
+def get_sample_document(schema):
+    """dict: Get a valid document of a simple schema."""
+    return {
+        field: SAMPLE_VALUES.get(rules.get('type'))
+        for field, rules in schema.items()
+        if rules.get('type') in SAMPLE_VALUES
+    }
+
+
+def compare_engines(number=2000):
+    """Compare cerberus with the compiled checks over all the schemas."""
+    cerberus_registry = SchemaRegistry(fast_path=False)
+    compiled_registry = SchemaRegistry()
+    print('{:24} {:>12} {:>12}'.format('schema', 'cerberus', 'compiled'))
+    for schema_name in sorted(compiled_registry.schemas):
+        if compiled_registry.get_check(schema_name) is None:
+            print('{:24} {:>12}'.format(schema_name, 'not compiled'))
+            continue
+        document = get_sample_document(
+            compiled_registry.schemas[schema_name])
+        timings = []
+        for registry in (cerberus_registry, compiled_registry):
+            assert registry.validate(schema_name, document) == {}
+            seconds = min(timeit.repeat(
+                lambda: registry.validate(schema_name, document),
+                number=number, repeat=3)) / number
+            timings.append(seconds * 1e6)
+        print('{:24} {:>9.1f} us {:>9.1f} us'.format(schema_name, *timings))
+
+
+def main():
+    for schema_name, data in REQUESTS:
+        print(schema_name)
+        for name, func, number in (('legacy', legacy_validate_data, 20),
+                                   ('registry', validate_data, 2000)):
+            func(data, schema_name)
+            seconds = min(timeit.repeat(lambda: func(data, schema_name),
+                                        number=number, repeat=3)) / number
+            print('  {:8} {:.3f} ms per request'.format(name, seconds * 1000))
+    compare_engines()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,16 +1,48 @@
 """A Python-based API for Using Renderbus cloud rendering service."""
 
-# pylint: disable=import-error
-from pkg_resources import DistributionNotFound, get_distribution
-
-# Import local modules
-from rayvision_api.core import RayvisionAPI
+# Import built-in modules
+import sys
 
 # All API of the public.
 __all__ = ['RayvisionAPI']
 
-try:
-    __version__ = get_distribution(__name__).version
-except DistributionNotFound:
-    # Package is not installed.
-    __version__ = '0.0.0-dev.1'
+
+def _get_version():
+    """str: Get the version of the installed package."""
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:
+        # pylint: disable=import-error
+        from pkg_resources import DistributionNotFound as PackageNotFoundError
+        from pkg_resources import get_distribution
+
+        def version(name):
+            return get_distribution(name).version
+    try:
+        return version(__name__)
+    except PackageNotFoundError:
+        # Package is not installed.
+        return '0.0.0-dev.1'
+
+
+def __getattr__(name):
+    """Import the public API and the version on first access.
+
+    The plugins of the DCC software import the package at startup, importing
+    ``requests``, ``cerberus`` and the others is deferred until they are
+    used.
+
+    """
+    if name == 'RayvisionAPI':
+        from rayvision_api.core import RayvisionAPI
+        return RayvisionAPI
+    if name == '__version__':
+        return _get_version()
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__,
+                                                                    name))
+
+
+if sys.version_info < (3, 7):
+    # The module ``__getattr__`` is not supported (PEP 562).
+    from rayvision_api.core import RayvisionAPI
+    __version__ = _get_version()
@@ -0,0 +1,141 @@
+"""Provides the transport adapter used by the session of the connection."""
+
+# Import built-in modules
+import threading
+
+# Import third-party modules
+from requests.adapters import HTTPAdapter
+
+# Import local modules
+from rayvision_api.constants import DEFAULT_POOL_CONNECTIONS
+from rayvision_api.constants import DEFAULT_POOL_MAXSIZE
+
+
+class ConnectionStats(object):
+    """Thread-safe counters of the connections of a transport."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+
+    def record_request(self):
+        """Count a request sent by the transport."""
+        with self._lock:
+            self.requests += 1
+
+    def record_connection(self):
+        """Count a new (TCP and TLS) connection opened by the transport."""
+        with self._lock:
+            self.new_connections += 1
+
+    @property
+    def reused_connections(self):
+        """int: The number of requests sent on a kept-alive connection."""
+        return max(self.requests - self.new_connections, 0)
+
+    def as_dict(self):
+        """dict: The snapshot of the counters."""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'new_connections': self.new_connections,
+                'reused_connections': max(
+                    self.requests - self.new_connections, 0),
+            }
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, self.as_dict())
+
+
+def _counting_pool_class(pool_class, stats):
+    """type: Subclass the urllib3 pool class to count the new connections.
+
+    The connections are counted when they connect, which includes the
+    reconnections of the connections dropped by the server.
+
+    """
+    connection_class = pool_class.ConnectionCls
+
+    def connect(self):
+        stats.record_connection()
+        return connection_class.connect(self)
+
+    counting_connection_class = type(connection_class.__name__,
+                                     (connection_class,),
+                                     {'connect': connect})
+    return type(pool_class.__name__, (pool_class,),
+                {'ConnectionCls': counting_connection_class})
+
+
+class TransportAdapter(HTTPAdapter):
+    """The ``HTTPAdapter`` with pool, keep-alive and timeout settings.
+
+    Examples:
+        .. code-block:: python
+
+            >>> adapter = TransportAdapter(pool_maxsize=32, timeout=(3, 30))
+            >>> session = requests.Session()
+            >>> session.mount('https://', adapter)
+            >>> print(adapter.stats)
+
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ['keep_alive', 'timeout']
+
+    def __init__(self,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 pool_block=False,
+                 keep_alive=True,
+                 timeout=None,
+                 max_retries=0):
+        """Initialize the adapter.
+
+        Args:
+            pool_connections (int, optional): The number of connection pools
+                to cache, one pool per host.
+            pool_maxsize (int, optional): The maximum number of connections
+                to keep alive in each pool.
+            pool_block (bool, optional): Whether the requests wait for a free
+                connection when the pool is exhausted, instead of opening
+                (and then discarding) an extra connection.
+            keep_alive (bool, optional): Whether the connections are kept
+                alive between the requests.
+            timeout (float or tuple, optional): The default ``(connect, read)``
+                timeouts in seconds of the requests.
+            max_retries (int or urllib3.util.Retry, optional): The retries of
+                urllib3.
+
+        """
+        self.stats = ConnectionStats()
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        super(TransportAdapter, self).__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            pool_block=pool_block)
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Initialize the pool manager with the counting pool classes."""
+        if not hasattr(self, 'stats'):
+            # Unpickled adapters start with new counters.
+            self.stats = ConnectionStats()
+        super(TransportAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: _counting_pool_class(pool_class, self.stats)
+            for scheme, pool_class in
+            self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+    # pylint: disable=arguments-differ
+    def send(self, request, timeout=None, **kwargs):
+        """Send the request with the default timeout and keep-alive."""
+        if timeout is None:
+            timeout = self.timeout
+        if not self.keep_alive:
+            request.headers['Connection'] = 'close'
+        self.stats.record_request()
+        return super(TransportAdapter, self).send(request, timeout=timeout,
+                                                  **kwargs)
@@ -0,0 +1,34 @@
+"""The asyncio-native API of the rayvision_api.
+
+Requires Python 3.6 and ``aiohttp``, install it by
+``pip install rayvision_api[async]``.
+
+"""
+
+# Import built-in modules
+import sys
+
+# The async generators of the pagination need Python 3.6.
+if sys.version_info < (3, 6):
+    raise ImportError('The asyncio API of the rayvision_api requires '
+                      'Python 3.6 or later.')
+
+# Import local modules
+from rayvision_api.aio.connect import AsyncConnect
+from rayvision_api.aio.core import AsyncRayvisionAPI
+from rayvision_api.aio.operators import AsyncProjectSettings
+from rayvision_api.aio.operators import AsyncRenderConfig
+from rayvision_api.aio.operators import AsyncRenderJobs
+from rayvision_api.aio.operators import AsyncSubmissionContext
+from rayvision_api.aio.operators import AsyncUserProfile
+
+# All public api.
+__all__ = (
+    'AsyncConnect',
+    'AsyncRayvisionAPI',
+    'AsyncProjectSettings',
+    'AsyncRenderConfig',
+    'AsyncRenderJobs',
+    'AsyncSubmissionContext',
+    'AsyncUserProfile'
+)
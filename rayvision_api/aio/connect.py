@@ -0,0 +1,297 @@
+"""Provides asyncio session connections."""
+
+# Import built-in modules
+import asyncio
+
+# Import third-party modules
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+# Import local modules
+from rayvision_api.adapters import ConnectionStats
+from rayvision_api.adapters import DEFAULT_POOL_CONNECTIONS
+from rayvision_api.connect import Connect
+from rayvision_api.exception import RayvisionAPIError
+
+# The errors raised before the request reached the server.
+_UNSENT_ERRORS = tuple(
+    getattr(aiohttp, name) for name in ('ClientConnectorError',
+                                        'ConnectionTimeoutError')
+    if hasattr(aiohttp, name))
+
+# The default limit of the simultaneous connections, same as ``aiohttp``.
+DEFAULT_ASYNC_POOL_MAXSIZE = 100
+
+
+def _client_timeout(timeout):
+    """aiohttp.ClientTimeout: Convert the ``(connect, read)`` timeouts."""
+    if timeout is None:
+        return None
+    if isinstance(timeout, (tuple, list)):
+        connect_timeout, read_timeout = timeout
+    else:
+        connect_timeout = read_timeout = timeout
+    return aiohttp.ClientTimeout(sock_connect=connect_timeout,
+                                 sock_read=read_timeout)
+
+
+class AsyncConnect(Connect):
+    """Provides asyncio session connections.
+
+    The signing, the validation of the data and the mapping of the errors are
+    shared with :class:`rayvision_api.connect.Connect`, only the transport is
+    replaced by an ``aiohttp.ClientSession``.
+
+    """
+
+    def __init__(self,
+                 access_id,
+                 access_key,
+                 protocol,
+                 domain,
+                 render_platform,
+                 headers=None,
+                 session=None,
+                 pool_maxsize=DEFAULT_ASYNC_POOL_MAXSIZE,
+                 keep_alive=True,
+                 timeout=None,
+                 retry=None,
+                 rate_limiter=None,
+                 cache=None,
+                 disk_cache=None,
+                 compress_min_size=None):
+        """Initialize AsyncConnect instance.
+
+        Args:
+            access_id (str): The access id of API.
+            access_key (str): The access key of the API.
+            domain (str, optional): The domain address of the API.
+            render_platform (str, optional): The platform of renderFarm.
+            protocol (str, optional): The requests protocol.
+            session (aiohttp.ClientSession, optional): The session of the
+                aiohttp, it will be created in the running event loop on the
+                first request if not given.
+            pool_maxsize (int, optional): The maximum number of simultaneous
+                connections, the further requests wait for a free one.
+            keep_alive (bool, optional): Whether the connections are kept
+                alive between the requests.
+            timeout (float or tuple, optional): The default ``(connect, read)``
+                timeouts in seconds of the requests.
+            retry (rayvision_api.retry.RetryPolicy, optional): The policy to
+                retry the failed requests.
+            rate_limiter (rayvision_api.rate_limit.RateLimiter, optional):
+                Limit the rate of the requests.
+            cache (rayvision_api.cache.ResponseCache or bool, optional): The
+                cache of the responses of the queries, a new one by default,
+                ``False`` disables the caching.
+            disk_cache (rayvision_api.disk_cache.DiskCache or bool, optional):
+                The persistent cache of the responses of the catalog queries.
+            compress_min_size (int, optional): The minimum size in bytes of
+                the bodies sent gzip compressed, no compression by default.
+
+        The pool options are ignored if a session is given.
+
+        Raises:
+            ImportError: The ``aiohttp`` is not installed.
+
+        """
+        if aiohttp is None:
+            raise ImportError('The "aiohttp" is required by the AsyncConnect, '
+                              'please install it by '
+                              '"pip install rayvision_api[async]".')
+        super(AsyncConnect, self).__init__(access_id,
+                                           access_key,
+                                           protocol,
+                                           domain,
+                                           render_platform,
+                                           headers=headers,
+                                           session=session,
+                                           pool_connections=(
+                                               DEFAULT_POOL_CONNECTIONS),
+                                           pool_maxsize=pool_maxsize,
+                                           keep_alive=keep_alive,
+                                           timeout=timeout,
+                                           retry=retry,
+                                           rate_limiter=rate_limiter,
+                                           cache=cache,
+                                           disk_cache=disk_cache,
+                                           compress_min_size=compress_min_size)
+        self._stats = None
+
+    def _create_session(self):
+        """The ``aiohttp.ClientSession`` must be created in the event loop."""
+        return None
+
+    @property
+    def session(self):
+        """aiohttp.ClientSession: The session used to send requests."""
+        if self._session_request is None or self._session_request.closed:
+            self._session_request = self._create_client_session()
+        return self._session_request
+
+    def _create_client_session(self):
+        """aiohttp.ClientSession: Create the session with the pool options."""
+        self._stats = self._stats or ConnectionStats()
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_create_end.append(
+            self._on_connection_create_end)
+        connector = aiohttp.TCPConnector(
+            limit=self._pool_options['pool_maxsize'],
+            force_close=not self._pool_options['keep_alive'])
+        options = {}
+        timeout = _client_timeout(self._pool_options['timeout'])
+        if timeout:
+            options['timeout'] = timeout
+        return aiohttp.ClientSession(connector=connector,
+                                     trace_configs=[trace_config],
+                                     **options)
+
+    # pylint: disable=unused-argument
+    async def _on_request_start(self, session, context, params):
+        self._stats.record_request()
+
+    async def _on_connection_create_end(self, session, context, params):
+        self._stats.record_connection()
+
+    @property
+    def connection_stats(self):
+        """dict: The counters of the requests and the new connections."""
+        return self._stats.as_dict() if self._stats else {}
+
+    async def post(self, api_url, post_data=None, validator=True,
+                   timeout=None, use_cache=True):
+        """Send an post request and return data object if no error occurred.
+
+        Args:
+            api_url (rayvision_api.api.url.URL or str): The URL address of the
+                corresponding action network Request.
+            post_data (dict, optional): Request data.
+            validator (bool, optional): Validator the data.
+            timeout (float or tuple, optional): The ``(connect, read)``
+                timeouts in seconds of this request.
+            use_cache (bool, optional): Whether a cached response may be
+                returned, the new response is cached anyway.
+
+        Returns:
+            dict or List: Response data.
+
+        Raises:
+            RayVisionAPIError: The request failed, It returns the error ID,
+                the error message, and the request address.
+
+        """
+        if use_cache:
+            hit, data = self.get_cached(api_url, post_data)
+            if hit:
+                return data
+        generation = self.get_cache_generation(api_url)
+        data = await self.send(self.prepare(api_url, post_data, validator),
+                               timeout=timeout)
+        self.set_cached(api_url, post_data, data, generation)
+        return data
+
+    async def send(self, prepared, timeout=None):
+        """Send a prepared request and return data object if no error occurred.
+
+        The cached responses made stale by the request are removed once it
+        succeeded.
+
+        Args:
+            prepared (rayvision_api.connect.SignedRequest): The request
+                prepared by ``prepare``.
+            timeout (float or tuple, optional): The ``(connect, read)``
+                timeouts in seconds of this request.
+
+        Returns:
+            dict or List: Response data.
+
+        Raises:
+            RayVisionAPIError: The request failed, It returns the error ID,
+                the error message, and the request address.
+
+        """
+        api_url = prepared.api_url
+        options = {}
+        if timeout is not None:
+            options['timeout'] = _client_timeout(timeout)
+        attempt = 0
+        while True:
+            while self.rate_limiter:
+                # The file token bucket blocks on its lock and file I/O.
+                delay = await asyncio.get_event_loop().run_in_executor(
+                    None, self.rate_limiter.reserve, api_url)
+                if not delay:
+                    break
+                await asyncio.sleep(delay)
+            headers = self._get_headers(prepared, attempt)
+            try:
+                async with self.session.post(prepared.address,
+                                             data=prepared.body,
+                                             headers=headers,
+                                             **options) as response:
+                    status_code = response.status
+                    if not self._should_retry(api_url, attempt,
+                                              status_code=status_code):
+                        if self.retry.is_retryable_status(status_code):
+                            raise RayvisionAPIError(status_code,
+                                                    response.reason,
+                                                    str(response.url))
+                        json_response = await response.json(
+                            content_type=None)
+                        break
+                self.logger.warning('Retry %s (%s): HTTP %s', api_url,
+                                    attempt + 1, status_code)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+                if not self._should_retry(api_url, attempt, error):
+                    raise
+                self.logger.warning('Retry %s (%s): %r', api_url,
+                                    attempt + 1, error)
+            await asyncio.sleep(self.retry.get_backoff(attempt))
+            attempt += 1
+        data = self._handle_response(json_response, prepared.data,
+                                     str(response.url))
+        self._invalidate_stale(api_url)
+        return data
+
+    def _should_retry(self, api_url, attempt, error=None, status_code=None):
+        """Whether the failed attempt of a request is retried.
+
+        Args:
+            api_url (str): The api url.
+            attempt (int): The number of the failed attempt.
+            error (Exception, optional): The error raised by the attempt.
+            status_code (int, optional): The HTTP status code of the
+                response of the attempt.
+
+        Returns:
+            bool: True if the request should be sent again.
+
+        """
+        if error is None:
+            return (self.retry.is_retryable_status(status_code) and
+                    self.retry.should_retry(api_url, attempt))
+        if isinstance(error, _UNSENT_ERRORS):
+            return self.retry.should_retry(api_url, attempt, sent=False)
+        if isinstance(error, (aiohttp.ClientConnectionError,
+                              asyncio.TimeoutError)):
+            return self.retry.should_retry(api_url, attempt)
+        return False
+
+    def _handle_headers(self, api_url, data):
+        """Add the necessary parameters to the request header.
+
+        The ``aiohttp`` only accepts string values for the headers.
+
+        """
+        headers = super(AsyncConnect, self)._handle_headers(api_url, data)
+        headers['signature'] = headers['signature'].decode('utf-8')
+        return headers
+
+    async def close(self):
+        """Close the session of the connection."""
+        if self._session_request is not None:
+            await self._session_request.close()
+            self._session_request = None
@@ -0,0 +1,168 @@
+"""An asyncio-native API for Using Renderbus cloud rendering service."""
+
+# Import built-in modules
+import logging
+
+# Import third-party modules
+from rayvision_log import init_logger
+
+# Import local modules
+from rayvision_api.aio.connect import AsyncConnect
+from rayvision_api.aio.connect import DEFAULT_ASYNC_POOL_MAXSIZE
+from rayvision_api.aio.operators import AsyncProjectSettings
+from rayvision_api.aio.operators import AsyncRenderConfig
+from rayvision_api.aio.operators import AsyncRenderJobs
+from rayvision_api.aio.operators import AsyncUserProfile
+from rayvision_api.constants import PACKAGE_NAME
+from rayvision_api.core import get_credentials
+from rayvision_api.validator import DataValidator
+
+
+class AsyncRayvisionAPI(object):
+    """An asyncio-native API for Using Renderbus cloud rendering service.
+
+    Examples:
+        .. code-block:: python
+
+            >>> import asyncio
+            >>> from rayvision_api.aio import AsyncRayvisionAPI
+            >>> async def main():
+            ...     async with AsyncRayvisionAPI(access_id="xxxxxx",
+            ...                                  access_key="xxxxx") as ray:
+            ...         await ray.login()
+            ...         print(ray.user_profile.user_name)
+            ...         return await asyncio.gather(*[
+            ...             ray.render_jobs.get_task_frames(task_id)
+            ...             for task_id in ("1658434", "1658435")])
+            >>> asyncio.get_event_loop().run_until_complete(main())
+
+    """
+
+    def __init__(self,
+                 access_id=None,
+                 access_key=None,
+                 domain='task.renderbus.com',
+                 render_platform='4',
+                 protocol='https',
+                 logger=None,
+                 session=None,
+                 pool_maxsize=DEFAULT_ASYNC_POOL_MAXSIZE,
+                 keep_alive=True,
+                 timeout=None,
+                 retry=None,
+                 rate_limiter=None,
+                 cache=None,
+                 disk_cache=None,
+                 compress_min_size=None):
+        """Initialize the asyncio Rayvision API instance.
+
+        Args:
+            access_id (str, optional): The access id of API.
+            access_key (str, optional): The access key of the API.
+            domain (str, optional): The domain address of the API.
+            render_platform (str, optional): The platform of renderFarm.
+            protocol (str, optional): The requests protocol.
+            logger (logging.Logger, optional): The logging logger instance.
+            session (aiohttp.ClientSession, optional): The session of the
+                aiohttp.
+            pool_maxsize (int, optional): The maximum number of simultaneous
+                connections.
+            keep_alive (bool, optional): Whether the connections are kept
+                alive between the requests.
+            timeout (float or tuple, optional): The default ``(connect, read)``
+                timeouts in seconds of the requests.
+            retry (rayvision_api.retry.RetryPolicy, optional): The policy to
+                retry the failed requests.
+            rate_limiter (rayvision_api.rate_limit.RateLimiter, optional):
+                Limit the rate of the requests of all the operators.
+            cache (rayvision_api.cache.ResponseCache or bool, optional): The
+                cache of the responses of the queries, a new one by default,
+                ``False`` disables the caching.
+            disk_cache (rayvision_api.disk_cache.DiskCache or bool, optional):
+                The persistent cache of the responses of the catalog queries,
+                shared by the processes, ``True`` uses the file of the user
+                cache directory.
+            compress_min_size (int, optional): The minimum size in bytes of
+                the bodies sent gzip compressed, no compression by default.
+
+        """
+        self.logger = logger
+
+        if not self.logger:
+            init_logger(PACKAGE_NAME)
+            self.logger = logging.getLogger(__name__)
+
+        access_id, access_key = get_credentials(access_id, access_key)
+
+        # Create a connection.
+        self._connect = AsyncConnect(access_id,
+                                     access_key,
+                                     protocol,
+                                     domain,
+                                     render_platform,
+                                     session=session,
+                                     pool_maxsize=pool_maxsize,
+                                     keep_alive=keep_alive,
+                                     timeout=timeout,
+                                     retry=retry,
+                                     rate_limiter=rate_limiter,
+                                     cache=cache,
+                                     disk_cache=disk_cache,
+                                     compress_min_size=compress_min_size)
+
+        # Initialize all instances of api operators.
+        self.user_profile = AsyncUserProfile(self._connect)
+        self.render_jobs = AsyncRenderJobs(self._connect)
+        self.project = AsyncProjectSettings(self._connect)
+        self.render_config = AsyncRenderConfig(self._connect)
+
+    @property
+    def connect(self):
+        """rayvision_api.aio.connect.AsyncConnect: The connect instance."""
+        return self._connect
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """Close the session of the connection."""
+        await self._connect.close()
+
+    async def login(self):
+        """dict: Load the profile of the current user."""
+        return await self.user_profile.login()
+
+    async def render_platforms(self):
+        """Get the currently available rendering platform.
+
+        Returns:
+            list of dict: Platforms profile.
+
+        """
+        zone = 1 if "renderbus" in self._connect.domain.lower() else 2
+        return await self._connect.post(self._connect.url.queryPlatforms,
+                                        {'zone': zone})
+
+    async def submit(self, submit_type, task_info, only_id=True):
+        """Submit a task.
+
+        Args:
+            submit_type (str): The type of the submit job.
+                .e.g:
+                    maya
+                    houdini
+                    clarisse
+            task_info (dict): The information about the job of render.
+            only_id (bool): Whether to return only jobID, otherwise it will
+                return the detailed information of the submitted job.
+
+        """
+        if submit_type not in ("maya", "houdini", "clarisse"):
+            raise ValueError("Unsupported type of submit "
+                             "({})".format(submit_type))
+        validator = DataValidator(task_info, submit_type)
+        validator.validate()
+        return await self.render_jobs.submit_job(task_info, only_id=only_id)
@@ -0,0 +1,609 @@
+"""The asyncio operations of the rayvision_api.
+
+The operators only differ from the synchronous ones where they post-process a
+response or chain several requests. The methods which simply forward to
+``Connect.post`` are inherited unchanged: with an
+:class:`rayvision_api.aio.connect.AsyncConnect` they return awaitables.
+
+"""
+
+# Import built-in modules
+import asyncio
+from itertools import groupby
+from operator import itemgetter
+import json
+import weakref
+
+# Import local modules
+from rayvision_api import bulk
+from rayvision_api.aio import pagination
+from rayvision_api.operators import ProjectSettings
+from rayvision_api.operators import RenderConfig
+from rayvision_api.operators import RenderJobs
+from rayvision_api.operators import SubmissionContext
+from rayvision_api.operators import UserProfile
+
+
+class AsyncProjectSettings(ProjectSettings):
+    """The asyncio operator of the Project."""
+
+    async def create_project(self, project_name):
+        """Create a new project.
+
+        Args:
+            project_name (str): name of the render project.
+
+        """
+        data = {
+            "newName": project_name,
+            "status": "0"
+        }
+        await self._connect.post(self._connect.url.addLabel, data)
+        return await self.get_project_by_name(project_name)
+
+    async def delete_project(self, project_name):
+        """Delete the project by given name.
+
+        Args:
+            project_name (str): The name of the label to be deleted.
+
+        """
+        await self._connect.post(self._connect.url.deleteLabel,
+                                 {"delName": project_name})
+        return True
+
+    async def get_projects(self):
+        """list of dict: Get current exits projects."""
+        return (await self._get_project_list())["projectNameList"]
+
+    async def get_project_by_name(self, project_name):
+        for project in await self.get_projects():
+            if project_name == project["projectName"]:
+                return project
+        raise ValueError(
+            "No corresponding project found '{}'".format(project_name)
+        )
+
+    __str__ = object.__str__
+
+
+class AsyncRenderConfig(RenderConfig):
+    """The asyncio rendering environment configuration."""
+
+    async def update_render_config(self,
+                                   app_name,
+                                   app_version,
+                                   config_name,
+                                   render_layer_type=1,
+                                   render_system=None,
+                                   plugin_ids=None):
+        """Modify the user rendering environment configuration.
+
+        Args:
+            app_name (str): The name of the render software.
+            app_version (str): The version of the render software.
+            config_name (str): The name of the render configuration.
+            render_layer_type (int): The type of the render layer.
+            render_system (int): The type of the render os system.
+            plugin_ids (list of int): The id list of the render plugins.
+
+        """
+        config = await self.get_render_config(app_name, config_name)
+        if not config:
+            config = await self.create_render_config(app_name, app_version,
+                                                     config_name)
+        data = {
+            "cgName": app_name,
+            "cgVersion": app_version,
+            "editName": config_name,
+            "renderLayerType": render_layer_type or config["renderLayerType"],
+            "renderSystem": render_system or config["renderSystem"],
+            "pluginIds": plugin_ids or config["pluginIds"],
+            "cgId": config["cgId"]
+        }
+        return await self._connect.post(self._connect.url.updateRenderEnv,
+                                        data)
+
+    async def delete_render_config(self, config_name):
+        """Delete user rendering environment configuration.
+
+        Args:
+            config_name (str): The name of the render configuration.
+
+        Returns:
+            bool: If the delete is successful.
+
+        """
+        data = {
+            "editName": config_name
+        }
+        await self._connect.post(self._connect.url.deleteRenderEnv, data)
+        return True
+
+    async def get_render_config(self, app_name, config_name=None):
+        """Get the user rendering environment configuration.
+
+        Args:
+            app_name (str): The name of the render software.
+            config_name (str, optional): The name of the render env config.
+
+        Return:
+            list: Software profile.
+
+        """
+        post_data = {"cgId": self._get_id_by_app_name(app_name)}
+        return_data = await self._connect.post(self._connect.url.getRenderEnv,
+                                               post_data)
+        data = {
+            info["editName"]: info
+            for info in return_data
+        }
+        return data.get(config_name, return_data)
+
+    @property
+    async def default_render_software(self):
+        """dict: The current default render software."""
+        software = await self.get_supported_software()
+        for info in software["renderInfoList"]:
+            if info["cgId"] == software["defaultCgId"]:
+                return info
+
+    async def get_plugin_versions(self, app_name, plugin_name):
+        """Get the plugins version by given render software name.
+
+        Args:
+            app_name (str): The name of the render software.
+            plugin_name (str): The plugin name of the render software.
+
+        Returns:
+            dict: The plugin info of the render software.
+
+        """
+        plugins = await self.get_plugins(app_name)
+        groups = groupby(plugins["cgPlugin"], key=itemgetter("pluginName"))
+        for group_name, infos in groups:
+            if group_name == plugin_name:
+                return [info for info in infos]
+
+    async def get_render_software_versions(self, app_name):
+        """Get versions for the given the rendering software.
+
+        Args:
+            app_name (str): The name of the render software.
+
+        Returns:
+            list of dict: The versions for the given the rendering software.
+
+        """
+        return (await self.get_plugins(app_name))["cgVersion"]
+
+
+def _current_task():
+    """asyncio.Task: Get the running task."""
+    try:
+        return asyncio.current_task()
+    except AttributeError:
+        # Python 3.6.
+        return asyncio.Task.current_task()
+
+
+class AsyncSubmissionContext(SubmissionContext):
+    """The asyncio submission of one job to its own task."""
+
+    def __init__(self, render_jobs, task_id=None):
+        """Initialize the context.
+
+        Args:
+            render_jobs (AsyncRenderJobs): The operator of the tasks.
+            task_id (str, optional): The ID of an allocated task, allocated
+                on first access by default.
+
+        """
+        super(AsyncSubmissionContext, self).__init__(render_jobs, task_id)
+        self._lock = None
+
+    @property
+    async def task_id(self):
+        """str: The ID of the task of the job, allocated on first access."""
+        if self._task_id is None:
+            if self._lock is None:
+                # Created in the running event loop.
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if self._task_id is None:
+                    self._task_id = (
+                        await self._render_jobs.create_task_ids(1))[0]
+        return self._task_id
+
+    async def upload(self, job_info):
+        """Upload the info of the job to its task."""
+        # pylint: disable=protected-access
+        return await self._render_jobs._post_json(
+            job_info, task_id=await self.task_id)
+
+    async def submit(self, job_info):
+        """Upload the info of the job and submit its task.
+
+        Args:
+            job_info (dict): The info of the render job.
+
+        Returns:
+            dict: The information of the submitted task.
+
+        Raises:
+            ValueError: The job is already submitted.
+
+        """
+        if self.submitted:
+            raise ValueError('The task {} is already submitted.'.format(
+                self._task_id))
+        # pylint: disable=protected-access
+        self.response = await self._render_jobs._submit_task(
+            await self.task_id, job_info)
+        self.submitted = True
+        return self.response
+
+
+class AsyncRenderJobs(RenderJobs):
+    """API task related asyncio operations."""
+
+    def __init__(self, connect):
+        """Initialize instance.
+
+        Args:
+            connect (rayvision_api.aio.connect.AsyncConnect): The connect
+                instance.
+
+        """
+        super(AsyncRenderJobs, self).__init__(connect)
+        self._submissions = weakref.WeakKeyDictionary()
+
+    def new_submission(self, task_id=None):
+        """AsyncSubmissionContext: Start the submission of a job."""
+        return AsyncSubmissionContext(self, task_id)
+
+    @property
+    def _submission(self):
+        """AsyncSubmissionContext: The submission of the current task.
+
+        A new submission is started once the previous one was submitted.
+
+        """
+        task = _current_task()
+        submission = self._submissions.get(task)
+        if submission is None or submission.submitted:
+            submission = self.new_submission()
+            self._submissions[task] = submission
+        return submission
+
+    @property
+    async def task_id(self):
+        """str: The ID of the render task of the current asyncio task."""
+        return await self._submission.task_id
+
+    async def submit_job(self,
+                         job_info,
+                         asset_lsolation_model=None,
+                         out_user_id=None,
+                         only_id=False):
+        """Submit a task to rayvision render farm.
+
+        Args:
+            job_info (dict): The info of the render job.
+            asset_lsolation_model (str): Asset isolation type, Optional value,
+                default is null, optional value:'TASK_ID_MODEL' or
+                'OUT_USER_MODEL'.
+            out_user_id (str): The asset isolates the user ID, Optional value.
+
+        """
+        submission = self._submission
+        task_info = await submission.submit(job_info)
+        if only_id:
+            return await submission.task_id
+        return task_info
+
+    def start_task_id_pool(self, size=None, **kwargs):
+        """The task ID pool is refilled by a thread, it is not supported.
+
+        The asyncio operator allocates the IDs of many tasks at once with
+        ``create_task_ids`` instead, e.g. for ``submit_jobs``.
+
+        Raises:
+            TypeError: Always.
+
+        """
+        raise TypeError('The task ID pool is only supported by the '
+                        'synchronous RenderJobs, allocate the task IDs with '
+                        '"await render_jobs.create_task_ids(count)" and pass '
+                        'them to "submit_jobs(jobs_info, task_ids=...)".')
+
+    async def create_task_ids(self, count, task_user_level=50,
+                              out_user_id=None, labels=None):
+        """list of str: Allocate the IDs of several tasks in one request."""
+        task_id_info = await self._create_task(
+            count=count, task_user_level=task_user_level,
+            out_user_id=out_user_id, labels=labels)
+        return [str(task_id) for task_id in task_id_info["taskIdList"]]
+
+    async def allocate_task_id(self):
+        """str: Get the ID of a new task, there is no task ID pool."""
+        return (await self.create_task_ids(1))[0]
+
+    async def _submit_task(self, task_id, job_info):
+        """dict: Upload the info of a job and submit its task."""
+        await self._post_json(job_info, task_id=task_id)
+        return await self._connect.post(self._connect.url.submitTask,
+                                        {"taskId": task_id})
+
+    async def submit_jobs(self, jobs_info, task_ids=None,
+                          max_workers=bulk.DEFAULT_MAX_WORKERS):
+        """Submit many jobs concurrently, see ``RenderJobs.submit_jobs``.
+
+        Args:
+            jobs_info (list of dict): The info of the render jobs.
+            task_ids (list of str, optional): The IDs of allocated tasks, one
+                per job.
+            max_workers (int, optional): The maximum number of jobs submitted
+                at the same time.
+
+        Returns:
+            list of rayvision_api.bulk.JobSubmission: The task ID and the
+                response or the exception of each job, in order.
+
+        """
+        jobs_info = list(jobs_info)
+        if not jobs_info:
+            return []
+        if task_ids is None:
+            task_ids = await self.create_task_ids(len(jobs_info))
+        if len(task_ids) != len(jobs_info):
+            raise ValueError('Got {} task IDs for {} jobs.'.format(
+                len(task_ids), len(jobs_info)))
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def _submit(task_id, job_info):
+            async with semaphore:
+                return await self._submit_task(task_id, job_info)
+
+        responses = await asyncio.gather(
+            *[_submit(task_id, job_info)
+              for task_id, job_info in zip(task_ids, jobs_info)],
+            return_exceptions=True)
+        return [bulk.JobSubmission(task_id, None, response)
+                if isinstance(response, Exception) else
+                bulk.JobSubmission(task_id, response, None)
+                for task_id, response in zip(task_ids, responses)]
+
+    async def get_jobs_info(self, jobs_id,
+                            chunk_size=bulk.DEFAULT_CHUNK_SIZE,
+                            max_workers=bulk.DEFAULT_MAX_WORKERS):
+        """Get the details of many jobs, see ``RenderJobs.get_jobs_info``.
+
+        Args:
+            jobs_id (list of int): The id of the render jobs.
+            chunk_size (int, optional): The number of IDs per request.
+            max_workers (int, optional): The maximum number of requests sent
+                at the same time.
+
+        Returns:
+            rayvision_api.bulk.BulkResult: The details of the jobs indexed by
+                their ``id`` and the failed chunks.
+
+        """
+        chunks = bulk.chunked(bulk.unique(jobs_id), chunk_size)
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def _get_job_info(chunk):
+            async with semaphore:
+                return await self.get_job_info(chunk)
+
+        responses = await asyncio.gather(
+            *[_get_job_info(chunk) for chunk in chunks],
+            return_exceptions=True)
+        result = bulk.BulkResult()
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, Exception):
+                result.add_failure(chunk, response)
+            else:
+                result.add_items(response.get('items'))
+        return result
+
+    async def run_bulk(self, operation, jobs_id,
+                       chunk_size=bulk.DEFAULT_CHUNK_SIZE,
+                       max_workers=bulk.DEFAULT_MAX_WORKERS,
+                       retries=bulk.DEFAULT_RETRIES, **kwargs):
+        """Apply an operation to many jobs, see ``RenderJobs.run_bulk``.
+
+        Args:
+            operation (str): The name of the operation, one of
+                ``BULK_OPERATIONS``.
+            jobs_id (list of int): The id of the render jobs.
+            chunk_size (int, optional): The number of IDs per request.
+            max_workers (int, optional): The maximum number of requests sent
+                at the same time.
+            retries (int, optional): The maximum number of retries of a
+                failed chunk.
+            **kwargs: The other arguments of the operation.
+
+        Returns:
+            rayvision_api.bulk.BulkResult: The response of the chunk of each
+                successful ID, and the failed IDs with their exception.
+
+        """
+        method = self._get_bulk_operation(operation)
+        should_retry = self._get_bulk_retry_check(operation)
+        semaphore = asyncio.Semaphore(max_workers)
+        result = bulk.BulkResult()
+
+        async def _run(chunk, attempt):
+            if attempt:
+                await asyncio.sleep(
+                    self._connect.retry.get_backoff(attempt - 1))
+            try:
+                async with semaphore:
+                    response = await method(chunk, **kwargs)
+            except Exception as error:  # pylint: disable=broad-except
+                if attempt < retries and (should_retry is None or
+                                          should_retry(error)):
+                    await asyncio.gather(*[_run(part, attempt + 1)
+                                           for part in bulk.split(chunk)])
+                else:
+                    result.add_failure(chunk, error)
+            else:
+                result.add_success(chunk, response)
+
+        await asyncio.gather(*[
+            _run(chunk, 0)
+            for chunk in bulk.chunked(bulk.unique(jobs_id), chunk_size)])
+        return result
+
+    def iter_jobs(self, status_list=None, page_size=100, prefetch=True):
+        """Iterate over all the render jobs of the user, page by page.
+
+        Examples:
+            .. code-block:: python
+
+                >>> async for job in ray.render_jobs.iter_jobs():
+                ...     print(job["id"])
+
+        Args:
+            status_list (list of int, optional): Only get the jobs in these
+                statuses, all the jobs by default.
+            page_size (int, optional): The number of jobs per request.
+            prefetch (bool, optional): Whether the next page is fetched in
+                the background.
+
+        Returns:
+            async iterator of dict: The details of each job.
+
+        """
+        return pagination.iter_items(pagination.iter_pages(
+            lambda page_num: self.get_jobs(page_num, page_size, status_list),
+            prefetch=prefetch))
+
+    def iter_task_frames(self, task_id, page_size=100, search_keyword=None,
+                         max_workers=4, ordered=True):
+        """Iterate over all the frames of a task.
+
+        Args:
+            task_id (int): The task ID number.
+            page_size (int, optional): The number of frames per request.
+            search_keyword (str, optional): Only get the frames matching the
+                keyword.
+            max_workers (int, optional): The maximum number of pages fetched
+                at the same time.
+            ordered (bool, optional): Whether the frames are yielded in the
+                order of the pages, otherwise as soon as their page arrives.
+
+        Returns:
+            async iterator of dict: The details of each frame.
+
+        """
+        connect = self._connect
+
+        async def _fetch_page(page_num):
+            data = self._get_task_frames_data(task_id, page_num, page_size,
+                                              search_keyword)
+            return await connect.send(connect.prepare(
+                connect.url.queryTaskFrames, data))
+
+        return pagination.iter_items(pagination.iter_pages_concurrently(
+            _fetch_page, max_workers=max_workers, ordered=ordered))
+
+    async def update_priority(self, job_id, priority):
+        """Update the render priority for the task by given task id.
+
+        Args:
+            job_id (str): The ID of the render job.
+            priority (int): The priority for the current render job.
+
+        """
+        if priority > 100:
+            raise ValueError("The priority value must be 0-99.")
+        data = {
+            "taskId": job_id,
+            "taskUserLevel": priority,
+        }
+        await self._connect.post(self._connect.url.updateTaskUserLevel, data)
+        return True
+
+    async def set_job_overtime_top(self, task_id_list, overtime):
+        """Set the task timeout stop time.
+
+        Args:
+            task_id_list (list of int): Task list.
+            overtime (int or float): Timeout time, unit: second.
+
+        """
+        data = {
+            'taskIds': task_id_list,
+            'overTime': overtime
+        }
+        await self._connect.post(self._connect.url.setOverTimeStop, data)
+        return True
+
+    async def set_full_speed_render(self, task_id_list):
+        """Full to render.
+
+        Args:
+            task_id_list (list of int): Task list.
+
+        """
+        data = {
+            'taskIds': task_id_list,
+        }
+        await self._connect.post(self._connect.url.fullSpeed, data)
+        return True
+
+    async def _post_json(self, json_content, task_id=None):
+        """Upload the task.json of a task.
+
+        The task info is encoded to a compact JSON string, which the
+        connection escapes again, by slices, into the body. The string is
+        held along with the body, the signature covers it.
+
+        """
+        data = {
+            "taskId": task_id or await self.task_id,
+            "fileName": "task.json",
+            "content": json.dumps(json_content, separators=(',', ':')),
+        }
+        return await self._connect.post(self._connect.url.taskJsonFile,
+                                        data, validator=False)
+
+
+class AsyncUserProfile(UserProfile):
+    """API user information asyncio operator."""
+
+    def __init__(self, connect):
+        """Initialize instance.
+
+        The profile is not loaded until :meth:`login` is awaited.
+
+        Args:
+            connect (rayvision_api.aio.connect.AsyncConnect): The connect
+                instance.
+
+        """
+        super(AsyncUserProfile, self).__init__(connect, auto_login=False)
+
+    @property
+    async def user_id(self):
+        """int: The ID of the user."""
+        return (await self.query_user_profile())["userId"]
+
+    async def login(self):
+        """Supplement user's configuration information.
+
+        The profile, the settings and the transfer BID are queried
+        concurrently.
+
+        """
+        results = await asyncio.gather(self.query_user_profile(),
+                                       self.query_user_setting(),
+                                       self.get_transfer_bid())
+        self._merge_user_info(results)
+        return self._info
+
+    # The queries of the login are already concurrent.
+    prefetch = login
@@ -0,0 +1,113 @@
+"""Provides the asyncio iteration over the paginated queries."""
+
+# Import built-in modules
+from collections import deque
+import asyncio
+
+# Import local modules
+from rayvision_api.pagination import has_next_page
+
+
+async def iter_pages(fetch_page, page_num=1, prefetch=True):
+    """Iterate over the responses of the pages, one page at a time.
+
+    Args:
+        fetch_page (callable): Get the awaitable response of a page from its
+            number.
+        page_num (int, optional): The number of the first page.
+        prefetch (bool, optional): Whether the next page is fetched while
+            the caller processes the current one.
+
+    Yields:
+        dict: The response of each page.
+
+    """
+    task = None
+    try:
+        page = await fetch_page(page_num)
+        while True:
+            has_next = has_next_page(page, page_num)
+            if has_next and prefetch:
+                task = asyncio.ensure_future(fetch_page(page_num + 1))
+            yield page
+            if not has_next:
+                return
+            page_num += 1
+            if task is not None:
+                page, task = await task, None
+            else:
+                page = await fetch_page(page_num)
+    finally:
+        if task is not None:
+            task.cancel()
+
+
+async def iter_pages_concurrently(fetch_page, max_workers=4, ordered=True):
+    """Iterate over the responses of the pages, fetched concurrently.
+
+    Args:
+        fetch_page (callable): Get the awaitable response of a page from its
+            number.
+        max_workers (int, optional): The maximum number of pages fetched at
+            the same time.
+        ordered (bool, optional): Whether the pages are yielded in order,
+            otherwise as soon as they arrive.
+
+    Yields:
+        dict: The response of each page.
+
+    """
+    first_page = await fetch_page(1)
+    if not has_next_page(first_page, 1):
+        yield first_page
+        return
+    page_count = first_page.get('pageCount')
+    if page_count is None:
+        # The pages can only be discovered one after the other.
+        yield first_page
+        async for page in iter_pages(fetch_page, page_num=2):
+            yield page
+        return
+
+    page_nums = iter(range(2, page_count + 1))
+    pending = deque() if ordered else set()
+    add = pending.append if ordered else pending.add
+
+    def _submit_next():
+        page_num = next(page_nums, None)
+        if page_num is not None:
+            add(asyncio.ensure_future(fetch_page(page_num)))
+
+    try:
+        for _ in range(max_workers):
+            _submit_next()
+        yield first_page
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                pending.difference_update(done)
+            for task in done:
+                page = await task
+                _submit_next()
+                yield page
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def iter_items(pages):
+    """Iterate over the items of the pages.
+
+    Args:
+        pages (async iterable of dict): The responses of the pages.
+
+    Yields:
+        dict: Each item of the pages.
+
+    """
+    async for page in pages:
+        for item in page.get('items') or ():
+            yield item
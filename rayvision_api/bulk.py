@@ -0,0 +1,251 @@
+"""Provides the helpers of the bulk operations on many jobs.
+
+The bulk operations split the IDs into chunks, send one request per chunk
+concurrently and report the failed chunks without losing the results of the
+others. The failed chunks of the job controls are retried in two halves, so
+that the IDs rejected by the server are isolated from the others.
+
+"""
+
+# Import built-in modules
+from collections import namedtuple
+from collections import OrderedDict
+from concurrent.futures import as_completed
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+import time
+
+# Import local modules
+from rayvision_api.exception import RayvisionError
+
+# The default number of IDs per request.
+DEFAULT_CHUNK_SIZE = 100
+
+# The default number of requests sent at the same time.
+DEFAULT_MAX_WORKERS = 4
+
+# The default number of retries of a failed chunk.
+DEFAULT_RETRIES = 2
+
+# A chunk whose request failed.
+ChunkFailure = namedtuple('ChunkFailure', ['ids', 'error'])
+
+
+class JobSubmission(namedtuple('JobSubmission',
+                               ['task_id', 'response', 'error'])):
+    """The result of the submission of a job of a batch."""
+
+    __slots__ = ()
+
+    @property
+    def ok(self):  # pylint: disable=invalid-name
+        """bool: Whether the job was submitted."""
+        return self.error is None
+
+
+def is_answered(error):
+    """bool: Whether the exception of a request is an answer of the server.
+
+    The requests rejected by the server were not applied, they are safe to
+    send again, unlike the ones which failed after being sent, e.g. on a
+    read timeout.
+
+    """
+    return isinstance(error, RayvisionError)
+
+
+def unique(ids):
+    """list: Get the IDs without the duplicates, in their order."""
+    return list(OrderedDict.fromkeys(ids))
+
+
+def chunked(ids, size):
+    """Split the IDs into chunks.
+
+    Args:
+        ids (list): The IDs.
+        size (int): The maximum number of IDs per chunk.
+
+    Returns:
+        list of list: The chunks, in order.
+
+    """
+    if size < 1:
+        raise ValueError('The chunk size must be positive.')
+    return [ids[start:start + size] for start in range(0, len(ids), size)]
+
+
+def map_chunks(function, chunks, max_workers=DEFAULT_MAX_WORKERS,
+               executor=None):
+    """Call the function with each chunk concurrently.
+
+    Args:
+        function (callable): Send the request of a chunk.
+        chunks (list): The chunks, e.g. of IDs.
+        max_workers (int, optional): The maximum number of chunks sent at the
+            same time, if no executor is given.
+        executor (concurrent.futures.Executor, optional): Call the function,
+            a new thread pool by default.
+
+    Yields:
+        tuple: The index of each chunk with the result and the exception of
+            its call, in the order of completion.
+
+    """
+    if not chunks:
+        return
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(min(max_workers, len(chunks)))
+    try:
+        futures = {executor.submit(function, chunk): index
+                   for index, chunk in enumerate(chunks)}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as error:  # pylint: disable=broad-except
+                yield futures[future], None, error
+    finally:
+        if own_executor:
+            executor.shutdown(wait=True)
+
+
+def split(chunk):
+    """list of list: Split a chunk in two halves, or keep a single ID."""
+    if len(chunk) < 2:
+        return [chunk]
+    middle = len(chunk) // 2
+    return [chunk[:middle], chunk[middle:]]
+
+
+def run_chunks(function, chunks, max_workers=DEFAULT_MAX_WORKERS,
+               executor=None, retries=0, get_backoff=None, should_retry=None):
+    """Call the function with each chunk concurrently, retrying the failures.
+
+    A failed chunk is split in two halves which are retried separately, up to
+    ``retries`` times, so that the IDs rejected by the server do not fail the
+    others.
+
+    Args:
+        function (callable): Send the request of a chunk.
+        chunks (list of list): The chunks of IDs.
+        max_workers (int, optional): The maximum number of chunks sent at the
+            same time, if no executor is given.
+        executor (concurrent.futures.Executor, optional): Call the function,
+            a new thread pool by default.
+        retries (int, optional): The maximum number of retries of a chunk.
+        get_backoff (callable, optional): Get the delay in seconds after a
+            failed attempt from its number, starting from zero.
+        should_retry (callable, optional): Whether a chunk is retried after
+            the exception of its call, every failed chunk by default.
+
+    Yields:
+        tuple: Each final chunk with the result and the exception of its last
+            call, in the order of completion.
+
+    """
+    if not chunks:
+        return
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(min(max_workers, len(chunks)))
+    futures = {}
+
+    def _call(chunk, attempt):
+        if attempt and get_backoff is not None:
+            time.sleep(get_backoff(attempt - 1))
+        return function(chunk)
+
+    def _submit(chunk, attempt):
+        futures[executor.submit(_call, chunk, attempt)] = (chunk, attempt)
+
+    try:
+        for chunk in chunks:
+            _submit(chunk, 0)
+        while futures:
+            done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk, attempt = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception as error:  # pylint: disable=broad-except
+                    if attempt < retries and (should_retry is None or
+                                              should_retry(error)):
+                        for part in split(chunk):
+                            _submit(part, attempt + 1)
+                    else:
+                        yield chunk, None, error
+                else:
+                    yield chunk, result, None
+    finally:
+        for future in futures:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=True)
+
+
+class BulkResult(object):
+    """The merged results of a bulk operation.
+
+    Attributes:
+        items (collections.OrderedDict): The results indexed by the ID.
+        failures (list of ChunkFailure): The chunks whose request failed,
+            with their exception.
+
+    """
+
+    def __init__(self):
+        self.items = OrderedDict()
+        self.failures = []
+
+    @property
+    def ok(self):  # pylint: disable=invalid-name
+        """bool: Whether no chunk failed."""
+        return not self.failures
+
+    @property
+    def succeeded_ids(self):
+        """list: The IDs of the successful chunks."""
+        return list(self.items)
+
+    @property
+    def failed_ids(self):
+        """list: The IDs of the failed chunks."""
+        return [job_id for failure in self.failures
+                for job_id in failure.ids]
+
+    def add_items(self, items, key='id'):
+        """Index the items by their ID.
+
+        Args:
+            items (iterable of dict): The items of a response.
+            key (str, optional): The key of the ID of the items.
+
+        """
+        for item in items or ():
+            self.items[item[key]] = item
+
+    @property
+    def errors(self):
+        """dict: The exception of each failed ID."""
+        return {job_id: failure.error for failure in self.failures
+                for job_id in failure.ids}
+
+    def add_success(self, ids, response):
+        """Record the response of a successful chunk for each of its IDs."""
+        for job_id in ids:
+            self.items[job_id] = response
+
+    def add_failure(self, ids, error):
+        """Record the failure of the request of a chunk."""
+        self.failures.append(ChunkFailure(list(ids), error))
+
+    def raise_for_failures(self):
+        """Raise the exception of the first failed chunk, if any."""
+        if self.failures:
+            raise self.failures[0].error
+
+    def __repr__(self):
+        return '{}(items={}, failed_ids={})'.format(
+            self.__class__.__name__, len(self.items), len(self.failed_ids))
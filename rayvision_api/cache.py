@@ -0,0 +1,264 @@
+"""Provides the cache of the responses of the queries.
+
+The responses are cached by connection, keyed by the API url and the
+canonical JSON of the request data, and kept for the time to live of their
+API url. Only the queries of slow-changing data (the platforms, the
+supported software, the settings) are cached by default. The state of the
+jobs is polled until it changes, its queries are only cached when asked
+for, e.g. with ``JOB_STATE_TTLS``. The successful updates remove the cached
+responses of the queries they make stale, see ``INVALIDATIONS``.
+
+Examples:
+    .. code-block:: python
+
+        >>> from rayvision_api import RayvisionAPI
+        >>> from rayvision_api.cache import DEFAULT_TTLS
+        >>> from rayvision_api.cache import JOB_STATE_TTLS
+        >>> from rayvision_api.cache import ResponseCache
+        >>> from rayvision_api.url import ApiUrl
+        >>> ttls = dict(DEFAULT_TTLS)
+        >>> ttls.update(JOB_STATE_TTLS)
+        >>> cache = ResponseCache(ttls=ttls, maxsize=1024)
+        >>> ray = RayvisionAPI(access_id="xxxxxx",
+        ...                    access_key="xxxxx",
+        ...                    cache=cache)
+        >>> ray.connect.cache.invalidate(ApiUrl.queryTaskInfo)
+
+"""
+
+# Import built-in modules
+from collections import OrderedDict
+import copy
+import json
+import threading
+import time
+
+# Import local modules
+from rayvision_api.url import ApiUrl
+
+_monotonic = getattr(time, 'monotonic', time.time)
+
+# The time to live in seconds of the responses, by API url.
+DEFAULT_TTLS = {
+    ApiUrl.queryPlatforms: 3600,
+    ApiUrl.querySupportedSoftware: 3600,
+    ApiUrl.querySupportedPlugin: 3600,
+    ApiUrl.queryErrorDetail: 3600,
+    ApiUrl.getTransferBid: 3600,
+    ApiUrl.getTransferServerMsg: 3600,
+    ApiUrl.getRaySyncUserKey: 300,
+    ApiUrl.queryUserProfile: 300,
+    ApiUrl.queryUserSetting: 300,
+    ApiUrl.getLabelList: 60,
+    ApiUrl.getRenderEnv: 60,
+    ApiUrl.loadingFrameThumbnail: 60,
+}
+
+# The time to live in seconds of the responses of the state of the jobs,
+# not cached by default.
+JOB_STATE_TTLS = {
+    ApiUrl.queryTaskInfo: 5,
+    ApiUrl.queryTaskFrames: 5,
+    ApiUrl.queryAllFrameStats: 5,
+    ApiUrl.loadTaskProcessImg: 5,
+}
+
+# The queries of the state of the jobs, made stale by any change of a job.
+_TASK_QUERIES = (
+    ApiUrl.queryTaskInfo,
+    ApiUrl.queryTaskFrames,
+    ApiUrl.queryAllFrameStats,
+    ApiUrl.loadTaskProcessImg,
+    ApiUrl.loadingFrameThumbnail,
+)
+
+# The cached queries made stale by a successful update, by API url.
+INVALIDATIONS = {
+    ApiUrl.addLabel: (ApiUrl.getLabelList,),
+    ApiUrl.deleteLabel: (ApiUrl.getLabelList,),
+    ApiUrl.addRenderEnv: (ApiUrl.getRenderEnv,),
+    ApiUrl.updateRenderEnv: (ApiUrl.getRenderEnv,),
+    ApiUrl.deleteRenderEnv: (ApiUrl.getRenderEnv,),
+    ApiUrl.setDefaultRenderEnv: (ApiUrl.getRenderEnv,),
+    ApiUrl.updateUserSetting: (ApiUrl.queryUserSetting,
+                               ApiUrl.queryUserProfile),
+    ApiUrl.createTask: _TASK_QUERIES,
+    ApiUrl.submitTask: _TASK_QUERIES,
+    ApiUrl.taskJsonFile: _TASK_QUERIES,
+    ApiUrl.stopTask: _TASK_QUERIES,
+    ApiUrl.startTask: _TASK_QUERIES,
+    ApiUrl.abortTask: _TASK_QUERIES,
+    ApiUrl.deleteTask: _TASK_QUERIES,
+    ApiUrl.restartFailedFrames: _TASK_QUERIES,
+    ApiUrl.restartFrame: _TASK_QUERIES,
+    ApiUrl.updateTaskUserLevel: _TASK_QUERIES,
+    ApiUrl.setOverTimeStop: _TASK_QUERIES,
+    ApiUrl.fullSpeed: _TASK_QUERIES,
+}
+
+# The default maximum number of cached responses of a connection.
+DEFAULT_MAXSIZE = 256
+
+
+def make_key(api_url, data):
+    """tuple: Get the key of a request, same for the equal data."""
+    return api_url, json.dumps(data or {}, sort_keys=True,
+                               separators=(',', ':'), default=str)
+
+
+class ResponseCache(object):
+    """A thread-safe LRU cache of the responses with a time to live.
+
+    The cached responses are copied when they are stored and returned, the
+    callers may modify them. Each invalidation of an API url increases its
+    generation, a response read before an invalidation is not stored after
+    it.
+
+    """
+
+    def __init__(self, ttls=None, maxsize=DEFAULT_MAXSIZE, clock=None,
+                 invalidations=None):
+        """Initialize the cache.
+
+        Args:
+            ttls (dict, optional): The time to live in seconds of the
+                responses, by API url, ``DEFAULT_TTLS`` by default. The
+                responses of the other API urls are not cached.
+            maxsize (int, optional): The maximum number of responses, the
+                least recently used one is evicted first.
+            clock (callable, optional): Return the current time in seconds.
+            invalidations (dict, optional): The cached API urls made stale
+                by each update API url, ``INVALIDATIONS`` by default.
+                e.g.:
+                    {
+                        ApiUrl.deleteLabel: (ApiUrl.getLabelList,),
+                    }
+
+        """
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.invalidations = dict(
+            INVALIDATIONS if invalidations is None else invalidations)
+        self.maxsize = maxsize
+        self._clock = clock or _monotonic
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._generations = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_ttl(self, api_url):
+        """float: Get the time to live of the responses of the API url."""
+        return self.ttls.get(api_url, 0)
+
+    def get_generation(self, api_url):
+        """int: Get the number of invalidations of the API url."""
+        return self._generations.get(api_url, 0)
+
+    def get(self, api_url, data=None):
+        """Get the cached response of a request.
+
+        Args:
+            api_url (str): The API url.
+            data (dict, optional): The data of the request.
+
+        Returns:
+            tuple: True and the response if cached and fresh, False and None
+                otherwise.
+
+        """
+        if not self.get_ttl(api_url):
+            return False, None
+        key = make_key(api_url, data)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._move_to_end(key)
+            self.hits += 1
+            response = entry[1]
+        return True, copy.deepcopy(response)
+
+    def set(self, api_url, data, response, generation=None):
+        """Cache the response of a request, if its API url is cached.
+
+        Args:
+            api_url (str): The API url.
+            data (dict): The data of the request.
+            response (object): The response data.
+            generation (int, optional): The generation of the API url read
+                before sending the request, the response is not stored if
+                the API url was invalidated since.
+
+        """
+        ttl = self.get_ttl(api_url)
+        if not ttl:
+            return
+        key = make_key(api_url, data)
+        response = copy.deepcopy(response)
+        with self._lock:
+            if (generation is not None and
+                    generation != self.get_generation(api_url)):
+                return
+            self._entries[key] = (self._clock() + ttl, response)
+            self._move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _move_to_end(self, key):
+        """Mark the entry as the most recently used."""
+        try:
+            self._entries.move_to_end(key)
+        except AttributeError:
+            # The OrderedDict of Python 2 has no ``move_to_end``.
+            self._entries[key] = self._entries.pop(key)
+
+    def invalidate(self, *api_urls):
+        """Remove the cached responses of the API urls.
+
+        Args:
+            *api_urls (str): The API urls, e.g. ``ApiUrl.getLabelList``.
+
+        Returns:
+            int: The number of removed responses.
+
+        """
+        api_urls = set(api_urls)
+        with self._lock:
+            for api_url in api_urls:
+                self._generations[api_url] = self.get_generation(api_url) + 1
+            keys = [key for key in self._entries if key[0] in api_urls]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def invalidate_for(self, api_url):
+        """Remove the cached responses made stale by an update.
+
+        Args:
+            api_url (str): The API url of the successful update, e.g.
+                ``ApiUrl.deleteLabel``.
+
+        Returns:
+            int: The number of removed responses.
+
+        """
+        stale_urls = self.invalidations.get(api_url)
+        if not stale_urls:
+            return 0
+        return self.invalidate(*stale_urls)
+
+    def clear(self):
+        """Remove all the cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return '{}(size={}, maxsize={}, hits={}, misses={})'.format(
+            self.__class__.__name__, len(self), self.maxsize, self.hits,
+            self.misses)
@@ -1,8 +1,7 @@
 """Provides session connections."""
 
 # Import build-in modules
-import copy
-import json
+from collections import deque
 import logging
 from pprint import pformat
 import platform
@@ -10,14 +9,64 @@ import time
 import requests
 
 # Import local modules
+from rayvision_api.adapters import DEFAULT_POOL_CONNECTIONS
+from rayvision_api.adapters import DEFAULT_POOL_MAXSIZE
+from rayvision_api.adapters import TransportAdapter
+from rayvision_api.cache import ResponseCache
 from rayvision_api.constants import HEADERS
 from rayvision_api.exception import RayvisionAPIError
 from rayvision_api.exception import RayvisionAPIParameterError
+from rayvision_api.payload import encode_body
+from rayvision_api.retry import RetryPolicy
 from rayvision_api import signature
 from rayvision_api.validator import validate_data
 from rayvision_api.url import ApiUrl
 from rayvision_api.url import assemble_api_url
 
+# The age in seconds after which a prepared request is signed again before
+# it is sent, the server rejects the outdated timestamps.
+SIGNATURE_MAX_AGE = 60
+
+# The maximum size in bytes of a body written to the debug log.
+MAX_LOGGED_BODY_SIZE = 4096
+
+# The number of requests prepared ahead of the caller by an executor.
+DEFAULT_PREPARE_AHEAD = 4
+
+
+class SignedRequest(object):
+    """A validated, encoded and signed request, ready to be sent."""
+
+    __slots__ = ('api_url', 'address', 'data', 'body', 'headers',
+                 'signed_at', 'content_encoding')
+
+    def __init__(self, api_url, address, data, body, headers, signed_at,
+                 content_encoding=None):
+        """Initialize the request.
+
+        Args:
+            api_url (str): The api url.
+            address (str): The full url of the request.
+            data (dict): The validated data.
+            body (bytes): The JSON encoded data, compressed if a content
+                encoding is given.
+            headers (dict): The signed headers.
+            signed_at (float): The time the headers were signed.
+            content_encoding (str, optional): The content encoding of the
+                body, e.g. ``gzip``.
+
+        """
+        self.api_url = api_url
+        self.address = address
+        self.data = data
+        self.body = body
+        self.headers = headers
+        self.signed_at = signed_at
+        self.content_encoding = content_encoding
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, self.address)
+
 
 class Connect(object):
     """provides session connections.."""
@@ -30,7 +79,17 @@ class Connect(object):
                  render_platform,
                  headers=None,
                  session=None,
-                 hooks=None):
+                 hooks=None,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 pool_block=False,
+                 keep_alive=True,
+                 timeout=None,
+                 retry=None,
+                 rate_limiter=None,
+                 cache=None,
+                 disk_cache=None,
+                 compress_min_size=None):
         """Initialize Connect instance.
 
         Args:
@@ -52,6 +111,37 @@ class Connect(object):
 
                     hooks = {'response': [print_resp_url, check_for_errors]}
 
+            pool_connections (int, optional): The number of connection pools
+                to cache, one pool per host.
+            pool_maxsize (int, optional): The maximum number of connections
+                to keep alive in each pool, should be at least the number of
+                threads sharing the connection.
+            pool_block (bool, optional): Whether the requests wait for a free
+                connection when the pool is exhausted, instead of opening
+                (and then discarding) an extra connection.
+            keep_alive (bool, optional): Whether the connections are kept
+                alive between the requests.
+            timeout (float or tuple, optional): The default ``(connect, read)``
+                timeouts in seconds of the requests, no timeout by default.
+            retry (rayvision_api.retry.RetryPolicy, optional): The policy to
+                retry the failed requests, ``RetryPolicy(total=0)`` disables
+                the retries.
+            rate_limiter (rayvision_api.rate_limit.RateLimiter, optional):
+                Limit the rate of the requests, shared by all the operators
+                of the connection.
+            cache (rayvision_api.cache.ResponseCache or bool, optional): The
+                cache of the responses of the queries, a new one by default,
+                ``False`` disables the caching.
+            disk_cache (rayvision_api.disk_cache.DiskCache or bool, optional):
+                The persistent cache of the responses of the catalog queries,
+                shared by the processes, ``True`` uses the file of the user
+                cache directory, no persistent cache by default.
+            compress_min_size (int, optional): The minimum size in bytes of
+                the bodies sent gzip compressed, for the servers accepting
+                ``Content-Encoding: gzip``, no compression by default.
+
+        The pool options are ignored if a session is given.
+
         References:
             https://alexwlchan.net/2017/10/requests-hooks/
 
@@ -65,24 +155,95 @@ class Connect(object):
         # Example: https://task.renderbus.com
         self._protocol = protocol
         self._protocol_domain = '{0}://{1}'.format(protocol, self.domain)
+        # Copy the default headers so that several connections (e.g. a sync
+        # and an async one) never share their ``accessId``.
+        self._headers = dict(HEADERS)
         if headers:
-            HEADERS.update(headers)
-        self._headers = HEADERS
+            self._headers.update(headers)
         self._headers['accessId'] = access_id
         self._headers['platform'] = self.render_platform
-        self._session_request = session or requests.Session()
+        self._signing_context = None
+        self._pool_options = {
+            'pool_connections': pool_connections,
+            'pool_maxsize': pool_maxsize,
+            'pool_block': pool_block,
+            'keep_alive': keep_alive,
+            'timeout': timeout,
+        }
+        self._session_request = session or self._create_session()
         self._hooks = hooks or {}
+        self.retry = retry or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        if cache is None or cache is True:
+            cache = ResponseCache()
+        elif cache is False:
+            cache = None
+        self.cache = cache
+        if disk_cache is True:
+            # Import local modules
+            from rayvision_api.disk_cache import DiskCache
+            disk_cache = DiskCache()
+        elif disk_cache is False:
+            disk_cache = None
+        self.disk_cache = disk_cache
+        self.compress_min_size = compress_min_size
+
+    def _create_session(self):
+        """requests.Session: Create the session used to send requests."""
+        session = requests.Session()
+        adapter = TransportAdapter(**self._pool_options)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    @property
+    def session(self):
+        """requests.Session: The session used to send requests."""
+        return self._session_request
+
+    @property
+    def connection_stats(self):
+        """dict: The counters of the requests and the new connections.
+
+        The requests sent on a kept-alive connection are counted as
+        ``reused_connections``. The counters are only available for the
+        sessions created by the connection.
+
+        """
+        adapter = self._session_request.get_adapter(self._protocol_domain)
+        stats = getattr(adapter, 'stats', None)
+        return stats.as_dict() if stats else {}
 
     @property
     def headers(self):
         """Get request headers dic."""
         return self._headers
 
-    def post(self, api_url, post_data=None, validator=True):
+    @property
+    def signing_context(self):
+        """signature.SigningContext: The precomputed state of the signatures.
+
+        The context is prepared again if the domain or the headers of the
+        connection were changed.
+
+        """
+        context = self._signing_context
+        if context is None or not context.matches(self.domain, self._headers):
+            context = signature.SigningContext(self._access_key, self.domain,
+                                               self._headers)
+            self._signing_context = context
+        return context
+
+    def post(self, api_url, post_data=None, validator=True, timeout=None,
+             use_cache=True):
         """Send an post request and return data object if no error occurred.
 
-        Request processing through the decorator, if the request fails more
-        than five times, then the exception is ran out.
+        The transient failures (connection errors, timeouts and HTTP 5xx) of
+        the idempotent requests are retried according to the retry policy, if
+        the request fails more than five times, then the exception is ran out.
+        The responses of the queries are cached by the cache of the
+        connection, and the successful updates remove the cached responses
+        they make stale.
 
         Args:
             api_url (rayvision_api.api.url.URL or str): The URL address of the
@@ -93,6 +254,195 @@ class Connect(object):
                         /api/render/user/queryUserSetting
             post_data (dict, optional): Request data.
             validator (bool, optional): Validator the data.
+            timeout (float or tuple, optional): The ``(connect, read)``
+                timeouts in seconds of this request, overrides the default
+                timeout of the connection.
+            use_cache (bool, optional): Whether a cached response may be
+                returned, the new response is cached anyway.
+
+        Returns:
+            dict or List: Response data.
+
+        Raises:
+            RayVisionAPIError: The request failed, It returns the error ID,
+                the error message, and the request address.
+            requests.RequestException: The request could not be sent.
+
+        """
+        if use_cache:
+            hit, data = self.get_cached(api_url, post_data)
+            if hit:
+                return data
+        generation = self.get_cache_generation(api_url)
+        data = self.send(self.prepare(api_url, post_data, validator),
+                         timeout=timeout)
+        self.set_cached(api_url, post_data, data, generation)
+        return data
+
+    @property
+    def cache_scope(self):
+        """str: The scope of the persistent responses of the connection."""
+        return '{}|{}|{}'.format(self._protocol_domain,
+                                 self._headers['platform'],
+                                 self._headers['accessId'])
+
+    def get_cached(self, api_url, post_data=None):
+        """Get the cached response of a request.
+
+        The response is looked up in the cache of the connection, then in
+        the persistent cache.
+
+        Args:
+            api_url (str): The API url.
+            post_data (dict, optional): Request data.
+
+        Returns:
+            tuple: True and the response if cached, False and None otherwise.
+
+        """
+        if self.cache is not None:
+            hit, data = self.cache.get(api_url, post_data)
+            if hit:
+                return hit, data
+        if self.disk_cache is not None:
+            hit, data = self.disk_cache.get(api_url, post_data,
+                                            scope=self.cache_scope)
+            if hit and self.cache is not None:
+                self.cache.set(api_url, post_data, data)
+            return hit, data
+        return False, None
+
+    def get_cache_generation(self, api_url):
+        """int: Get the generation of the cached responses of the API url.
+
+        It is read before sending a query, and passed to ``set_cached`` so
+        that a response made stale while the query is outstanding is not
+        cached.
+
+        """
+        if self.cache is None:
+            return None
+        return self.cache.get_generation(api_url)
+
+    def set_cached(self, api_url, post_data, data, generation=None):
+        """Cache the response of a successful request.
+
+        Args:
+            api_url (str): The API url.
+            post_data (dict): Request data.
+            data (object): Response data.
+            generation (int, optional): The generation of the cached
+                responses of the API url read before sending the request.
+
+        """
+        if self.cache is not None:
+            if (generation is not None and
+                    generation != self.cache.get_generation(api_url)):
+                return
+            self.cache.set(api_url, post_data, data, generation)
+        if self.disk_cache is not None:
+            self.disk_cache.set(api_url, post_data, data,
+                                scope=self.cache_scope)
+
+    def invalidate_cache(self, *api_urls):
+        """Remove the cached and the persistent responses of the API urls.
+
+        Args:
+            *api_urls (str): The API urls, e.g. ``ApiUrl.getLabelList``.
+
+        """
+        if self.cache is not None:
+            self.cache.invalidate(*api_urls)
+        if self.disk_cache is not None:
+            self.disk_cache.invalidate(*api_urls)
+
+    def prepare(self, api_url, post_data=None, validator=True):
+        """Validate, encode and sign a request without sending it.
+
+        Args:
+            api_url (str): The api url.
+            post_data (dict, optional): Request data.
+            validator (bool, optional): Validator the data.
+
+        Returns:
+            SignedRequest: The request to send with ``send``.
+
+        """
+        request_address, post_data, body, content_encoding = self._prepare(
+            api_url, post_data, validator)
+        return SignedRequest(api_url, request_address, post_data, body,
+                             self._sign(api_url, post_data,
+                                        content_encoding),
+                             time.time(), content_encoding)
+
+    def prepare_many(self, items, validator=True, executor=None,
+                     ahead=DEFAULT_PREPARE_AHEAD):
+        """Prepare many requests, e.g. before sending them concurrently.
+
+        The requests are prepared lazily and yielded in order, so the first
+        ones can be sent while the next ones are prepared. With an executor,
+        at most ``ahead`` requests are prepared ahead of the caller.
+
+        Examples:
+            .. code-block:: python
+
+                >>> with ThreadPoolExecutor(4) as executor:
+                ...     prepared = connect.prepare_many(
+                ...         ((ApiUrl.queryTaskInfo, {'taskIds': [task_id]})
+                ...          for task_id in task_ids),
+                ...         executor=executor)
+                ...     futures = [executor.submit(connect.send, request)
+                ...                for request in prepared]
+                ...     results = [future.result() for future in futures]
+
+        Args:
+            items (iterable of tuple): The api urls and the data of the
+                requests.
+            validator (bool, optional): Validator the data.
+            executor (concurrent.futures.Executor, optional): Prepare the
+                requests in the threads of the executor.
+            ahead (int, optional): The maximum number of requests prepared
+                ahead of the caller by the executor.
+
+        Yields:
+            SignedRequest: The prepared requests.
+
+        """
+        items = iter(items)
+        if executor is None:
+            for api_url, post_data in items:
+                yield self.prepare(api_url, post_data, validator)
+            return
+
+        pending = deque()
+
+        def _submit_next():
+            item = next(items, None)
+            if item is not None:
+                pending.append(executor.submit(self.prepare, item[0],
+                                               item[1], validator))
+
+        try:
+            for _ in range(max(ahead, 1)):
+                _submit_next()
+            while pending:
+                prepared = pending.popleft().result()
+                _submit_next()
+                yield prepared
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def send(self, prepared, timeout=None):
+        """Send a prepared request and return data object if no error occurred.
+
+        The cached responses made stale by the request are removed once it
+        succeeded.
+
+        Args:
+            prepared (SignedRequest): The request prepared by ``prepare``.
+            timeout (float or tuple, optional): The ``(connect, read)``
+                timeouts in seconds of this request.
 
         Returns:
             dict or List: Response data.
@@ -100,6 +450,102 @@ class Connect(object):
         Raises:
             RayVisionAPIError: The request failed, It returns the error ID,
                 the error message, and the request address.
+            requests.RequestException: The request could not be sent.
+
+        """
+        api_url = prepared.api_url
+        attempt = 0
+        while True:
+            while self.rate_limiter:
+                delay = self.rate_limiter.reserve(api_url)
+                if not delay:
+                    break
+                time.sleep(delay)
+            headers = self._get_headers(prepared, attempt)
+            try:
+                response = self._session_request.post(prepared.address,
+                                                      prepared.body,
+                                                      headers=headers,
+                                                      hooks=self._hooks,
+                                                      timeout=timeout)
+            except requests.RequestException as error:
+                if not self._should_retry(api_url, attempt, error):
+                    raise
+                self.logger.warning('Retry %s (%s): %s', api_url,
+                                    attempt + 1, error)
+            else:
+                if not self._should_retry(api_url, attempt,
+                                          status_code=response.status_code):
+                    break
+                self.logger.warning('Retry %s (%s): HTTP %s', api_url,
+                                    attempt + 1, response.status_code)
+            time.sleep(self.retry.get_backoff(attempt))
+            attempt += 1
+        if self.retry.is_retryable_status(response.status_code):
+            raise RayvisionAPIError(response.status_code, response.reason,
+                                    response.url)
+        data = self._handle_response(response.json(), prepared.data,
+                                     response.url)
+        self._invalidate_stale(api_url)
+        return data
+
+    def _invalidate_stale(self, api_url):
+        """Remove the cached responses made stale by a successful request."""
+        if self.cache is not None:
+            self.cache.invalidate_for(api_url)
+
+    def _get_headers(self, prepared, attempt):
+        """dict: Get the signed headers of an attempt of a prepared request.
+
+        The headers of the prepared request are used by its first attempt,
+        unless they are outdated. Every retry is signed with a new nonce and
+        timestamp.
+
+        """
+        if (attempt == 0 and
+                time.time() - prepared.signed_at < SIGNATURE_MAX_AGE):
+            return prepared.headers
+        return self._sign(prepared.api_url, prepared.data,
+                          prepared.content_encoding)
+
+    def _should_retry(self, api_url, attempt, error=None, status_code=None):
+        """Whether the failed attempt of a request is retried.
+
+        Args:
+            api_url (str): The api url.
+            attempt (int): The number of the failed attempt.
+            error (requests.RequestException, optional): The error raised by
+                the attempt.
+            status_code (int, optional): The HTTP status code of the
+                response of the attempt.
+
+        Returns:
+            bool: True if the request should be sent again.
+
+        """
+        if error is None:
+            return (self.retry.is_retryable_status(status_code) and
+                    self.retry.should_retry(api_url, attempt))
+        if isinstance(error, requests.ConnectTimeout):
+            return self.retry.should_retry(api_url, attempt, sent=False)
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return self.retry.should_retry(api_url, attempt)
+        return False
+
+    def _prepare(self, api_url, post_data=None, validator=True):
+        """Validate and encode the data of a request.
+
+        The body is encoded by slices straight to bytes, and compressed if
+        it reaches ``compress_min_size`` bytes.
+
+        Args:
+            api_url (str): The api url.
+            post_data (dict, optional): Request data.
+            validator (bool, optional): Validator the data.
+
+        Returns:
+            tuple: The request address, the validated data, the JSON
+                encoded body and its content encoding.
 
         """
         post_data = post_data or {}
@@ -108,24 +554,53 @@ class Connect(object):
             post_data = validate_data(post_data, schema_name)
         request_address = assemble_api_url(self.domain, api_url,
                                            protocol_type=self._protocol)
-        headers = self._handle_headers(api_url, post_data)
-        post_data = json.dumps(post_data)
+        body, content_encoding = encode_body(post_data,
+                                             self.compress_min_size)
         self.logger.debug('POST: %s', request_address)
+        if content_encoding or len(body) > MAX_LOGGED_BODY_SIZE:
+            self.logger.debug('HTTP Body: %s bytes %s', len(body),
+                              content_encoding or '')
+        else:
+            self.logger.debug('HTTP Body: %s', body)
+        return request_address, post_data, body, content_encoding
+
+    def _sign(self, api_url, post_data, content_encoding=None):
+        """dict: Get the signed headers of an attempt of a request.
+
+        The signature covers the data the body is encoded from, whatever its
+        content encoding.
+
+        """
+        headers = self._handle_headers(api_url, post_data)
+        if content_encoding:
+            headers['Content-Encoding'] = content_encoding
         self.logger.debug('HTTP Headers: %s', pformat(headers))
-        self.logger.debug('HTTP Body: %s', post_data)
-        response = self._session_request.post(request_address,
-                                              post_data,
-                                              headers=headers,
-                                              )
-        json_response = response.json()
+        return headers
+
+    def _handle_response(self, json_response, post_data, request_url):
+        """Map the ``{code, message, data}`` envelope to data or an error.
+
+        Args:
+            json_response (dict): The decoded response of the server.
+            post_data (dict): The data of the request.
+            request_url (str): The url of the request.
+
+        Returns:
+            dict or List: Response data.
+
+        Raises:
+            RayvisionAPIParameterError: The parameters of the request were
+                rejected by the server.
+            RayvisionAPIError: The request failed.
+
+        """
         self.logger.debug('HTTP Response: %s', json_response)
         code = json_response["code"]
         message = json_response['message']
         if code == 601:
-            raise RayvisionAPIParameterError(message, post_data, response.url)
+            raise RayvisionAPIParameterError(message, post_data, request_url)
         if code != 200:
-            raise RayvisionAPIError(code, message,
-                                    response.url)
+            raise RayvisionAPIError(code, message, request_url)
         return json_response["data"]
 
     def _handle_headers(self, api_url, data):
@@ -150,11 +625,13 @@ class Connect(object):
                     }
 
         """
-        headers = copy.deepcopy(self._headers)
-        headers['UTCTimestamp'] = str(int(time.time()))
-        headers['nonce'] = signature.generate_nonce()
-        msg = signature.generate_headers_body_str(self.domain, api_url,
-                                                  headers, data)
-        headers['signature'] = signature.generate_signature(self._access_key,
-                                                            msg)
+        dynamic_headers = {
+            'UTCTimestamp': str(int(time.time())),
+            'nonce': signature.generate_nonce(),
+        }
+        headers = dict(self._headers)
+        headers.update(dynamic_headers)
+        headers['signature'] = self.signing_context.sign(api_url,
+                                                         dynamic_headers,
+                                                         data)
         return headers
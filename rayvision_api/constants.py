@@ -6,6 +6,10 @@ API_VERSION = "1"
 # The name of the package.
 PACKAGE_NAME = 'rayvision_api'
 
+# The default size of the connection pools, same as ``requests``.
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
 # The all DCC software ID mappings, we can easily get the corresponding
 # ``cgId`` from the alias.
 
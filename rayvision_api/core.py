@@ -3,24 +3,49 @@
 # Import built-in modules
 import logging
 import os
-from rayvision_log import init_logger
-import requests
-
-try:
-    from functools import lru_cache
-except ImportError:
-    from backports.functools_lru_cache import lru_cache
 
 # Import local modules
-from rayvision_api.connect import Connect
 from rayvision_api.operators import RenderConfig
 from rayvision_api.operators import ProjectSettings
 from rayvision_api.operators import RenderJobs
 from rayvision_api.operators import UserProfile
+from rayvision_api.constants import DEFAULT_POOL_CONNECTIONS
+from rayvision_api.constants import DEFAULT_POOL_MAXSIZE
 from rayvision_api.constants import PACKAGE_NAME
 from rayvision_api.validator import DataValidator
 
 
+def get_credentials(access_id=None, access_key=None):
+    """Get the credentials of the API.
+
+    Args:
+        access_id (str, optional): The access id of API.
+        access_key (str, optional): The access key of the API.
+
+    Returns:
+        tuple: The access id and the access key, falling back to the
+            environment variables ``RAYVISION_API_ACCESS_ID`` and
+            ``RAYVISION_API_KEY``.
+
+    Raises:
+        TypeError: The access id or the access key is not specified.
+
+    """
+    access_id = access_id or os.getenv("RAYVISION_API_ACCESS_ID")
+    if not access_id:
+        raise TypeError(
+            'Required "access_id" not specified. Pass as argument or set '
+            'in environment variable RAYVISION_API_ACCESS_ID.'
+        )
+    access_key = access_key or os.getenv("RAYVISION_API_KEY")
+    if not access_key:
+        raise TypeError(
+            'Required "access_key" not specified. Pass as argument or set '
+            'in environment variable RAYVISION_API_KEY.'
+        )
+    return access_id, access_key
+
+
 class RayvisionAPI(object):
     """A Python-based API for Using Renderbus cloud rendering service.
 
@@ -32,6 +57,9 @@ class RayvisionAPI(object):
             >>> api_access_key = "xxxxx"
             >>> ray = RayvisionAPI(access_id=api_access_id,
             ...                    access_key=api_access_key)
+            # The user profile is loaded on first access, or in advance
+            # with its three queries sent concurrently.
+            >>> ray.user_profile.prefetch()
             # Print current user profiles.
             >>> print(ray.user_profile)
             # Access profile settings or info like a object.
@@ -60,7 +88,17 @@ class RayvisionAPI(object):
                  render_platform='4',
                  protocol='https',
                  logger=None,
-                 hooks=None):
+                 hooks=None,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 pool_block=False,
+                 keep_alive=True,
+                 timeout=None,
+                 retry=None,
+                 rate_limiter=None,
+                 cache=None,
+                 disk_cache=None,
+                 compress_min_size=None):
         """Initialize the Rayvision API instance.
 
         Args:
@@ -80,32 +118,48 @@ class RayvisionAPI(object):
                         resp.raise_for_status()
 
                     hooks = {'response': [print_resp_url, check_for_errors]}
+            pool_connections (int, optional): The number of connection pools
+                to cache, one pool per host.
+            pool_maxsize (int, optional): The maximum number of connections
+                to keep alive in each pool, should be at least the number of
+                threads sharing the API.
+            pool_block (bool, optional): Whether the requests wait for a free
+                connection when the pool is exhausted, instead of opening
+                (and then discarding) an extra connection.
+            keep_alive (bool, optional): Whether the connections are kept
+                alive between the requests.
+            timeout (float or tuple, optional): The default ``(connect, read)``
+                timeouts in seconds of the requests.
+            retry (rayvision_api.retry.RetryPolicy, optional): The policy to
+                retry the failed requests.
+            rate_limiter (rayvision_api.rate_limit.RateLimiter, optional):
+                Limit the rate of the requests of all the operators.
+            cache (rayvision_api.cache.ResponseCache or bool, optional): The
+                cache of the responses of the queries, a new one by default,
+                ``False`` disables the caching.
+            disk_cache (rayvision_api.disk_cache.DiskCache or bool, optional):
+                The persistent cache of the responses of the catalog queries,
+                shared by the processes, ``True`` uses the file of the user
+                cache directory.
+            compress_min_size (int, optional): The minimum size in bytes of
+                the bodies sent gzip compressed, no compression by default.
 
         References:
             https://alexwlchan.net/2017/10/requests-hooks/
 
         """
+        # The logging configuration and ``requests`` are only imported once an
+        # API is created, importing the package stays cheap.
+        from rayvision_api.connect import Connect
+
         self.logger = logger
 
         if not self.logger:
+            from rayvision_log import init_logger
             init_logger(PACKAGE_NAME)
             self.logger = logging.getLogger(__name__)
 
-        access_id = access_id or os.getenv("RAYVISION_API_ACCESS_ID")
-        if not access_id:
-            raise TypeError(
-                'Required "access_id" not specified. Pass as argument or set '
-                'in environment variable RAYVISION_API_ACCESS_ID.'
-            )
-        access_key = access_key or os.getenv("RAYVISION_API_KEY")
-        if not access_id:
-            raise TypeError(
-                'Required "access_key" not specified. Pass as argument or set '
-                'in environment variable RAYVISION_API_KEY.'
-            )
-
-        # Initialize the session instance.
-        self._request = requests.Session()
+        access_id, access_key = get_credentials(access_id, access_key)
 
         # Create a connection.
         self._connect = Connect(access_id,
@@ -113,8 +167,18 @@ class RayvisionAPI(object):
                                 protocol,
                                 domain,
                                 render_platform,
-                                session=self._request,
-                                hooks=hooks)
+                                hooks=hooks,
+                                pool_connections=pool_connections,
+                                pool_maxsize=pool_maxsize,
+                                pool_block=pool_block,
+                                keep_alive=keep_alive,
+                                timeout=timeout,
+                                retry=retry,
+                                rate_limiter=rate_limiter,
+                                cache=cache,
+                                disk_cache=disk_cache,
+                                compress_min_size=compress_min_size)
+        self._request = self._connect.session
 
         # Initialize all instances of api operators.
         self.user_profile = UserProfile(self._connect)
@@ -131,13 +195,13 @@ class RayvisionAPI(object):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self.render_jobs.stop_task_id_pool()
         self._request.close()
 
     def software_list(self):
         pass
 
     @property
-    @lru_cache(maxsize=None)
     def render_platforms(self):
         """Get the currently available rendering platform.
 
@@ -170,7 +234,7 @@ class RayvisionAPI(object):
                 return the detailed information of the submitted job.
 
         """
-        if submit_type not in ("maya", "houdini", "houdini"):
+        if submit_type not in ("maya", "houdini", "clarisse"):
             raise ValueError("Unsupported type of submit "
                              "({})".format(submit_type))
         validator = DataValidator(task_info, submit_type)
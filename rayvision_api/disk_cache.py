@@ -0,0 +1,371 @@
+"""Provides the persistent cache of the responses of the catalog queries.
+
+The catalogs of the farm (the platforms, the supported software and plugins,
+the error details) rarely change, the persistent cache keeps their responses
+in a SQLite file of the user cache directory, so that the new processes do
+not query them again until their time to live expires. The file is shared
+safely by the threads and the processes of the user.
+
+Examples:
+    .. code-block:: python
+
+        >>> from rayvision_api import RayvisionAPI
+        >>> ray = RayvisionAPI(access_id="xxxxxx",
+        ...                    access_key="xxxxx",
+        ...                    disk_cache=True)
+
+    Or from the command line::
+
+        python -m rayvision_api.disk_cache warm --app maya --os windows
+        python -m rayvision_api.disk_cache info
+        python -m rayvision_api.disk_cache clear
+
+"""
+
+# Import built-in modules
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+# Import local modules
+from rayvision_api.cache import make_key
+from rayvision_api.paths import get_disk_cache_file
+from rayvision_api.url import ApiUrl
+
+# The time to live in seconds of the responses kept on disk, by API url.
+DEFAULT_DISK_TTLS = {
+    ApiUrl.queryPlatforms: 24 * 3600,
+    ApiUrl.querySupportedSoftware: 24 * 3600,
+    ApiUrl.querySupportedPlugin: 24 * 3600,
+    ApiUrl.queryErrorDetail: 7 * 24 * 3600,
+}
+
+# The seconds to wait for the lock of the file held by another process.
+DEFAULT_LOCK_TIMEOUT = 30
+
+# The errors of the file handled as cache misses, e.g. a locked or corrupt
+# file, or a cache directory which cannot be created.
+_ERRORS = (sqlite3.Error, OSError)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    scope TEXT NOT NULL,
+    api_url TEXT NOT NULL,
+    key TEXT NOT NULL,
+    expires REAL NOT NULL,
+    response TEXT NOT NULL,
+    PRIMARY KEY (scope, api_url, key)
+)
+"""
+
+LOGGER = logging.getLogger(__name__)
+
+
+class DiskCache(object):
+    """A cache of the responses kept in a SQLite file.
+
+    The responses are keyed by a scope (the farm and the account of the
+    connection), the API url and the canonical JSON of the request data. The
+    expiry times use the wall clock, which is shared by the processes. The
+    errors of the file are logged and handled as cache misses, the cache
+    never makes a request fail.
+
+    """
+
+    def __init__(self, path=None, ttls=None, timeout=DEFAULT_LOCK_TIMEOUT,
+                 clock=None):
+        """Initialize the cache, the file is created on first use.
+
+        Args:
+            path (str, optional): The path of the SQLite file, in the user
+                cache directory by default.
+            ttls (dict, optional): The time to live in seconds of the
+                responses, by API url, ``DEFAULT_DISK_TTLS`` by default. The
+                responses of the other API urls are not kept.
+            timeout (float, optional): The seconds to wait for the lock of
+                the file held by another process.
+            clock (callable, optional): Return the current time in seconds.
+
+        """
+        self.path = path or get_disk_cache_file()
+        self.ttls = dict(DEFAULT_DISK_TTLS if ttls is None else ttls)
+        self.timeout = timeout
+        self._clock = clock or time.time
+        self._local = threading.local()
+
+    def _connection(self):
+        """sqlite3.Connection: Get the connection of the current thread.
+
+        The connections are opened again in a forked process, a SQLite
+        connection must not be used by two processes.
+
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # Created by another process in the meantime.
+                if not os.path.isdir(directory):
+                    raise
+        connection = sqlite3.connect(self.path, timeout=self.timeout,
+                                     isolation_level=None)
+        try:
+            # Readers do not block the writer, and the other way around.
+            connection.execute('PRAGMA journal_mode=WAL')
+        except sqlite3.DatabaseError:
+            # E.g. on the network file systems.
+            LOGGER.debug('The WAL journal is not supported by %s', self.path)
+        connection.execute(_SCHEMA)
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+    def get_ttl(self, api_url):
+        """float: Get the time to live of the responses of the API url."""
+        return self.ttls.get(api_url, 0)
+
+    def get(self, api_url, data=None, scope=''):
+        """Get the kept response of a request.
+
+        Args:
+            api_url (str): The API url.
+            data (dict, optional): The data of the request.
+            scope (str, optional): The scope of the response, e.g. the farm
+                and the account of the connection.
+
+        Returns:
+            tuple: True and the response if kept and fresh, False and None
+                otherwise.
+
+        """
+        if not self.get_ttl(api_url):
+            return False, None
+        try:
+            row = self._connection().execute(
+                'SELECT expires, response FROM responses '
+                'WHERE scope = ? AND api_url = ? AND key = ?',
+                (scope, str(api_url), make_key(api_url, data)[1])).fetchone()
+        except _ERRORS as error:
+            LOGGER.warning('Failed to read the cache %s: %s', self.path,
+                           error)
+            return False, None
+        if row is None or row[0] <= self._clock():
+            return False, None
+        return True, json.loads(row[1])
+
+    def set(self, api_url, data, response, scope=''):
+        """Keep the response of a request, if its API url is kept.
+
+        Args:
+            api_url (str): The API url.
+            data (dict): The data of the request.
+            response (object): The response data.
+            scope (str, optional): The scope of the response.
+
+        """
+        ttl = self.get_ttl(api_url)
+        if not ttl:
+            return
+        try:
+            self._connection().execute(
+                'INSERT OR REPLACE INTO responses '
+                '(scope, api_url, key, expires, response) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (scope, str(api_url), make_key(api_url, data)[1],
+                 self._clock() + ttl, json.dumps(response)))
+        except _ERRORS as error:
+            LOGGER.warning('Failed to write the cache %s: %s', self.path,
+                           error)
+
+    def invalidate(self, *api_urls):
+        """Remove the kept responses of the API urls.
+
+        Args:
+            *api_urls (str): The API urls, e.g. ``ApiUrl.queryPlatforms``.
+
+        Returns:
+            int: The number of removed responses.
+
+        """
+        if not api_urls:
+            return 0
+        try:
+            return self._connection().execute(
+                'DELETE FROM responses WHERE api_url IN ({})'.format(
+                    ', '.join('?' * len(api_urls))),
+                [str(api_url) for api_url in api_urls]).rowcount
+        except _ERRORS as error:
+            LOGGER.warning('Failed to write the cache %s: %s', self.path,
+                           error)
+            return 0
+
+    def purge(self):
+        """int: Remove the expired responses and get their number."""
+        try:
+            return self._connection().execute(
+                'DELETE FROM responses WHERE expires <= ?',
+                (self._clock(),)).rowcount
+        except _ERRORS as error:
+            LOGGER.warning('Failed to write the cache %s: %s', self.path,
+                           error)
+            return 0
+
+    def clear(self):
+        """Remove all the kept responses."""
+        try:
+            self._connection().execute('DELETE FROM responses')
+        except _ERRORS as error:
+            LOGGER.warning('Failed to write the cache %s: %s', self.path,
+                           error)
+
+    def info(self):
+        """Get the numbers of the kept responses.
+
+        Returns:
+            dict: The numbers of the fresh and the expired responses, by API
+                url.
+                e.g.:
+                    {
+                        "/api/render/common/queryPlatforms": {
+                            "fresh": 1,
+                            "expired": 0
+                        }
+                    }
+
+        """
+        try:
+            rows = self._connection().execute(
+                'SELECT api_url, SUM(expires > ?), SUM(expires <= ?) '
+                'FROM responses GROUP BY api_url',
+                (self._clock(), self._clock())).fetchall()
+        except _ERRORS as error:
+            LOGGER.warning('Failed to read the cache %s: %s', self.path,
+                           error)
+            return {}
+        return {api_url: {'fresh': fresh, 'expired': expired}
+                for api_url, fresh, expired in rows}
+
+    def close(self):
+        """Close the connection of the current thread."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            self._local.connection = None
+            connection.close()
+
+    def __len__(self):
+        try:
+            return self._connection().execute(
+                'SELECT COUNT(*) FROM responses').fetchone()[0]
+        except _ERRORS as error:
+            LOGGER.warning('Failed to read the cache %s: %s', self.path,
+                           error)
+            return 0
+
+    def __repr__(self):
+        return '{}(path={!r})'.format(self.__class__.__name__, self.path)
+
+
+def warm(connect, app_names=(), os_names=()):
+    """Query the catalogs again and keep their responses.
+
+    Args:
+        connect (rayvision_api.connect.Connect): The connection, with a
+            persistent cache.
+        app_names (iterable of str, optional): The names of the render
+            software of which the plugins are queried, e.g. ``maya``.
+        os_names (iterable of str, optional): The OS of the plugins, the one
+            of the connection by default.
+
+    Returns:
+        int: The number of the queries sent.
+
+    Raises:
+        ValueError: The connection has no persistent cache.
+
+    """
+    # Import local modules
+    from rayvision_api.operators.render_config import RenderConfig
+
+    if connect.disk_cache is None:
+        raise ValueError('The connection has no persistent cache.')
+    # The same data as ``RayvisionAPI.render_platforms``, so that its
+    # response is found.
+    zone = 1 if 'renderbus' in connect.domain.lower() else 2
+    requests = [(ApiUrl.queryPlatforms, {'zone': zone}),
+                (ApiUrl.querySupportedSoftware, None)]
+    for app_name in app_names:
+        # pylint: disable=protected-access
+        cg_id = RenderConfig._get_id_by_app_name(app_name)
+        for os_name in os_names or [connect.system_platform]:
+            requests.append((ApiUrl.querySupportedPlugin,
+                             {'cgId': cg_id, 'osName': os_name}))
+    for api_url, data in requests:
+        connect.post(api_url, data, use_cache=False)
+    return len(requests)
+
+
+def main(argv=None):
+    """Warm, show or clear the persistent cache from the command line."""
+    parser = argparse.ArgumentParser(
+        prog='python -m rayvision_api.disk_cache',
+        description='Manage the persistent cache of the catalog queries.')
+    parser.add_argument('--path', help='The path of the cache file.')
+    commands = parser.add_subparsers(dest='command')
+    warm_parser = commands.add_parser(
+        'warm', help='Query the catalogs again and keep their responses.')
+    warm_parser.add_argument('--access-id', help='The access id of the API, '
+                             'RAYVISION_API_ACCESS_ID by default.')
+    warm_parser.add_argument('--access-key', help='The access key of the API, '
+                             'RAYVISION_API_KEY by default.')
+    warm_parser.add_argument('--domain', default='task.renderbus.com')
+    warm_parser.add_argument('--platform', default='4')
+    warm_parser.add_argument('--protocol', default='https')
+    warm_parser.add_argument('--app', action='append', default=[],
+                             dest='app_names',
+                             help='The render software of the plugins.')
+    warm_parser.add_argument('--os', action='append', default=[],
+                             dest='os_names',
+                             help='The OS of the plugins.')
+    commands.add_parser('info', help='Show the numbers of kept responses.')
+    commands.add_parser('purge', help='Remove the expired responses.')
+    commands.add_parser('clear', help='Remove all the kept responses.')
+    args = parser.parse_args(argv)
+
+    disk_cache = DiskCache(args.path)
+    if args.command == 'warm':
+        # Import local modules
+        from rayvision_api.connect import Connect
+        from rayvision_api.core import get_credentials
+
+        access_id, access_key = get_credentials(args.access_id,
+                                                args.access_key)
+        connect = Connect(access_id, access_key, args.protocol, args.domain,
+                          args.platform, cache=False, disk_cache=disk_cache)
+        count = warm(connect, args.app_names, args.os_names)
+        print('Kept {} responses in {}'.format(count, disk_cache.path))
+    elif args.command == 'info':
+        print(disk_cache.path)
+        for api_url, counts in sorted(disk_cache.info().items()):
+            print('{}: {fresh} fresh, {expired} expired'.format(api_url,
+                                                                 **counts))
+    elif args.command == 'purge':
+        print('Removed {} responses'.format(disk_cache.purge()))
+    elif args.command == 'clear':
+        disk_cache.clear()
+        print('Cleared {}'.format(disk_cache.path))
+    else:
+        parser.print_help()
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -3,6 +3,7 @@
 from rayvision_api.operators.render_config import RenderConfig
 from rayvision_api.operators.project_settings import ProjectSettings
 from rayvision_api.operators.render_jobs import RenderJobs
+from rayvision_api.operators.render_jobs import SubmissionContext
 from rayvision_api.operators.user_profile import UserProfile
 
 # All public api.
@@ -10,5 +11,6 @@ __all__ = (
     'RenderConfig',
     'ProjectSettings',
     'RenderJobs',
+    'SubmissionContext',
     'UserProfile'
 )
@@ -3,11 +3,6 @@
 # Import built-in modules
 from pprint import pformat
 
-try:
-    from functools import lru_cache
-except ImportError:
-    from backports.functools_lru_cache import lru_cache
-
 
 class ProjectSettings(object):
     """The operator of the Project."""
@@ -46,7 +41,6 @@ class ProjectSettings(object):
                            {"delName": project_name})
         return True
 
-    @lru_cache(maxsize=None)
     def _get_project_list(self):
         """Get current exits projects.
 
@@ -66,7 +60,6 @@ class ProjectSettings(object):
         return self._connect.post(self._connect.url.getLabelList,
                                   validator=False)
 
-    @lru_cache(maxsize=2)
     def get_projects(self):
         """Get current exits projects.
 
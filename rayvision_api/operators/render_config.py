@@ -5,11 +5,6 @@ from enum import Enum
 from itertools import groupby
 from operator import itemgetter
 
-try:
-    from functools import lru_cache
-except ImportError:
-    from backports.functools_lru_cache import lru_cache
-
 
 class SoftWare(Enum):
     maya = "2000"
@@ -164,7 +159,6 @@ class RenderConfig(object):
         }
         return self._connect.post(self._connect.url.setDefaultRenderEnv, data)
 
-    @lru_cache(maxsize=2)
     def get_render_config(self, app_name, config_name=None):
         """Get the user rendering environment configuration.
 
@@ -222,7 +216,6 @@ class RenderConfig(object):
         }
         return data.get(config_name, return_data)
 
-    @lru_cache(maxsize=None)
     def get_supported_software(self):
         """Get supported rendering software.
 
@@ -250,7 +243,6 @@ class RenderConfig(object):
                                   validator=False)
 
     @property
-    @lru_cache(maxsize=2)
     def default_render_software(self):
         """dict: The current default render software."""
         info_list = self.get_supported_software()["renderInfoList"]
@@ -258,7 +250,6 @@ class RenderConfig(object):
             if info["cgId"] == self.get_supported_software()["defaultCgId"]:
                 return info
 
-    @lru_cache(maxsize=2)
     def get_plugins(self, app_name, os_name=None):
         """Get supported rendering software plugins by the software.
 
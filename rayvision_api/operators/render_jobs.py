@@ -1,9 +1,91 @@
 """Interface to operate on the task."""
-try:
-    from functools import lru_cache
-except ImportError:
-    from backports.functools_lru_cache import lru_cache
 import json
+import threading
+
+from rayvision_api import bulk
+from rayvision_api.pagination import iter_items
+from rayvision_api.pagination import iter_pages
+from rayvision_api.pagination import iter_pages_concurrently
+from rayvision_api.task_id_pool import DEFAULT_POOL_SIZE
+from rayvision_api.task_id_pool import TaskIdPool
+from rayvision_api.url import ApiUrl
+
+
+class SubmissionContext(object):
+    """The submission of one job to its own task.
+
+    The context allocates the ID of its task once, on first access, and
+    uploads the info of the job to this task and submits it. The contexts do
+    not share any state, the jobs can be submitted from many threads through
+    the same ``RenderJobs``.
+
+    Examples:
+        .. code-block:: python
+
+            >>> submission = ray.render_jobs.new_submission()
+            >>> job_info["task_info"]["task_id"] = submission.task_id
+            >>> submission.submit(job_info)
+
+    """
+
+    def __init__(self, render_jobs, task_id=None):
+        """Initialize the context.
+
+        Args:
+            render_jobs (RenderJobs): The operator of the tasks.
+            task_id (str, optional): The ID of an allocated task, allocated
+                on first access by default.
+
+        """
+        self._render_jobs = render_jobs
+        self._task_id = str(task_id) if task_id else None
+        self._lock = threading.Lock()
+        self.submitted = False
+        self.response = None
+
+    @property
+    def task_id(self):
+        """str: The ID of the task of the job, allocated on first access."""
+        if self._task_id is None:
+            with self._lock:
+                if self._task_id is None:
+                    self._task_id = self._render_jobs.allocate_task_id()
+        return self._task_id
+
+    def upload(self, job_info):
+        """Upload the info of the job to its task.
+
+        Args:
+            job_info (dict): The info of the render job.
+
+        """
+        # pylint: disable=protected-access
+        return self._render_jobs._post_json(job_info, task_id=self.task_id)
+
+    def submit(self, job_info):
+        """Upload the info of the job and submit its task.
+
+        Args:
+            job_info (dict): The info of the render job.
+
+        Returns:
+            dict: The information of the submitted task.
+
+        Raises:
+            ValueError: The job is already submitted.
+
+        """
+        if self.submitted:
+            raise ValueError('The task {} is already submitted.'.format(
+                self.task_id))
+        # pylint: disable=protected-access
+        self.response = self._render_jobs._submit_task(self.task_id, job_info)
+        self.submitted = True
+        return self.response
+
+    def __repr__(self):
+        return '{}(task_id={!r}, submitted={})'.format(
+            self.__class__.__name__, self._task_id, self.submitted)
 
 
 class RenderJobs(object):
@@ -11,6 +93,26 @@ class RenderJobs(object):
 
     TASK_PARAM = "taskIds"
 
+    # The operations which take a list of jobs id, see ``run_bulk``.
+    BULK_OPERATIONS = (
+        'stop_jobs',
+        'start_jobs',
+        'abort_jobs',
+        'delete_jobs',
+        'restart_failed_frames',
+        'set_job_overtime_top',
+    )
+
+    # The API url of each bulk operation.
+    _BULK_OPERATION_URLS = {
+        'stop_jobs': ApiUrl.stopTask,
+        'start_jobs': ApiUrl.startTask,
+        'abort_jobs': ApiUrl.abortTask,
+        'delete_jobs': ApiUrl.deleteTask,
+        'restart_failed_frames': ApiUrl.restartFailedFrames,
+        'set_job_overtime_top': ApiUrl.setOverTimeStop,
+    }
+
     def __init__(self, connect):
         """Initialize instance.
 
@@ -19,8 +121,8 @@ class RenderJobs(object):
 
         """
         self._connect = connect
-        self._has_submit = False
-        self._task_id = None
+        self._local = threading.local()
+        self.task_id_pool = None
 
     def _create_task(self,
                      count=1,
@@ -57,40 +159,44 @@ class RenderJobs(object):
             data['labels'] = labels
         return self._connect.post(self._connect.url.createTask, data)
 
-    def _generate_task_id(self):
-        """Get task id.
+    def new_submission(self, task_id=None):
+        """Start the submission of a job.
 
-        Example::
-
-            task_id_info = {
-                    "taskIdList": [1658434],
-                    "aliasTaskIdList": [2W1658434],
-                    "userId": 100093088
-                }
+        Args:
+            task_id (str, optional): The ID of an allocated task, allocated
+                on first access by default.
 
         Returns:
-            int: The ID number of the task.
+            SubmissionContext: The submission of the job.
 
         """
-        if not self._has_submit and self._task_id:
-            return self._task_id
-        task_id_info = self._create_task(count=1, out_user_id=None)
-        task_id_list = task_id_info.get("taskIdList")
-        self._task_id = task_id_list[0]
-        self._has_submit = False
-        return self._task_id
+        return SubmissionContext(self, task_id)
+
+    @property
+    def _submission(self):
+        """SubmissionContext: The submission of the current thread.
+
+        A new submission is started once the previous one was submitted.
+
+        """
+        submission = getattr(self._local, 'submission', None)
+        if submission is None or submission.submitted:
+            submission = self.new_submission()
+            self._local.submission = submission
+        return submission
 
     @property
     def task_id(self):
-        """int: The ID number of the render task.
+        """str: The ID number of the render task.
 
         Notes:
             As long as we do not initialize the class again or submit the task
             successfully, we can always continue to get the task id from the
-            class instance.
+            class instance. Each thread gets its own task, use
+            ``new_submission`` to submit several jobs from one thread.
 
         """
-        return str(self._generate_task_id())
+        return self._submission.task_id
 
     def submit_job(self,
                    job_info,
@@ -99,6 +205,8 @@ class RenderJobs(object):
                    only_id=False):
         """Submit a task to rayvision render farm.
 
+        The job is submitted to the task of ``task_id``.
+
         Args:
             job_info (dict): The info of the render job.
             asset_lsolation_model (str): Asset isolation type, Optional value,
@@ -108,16 +216,140 @@ class RenderJobs(object):
                 cant be empty.
 
         """
-        data = {
-            "taskId": self.task_id
-        }
-        self._post_json(job_info)
-        task_info = self._connect.post(self._connect.url.submitTask, data)
+        submission = self._submission
+        task_info = submission.submit(job_info)
         if only_id:
-            return self.task_id
-        self._has_submit = True
+            return submission.task_id
         return task_info
 
+    def create_task_ids(self, count, task_user_level=50, out_user_id=None,
+                        labels=None):
+        """Allocate the IDs of several tasks in a single request.
+
+        Args:
+            count (int): The quantity of task ID.
+            task_user_level (int): Set the user's task level to either 50 or
+                60, default is 50.
+            out_user_id (int, optional): The external user ID.
+            labels (list or tuple, optional): Custom task labels.
+
+        Returns:
+            list of str: The IDs of the new tasks.
+
+        """
+        task_id_info = self._create_task(count=count,
+                                         task_user_level=task_user_level,
+                                         out_user_id=out_user_id,
+                                         labels=labels)
+        return [str(task_id) for task_id in task_id_info["taskIdList"]]
+
+    def allocate_task_id(self):
+        """str: Get the ID of a new task, from the task ID pool if started."""
+        if self.task_id_pool is not None:
+            return self.task_id_pool.acquire()
+        return self.create_task_ids(1)[0]
+
+    def start_task_id_pool(self, size=DEFAULT_POOL_SIZE, **kwargs):
+        """Keep task IDs created in advance for the next submissions.
+
+        The pool is refilled in the background, the submissions take their
+        task ID from it without waiting for ``createTask``.
+
+        Args:
+            size (int, optional): The number of task IDs kept in advance.
+            **kwargs: The other options of the pool, see
+                ``rayvision_api.task_id_pool.TaskIdPool``.
+
+        Returns:
+            rayvision_api.task_id_pool.TaskIdPool: The started pool.
+
+        """
+        self.stop_task_id_pool()
+        self.task_id_pool = TaskIdPool(self, size=size, **kwargs).start()
+        return self.task_id_pool
+
+    def stop_task_id_pool(self, release=True):
+        """Stop the task ID pool and delete its unused tasks.
+
+        Args:
+            release (bool, optional): Whether the unused tasks are deleted.
+
+        Returns:
+            list of str: The unused task IDs.
+
+        """
+        pool, self.task_id_pool = self.task_id_pool, None
+        if pool is None:
+            return []
+        return pool.shutdown(release=release)
+
+    def _submit_task(self, task_id, job_info):
+        """Upload the info of a job and submit its task.
+
+        Args:
+            task_id (str): The ID of an allocated task.
+            job_info (dict): The info of the render job.
+
+        Returns:
+            dict: The information of the submitted task.
+
+        """
+        self._post_json(job_info, task_id=task_id)
+        return self._connect.post(self._connect.url.submitTask,
+                                  {"taskId": task_id})
+
+    def submit_jobs(self, jobs_info, task_ids=None,
+                    max_workers=bulk.DEFAULT_MAX_WORKERS, executor=None):
+        """Submit many jobs concurrently.
+
+        The IDs of all the tasks are allocated by a single ``createTask``
+        request, then the info of the jobs are uploaded and their tasks
+        submitted concurrently. The state of ``task_id`` and ``submit_job``
+        is not used, several batches can be submitted at the same time.
+
+        Examples:
+            .. code-block:: python
+
+                >>> submissions = ray.render_jobs.submit_jobs(shots_info,
+                ...                                           max_workers=16)
+                >>> failed = [submission for submission in submissions
+                ...           if not submission.ok]
+
+        Args:
+            jobs_info (list of dict): The info of the render jobs.
+            task_ids (list of str, optional): The IDs of allocated tasks, one
+                per job, allocated by ``create_task_ids`` by default.
+            max_workers (int, optional): The maximum number of jobs submitted
+                at the same time.
+            executor (concurrent.futures.Executor, optional): Submit the
+                jobs, a new thread pool by default.
+
+        Returns:
+            list of rayvision_api.bulk.JobSubmission: The task ID and the
+                response or the exception of each job, in order.
+
+        Raises:
+            ValueError: The number of task IDs differs from the number of
+                jobs.
+            RayvisionAPIError: The task IDs could not be allocated.
+
+        """
+        jobs_info = list(jobs_info)
+        if not jobs_info:
+            return []
+        if task_ids is None:
+            task_ids = self.create_task_ids(len(jobs_info))
+        if len(task_ids) != len(jobs_info):
+            raise ValueError('Got {} task IDs for {} jobs.'.format(
+                len(task_ids), len(jobs_info)))
+        submissions = [None] * len(jobs_info)
+        for index, response, error in bulk.map_chunks(
+                lambda item: self._submit_task(*item),
+                list(zip(task_ids, jobs_info)), max_workers, executor):
+            submissions[index] = bulk.JobSubmission(task_ids[index],
+                                                    response, error)
+        return submissions
+
     def stop_jobs(self, jobs_id):
         """Stop the task.
 
@@ -158,6 +390,90 @@ class RenderJobs(object):
         return self._connect.post(self._connect.url.deleteTask,
                                   {self.TASK_PARAM: jobs_id})
 
+    def _get_bulk_operation(self, operation):
+        """callable: Get the method of a bulk operation by its name.
+
+        Raises:
+            ValueError: The operation does not take a list of jobs id.
+
+        """
+        if operation not in self.BULK_OPERATIONS:
+            raise ValueError('Unsupported bulk operation {!r}, supporting: '
+                             '{}'.format(operation, self.BULK_OPERATIONS))
+        return getattr(self, operation)
+
+    def _get_bulk_retry_check(self, operation):
+        """callable: Get whether a failed chunk of an operation is retried.
+
+        The chunks of the idempotent operations are retried after any
+        failure, the others only once the server rejected them, a request
+        which failed after being sent may have been applied.
+
+        """
+        api_url = self._BULK_OPERATION_URLS[operation]
+        if self._connect.retry.is_idempotent(api_url):
+            return None
+        return bulk.is_answered
+
+    def run_bulk(self, operation, jobs_id, chunk_size=bulk.DEFAULT_CHUNK_SIZE,
+                 max_workers=bulk.DEFAULT_MAX_WORKERS,
+                 retries=bulk.DEFAULT_RETRIES, executor=None, **kwargs):
+        """Apply an operation to many jobs.
+
+        The IDs are split into chunks of ``chunk_size``, the chunks are sent
+        concurrently. A failed chunk is retried in two halves after the
+        backoff of the retry policy of the connection, so that the IDs
+        rejected by the server do not fail the others.
+
+        Notes:
+            The chunks of the operations which are not idempotent, according
+            to the retry policy of the connection, are only retried when the
+            server rejected them. E.g. a ``delete_jobs`` chunk whose response
+            timed out is reported as failed instead of being sent again.
+
+        Examples:
+            .. code-block:: python
+
+                >>> result = ray.render_jobs.run_bulk("stop_jobs", jobs_id)
+                >>> print(result.succeeded_ids, result.failed_ids)
+                >>> result = ray.render_jobs.run_bulk("set_job_overtime_top",
+                ...                                   jobs_id, overtime=1800)
+
+        Args:
+            operation (str): The name of the operation, one of
+                ``BULK_OPERATIONS``.
+            jobs_id (list of int): The id of the render jobs.
+            chunk_size (int, optional): The number of IDs per request.
+            max_workers (int, optional): The maximum number of requests sent
+                at the same time.
+            retries (int, optional): The maximum number of retries of a
+                failed chunk.
+            executor (concurrent.futures.Executor, optional): Send the
+                requests, a new thread pool by default.
+            **kwargs: The other arguments of the operation, e.g. the
+                ``overtime`` of ``set_job_overtime_top``.
+
+        Returns:
+            rayvision_api.bulk.BulkResult: The response of the chunk of each
+                successful ID, and the failed IDs with their exception.
+
+        Raises:
+            ValueError: The operation does not take a list of jobs id.
+
+        """
+        method = self._get_bulk_operation(operation)
+        chunks = bulk.chunked(bulk.unique(jobs_id), chunk_size)
+        result = bulk.BulkResult()
+        for chunk, response, error in bulk.run_chunks(
+                lambda chunk: method(chunk, **kwargs), chunks, max_workers,
+                executor, retries, self._connect.retry.get_backoff,
+                self._get_bulk_retry_check(operation)):
+            if error is None:
+                result.add_success(chunk, response)
+            else:
+                result.add_failure(chunk, error)
+        return result
+
     def update_priority(self, job_id, priority):
         """Update the render priority for the task by given task id.
 
@@ -207,10 +523,9 @@ class RenderJobs(object):
         data = {
             'taskIds': task_id_list,
         }
-        self._connect.post(self._connect.url, data)
+        self._connect.post(self._connect.url.fullSpeed, data)
         return True
 
-    @lru_cache(maxsize=2)
     def get_task_frames(self, task_id, page_num=1, page_size=1,
                         search_keyword=None):
         """Get task rendering frame details.
@@ -249,6 +564,13 @@ class RenderJobs(object):
                     }
 
         """
+        data = self._get_task_frames_data(task_id, page_num, page_size,
+                                          search_keyword)
+        return self._connect.post(self._connect.url.queryTaskFrames, data)
+
+    @staticmethod
+    def _get_task_frames_data(task_id, page_num, page_size, search_keyword):
+        """dict: Get the request data of a page of the frames."""
         data = {
             "taskId": task_id,
             "pageNum": page_num,
@@ -256,9 +578,51 @@ class RenderJobs(object):
         }
         if search_keyword:
             data["searchKeyword"] = search_keyword
-        return self._connect.post(self._connect.url.queryTaskFrames, data)
+        return data
+
+    def iter_task_frames(self, task_id, page_size=100, search_keyword=None,
+                         max_workers=4, ordered=True, executor=None):
+        """Iterate over all the frames of a task.
+
+        The first page is fetched to get the number of pages, then the other
+        pages are fetched concurrently by up to ``max_workers`` threads. The
+        pages are not cached, they are only held until their frames are
+        consumed.
+
+        Examples:
+            .. code-block:: python
+
+                >>> for frame in ray.render_jobs.iter_task_frames(1658434):
+                ...     print(frame["frameIndex"], frame["frameStatus"])
+
+        Args:
+            task_id (int): The task ID number.
+            page_size (int, optional): The number of frames per request.
+            search_keyword (str, optional): Only get the frames matching the
+                keyword, see ``get_task_frames``.
+            max_workers (int, optional): The maximum number of pages fetched
+                at the same time.
+            ordered (bool, optional): Whether the frames are yielded in the
+                order of the pages, otherwise as soon as their page arrives.
+            executor (concurrent.futures.Executor, optional): Fetch the pages,
+                a new thread pool by default.
+
+        Yields:
+            dict: The details of each frame, see ``get_task_frames``.
+
+        """
+        connect = self._connect
+
+        def _fetch_page(page_num):
+            data = self._get_task_frames_data(task_id, page_num, page_size,
+                                              search_keyword)
+            return connect.send(connect.prepare(connect.url.queryTaskFrames,
+                                                data))
+
+        return iter_items(iter_pages_concurrently(
+            _fetch_page, max_workers=max_workers, ordered=ordered,
+            executor=executor))
 
-    @lru_cache(maxsize=2)
     def get_all_job_frame_status(self):
         """Get the overview of task rendering frame.
 
@@ -307,7 +671,6 @@ class RenderJobs(object):
         }
         return self._connect.post(self._connect.url.restartFrame, data)
 
-    @lru_cache(maxsize=2)
     def get_job_info(self, jobs_id):
         """Get task details.
 
@@ -368,7 +731,114 @@ class RenderJobs(object):
         data = {"taskIds": jobs_id}
         return self._connect.post(self._connect.url.queryTaskInfo, data)
 
-    @lru_cache(maxsize=2)
+    def get_jobs_info(self, jobs_id, chunk_size=bulk.DEFAULT_CHUNK_SIZE,
+                      max_workers=bulk.DEFAULT_MAX_WORKERS, executor=None):
+        """Get the details of many jobs.
+
+        The IDs are split into chunks of ``chunk_size``, the chunks are
+        queried concurrently and their items are merged. A failed chunk does
+        not fail the others, it is reported in the result.
+
+        Examples:
+            .. code-block:: python
+
+                >>> result = ray.render_jobs.get_jobs_info(jobs_id)
+                >>> for job_id, job in result.items.items():
+                ...     print(job_id, job["taskStatus"])
+                >>> print(result.failed_ids)
+
+        Args:
+            jobs_id (list of int): The id of the render jobs.
+            chunk_size (int, optional): The number of IDs per request.
+            max_workers (int, optional): The maximum number of requests sent
+                at the same time.
+            executor (concurrent.futures.Executor, optional): Send the
+                requests, a new thread pool by default.
+
+        Returns:
+            rayvision_api.bulk.BulkResult: The details of the jobs indexed by
+                their ``id``, in the order of the chunks, and the failed
+                chunks.
+
+        """
+        chunks = bulk.chunked(bulk.unique(jobs_id), chunk_size)
+        responses = [None] * len(chunks)
+        result = bulk.BulkResult()
+        for index, response, error in bulk.map_chunks(
+                self.get_job_info, chunks, max_workers, executor):
+            if error is None:
+                responses[index] = response
+            else:
+                result.add_failure(chunks[index], error)
+        for response in responses:
+            result.add_items((response or {}).get('items'))
+        return result
+
+    def get_jobs(self, page_num=1, page_size=100, status_list=None):
+        """Get a page of the render jobs of the user.
+
+        Args:
+            page_num (int, optional): The number of the page, starting from 1.
+            page_size (int, optional): The number of jobs per page.
+            status_list (list of int, optional): Only get the jobs in these
+                statuses, e.g. ``[0, 5]``, all the jobs by default.
+
+        Returns:
+            dict: The page of the jobs, the items are the job details as
+                returned by ``get_job_info``.
+                e.g.:
+                    {
+                        "pageCount": 12,
+                        "pageNum": 1,
+                        "total": 1172,
+                        "size": 100,
+                        "items": [
+                            {
+                                "id": 19084,
+                                "taskAlias": "P19084",
+                                "taskStatus": 0,
+                                "sceneName": "3d66.com_593362_2018.max",
+                            }
+                        ]
+                    }
+
+        """
+        data = {
+            "pageNum": page_num,
+            "pageSize": page_size
+        }
+        if status_list:
+            data["statusList"] = list(status_list)
+        return self._connect.post(self._connect.url.getTaskList, data)
+
+    def iter_jobs(self, status_list=None, page_size=100, prefetch=True):
+        """Iterate over all the render jobs of the user, page by page.
+
+        Only one page is held at a time, whatever the number of jobs of the
+        user, and the next page is fetched while the caller processes the
+        current one.
+
+        Examples:
+            .. code-block:: python
+
+                >>> for job in ray.render_jobs.iter_jobs(status_list=[5]):
+                ...     print(job["id"], job["taskStatus"])
+
+        Args:
+            status_list (list of int, optional): Only get the jobs in these
+                statuses, all the jobs by default.
+            page_size (int, optional): The number of jobs per request.
+            prefetch (bool, optional): Whether the next page is fetched in
+                the background.
+
+        Yields:
+            dict: The details of each job.
+
+        """
+        return iter_items(iter_pages(
+            lambda page_num: self.get_jobs(page_num, page_size, status_list),
+            prefetch=prefetch))
+
     def error_detail(self, code, language='0'):
         """Get analysis error code.
 
@@ -407,7 +877,6 @@ class RenderJobs(object):
         }
         return self._connect.post(self._connect.url.queryErrorDetail, data)
 
-    @lru_cache(maxsize=2)
     def get_job_processing_img(self, job_id, frame_type=None):
         """Get the task progress diagram,
 
@@ -464,7 +933,6 @@ class RenderJobs(object):
             data["frameType"] = frame_type
         return self._connect.post(self._connect.url.loadTaskProcessImg, data)
 
-    @lru_cache(maxsize=2)
     def get_thumbnail_by_frame(self, frame_id, frame_status=4):
         """Get the thumbnail by frame.
 
@@ -488,11 +956,18 @@ class RenderJobs(object):
         return self._connect.post(self._connect.url.loadingFrameThumbnail,
                                   data)
 
-    def _post_json(self, json_content):
+    def _post_json(self, json_content, task_id=None):
+        """Upload the task.json of a task.
+
+        The task info is encoded to a compact JSON string, which the
+        connection escapes again, by slices, into the body. The string is
+        held along with the body, the signature covers it.
+
+        """
         data = {
-            "taskId": self.task_id,
+            "taskId": task_id or self.task_id,
             "fileName": "task.json",
-            "content": json.dumps(json_content),
+            "content": json.dumps(json_content, separators=(',', ':')),
         }
         return self._connect.post(self._connect.url.taskJsonFile,
                                   data, validator=False)
@@ -1,45 +1,64 @@
 """Interface to operate the user."""
 
 # Import built-in modules
-try:
-    from functools import lru_cache
-except ImportError:
-    from backports.functools_lru_cache import lru_cache
-
+from concurrent.futures import ThreadPoolExecutor
 from pprint import pformat
+import threading
 
 # Import local modules
 from rayvision_api.signature import hump2underline
 
 
 class UserProfile(object):
-    """API user information operator."""
+    """API user information operator.
+
+    The profile is loaded on the first access of one of its attributes,
+    or in advance by ``prefetch``.
+
+    Examples:
+        .. code-block:: python
+
+            >>> user_profile = UserProfile(connect)
+            # Query the profile, the settings and the transfer BID
+            # concurrently.
+            >>> user_profile.prefetch()
+            >>> print(user_profile.user_name)
+
+    """
 
     def __init__(self, connect, auto_login=True):
         """Initialize instance.
 
         Args:
             connect (rayvision_api.connect.Connect): The connect instance.
+            auto_login (bool, optional): Whether the profile is loaded on
+                the first access of one of its attributes, otherwise only
+                by ``login`` or ``prefetch``.
 
         """
         self._connect = connect
+        self._auto_login = auto_login
+        self._logged_in = False
+        self._login_lock = threading.Lock()
         self._info = {
             "local_os": self._connect.system_platform,
             "domain": connect.domain,
             "platform": connect.render_platform,
         }
-        if auto_login:
-            self._login()
 
     @property
     def profile(self):
+        """dict: The information of the user, loaded on first access."""
+        if self._auto_login and not self._logged_in:
+            with self._login_lock:
+                if not self._logged_in:
+                    self.login()
         return self._info
 
     @property
     def user_id(self):
         return self.query_user_profile()["userId"]
 
-    @lru_cache(maxsize=2)
     def query_user_profile(self):
         """Get user profile.
 
@@ -68,7 +87,6 @@ class UserProfile(object):
         return self._connect.post(self._connect.url.queryUserProfile,
                                   validator=False)
 
-    @lru_cache(maxsize=2)
     def query_user_setting(self):
         """Get user setting.
 
@@ -108,7 +126,6 @@ class UserProfile(object):
         }
         return self._connect.post(self._connect.url.updateUserSetting, data)
 
-    @lru_cache(maxsize=2)
     def get_transfer_bid(self):
         """Get user transfer BID.
 
@@ -125,19 +142,59 @@ class UserProfile(object):
         return self._connect.post(self._connect.url.getTransferBid,
                                   validator=False)
 
-    def _login(self):
+    def login(self):
         """Supplement user's configuration information.
 
         Call the API interface (query_user_profile, query_user_setting,
         get_transfer_bid) to supplement the user's configuration information
 
+        Returns:
+            dict: The information of the user.
+
         """
-        user_profile = self.query_user_profile()
-        user_setting = self.query_user_setting()
-        transfer_bid = self.get_transfer_bid()
-        user_profile.update(user_setting)
-        user_profile.update(transfer_bid)
+        self._merge_user_info([self.query_user_profile(),
+                               self.query_user_setting(),
+                               self.get_transfer_bid()])
+        return self._info
+
+    def prefetch(self, executor=None):
+        """Load the user's configuration information concurrently.
+
+        The profile, the settings and the transfer BID are queried at the
+        same time instead of one after the other.
+
+        Args:
+            executor (concurrent.futures.Executor, optional): Run the
+                queries in the threads of the executor, three new threads by
+                default.
+
+        Returns:
+            dict: The information of the user.
+
+        """
+        queries = (self.query_user_profile,
+                   self.query_user_setting,
+                   self.get_transfer_bid)
+        if executor is None:
+            with ThreadPoolExecutor(len(queries)) as pool:
+                return self.prefetch(pool)
+        futures = [executor.submit(query) for query in queries]
+        self._merge_user_info([future.result() for future in futures])
+        return self._info
+
+    def _merge_user_info(self, results):
+        """Merge the results of the queries into the user's information.
+
+        Args:
+            results (list of dict): The profile, the settings and the
+                transfer BID of the user.
+
+        """
+        user_profile = {}
+        for result in results:
+            user_profile.update(result)
         self._update_user_info(user_profile)
+        self._logged_in = True
 
     def _update_user_info(self, user_profile):
         """Update user's configuration information.
@@ -184,8 +241,13 @@ class UserProfile(object):
             key_underline = hump2underline(key)
             if key_underline != "platform":
                 self._info[key_underline] = value
+        # Index the information as attributes of the instance, found by the
+        # normal lookup. The attributes of the class keep the priority.
+        cls = type(self)
+        self.__dict__.update(
+            (key, value) for key, value in self._info.items()
+            if not key.startswith('_') and not hasattr(cls, key))
 
-    @lru_cache(maxsize=2)
     def get_transfer_server_config(self):
         """Get the user rendering environment configuration.
 
@@ -208,7 +270,6 @@ class UserProfile(object):
         data = {"zone": zone}
         return self._connect.post(self._connect.url.getTransferServerMsg, data)
 
-    @lru_cache(maxsize=2)
     def get_raysync_user_key(self):
         """Get the user rendering environment configuration.
 
@@ -232,17 +293,21 @@ class UserProfile(object):
     def id(self):
         return self.profile["user_id"]
 
-    @lru_cache(maxsize=2)
-    def __getattribute__(self, attribute):
-        """Get an attribute's value and perform deferred loading once."""
-        _getattr = super(UserProfile, self).__getattribute__
+    def __getattr__(self, attribute):
+        """Get the information of the user like an attribute.
+
+        Only called when the normal lookup fails, i.e. before the profile is
+        loaded, once it is loaded the information is indexed as attributes by
+        its snake_case name, e.g. ``user_name`` or ``input_bid``.
+
+        """
+        if attribute.startswith('_'):
+            # Do not load the profile for the private and special attributes,
+            # e.g. looked up by copy or pickle.
+            raise AttributeError(attribute)
         try:
-            value = _getattr(attribute)
-        except AttributeError:
-            try:
-                value = self.profile[attribute]
-            except KeyError:
-                raise AttributeError("UserOperator"
-                                     " object has no attribute "
-                                     "'{}'".format(attribute))
-        return value
+            return self.profile[attribute]
+        except KeyError:
+            raise AttributeError("UserOperator"
+                                 " object has no attribute "
+                                 "'{}'".format(attribute))
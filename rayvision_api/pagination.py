@@ -0,0 +1,154 @@
+"""Provides the iteration over the paginated queries.
+
+The paginated responses of the farm share the same shape:
+
+    {
+        "pageCount": 9,
+        "pageNum": 1,
+        "total": 17,
+        "size": 2,
+        "items": [...]
+    }
+
+"""
+
+# Import built-in modules
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+
+def has_next_page(page, page_num):
+    """Whether a page is followed by another one.
+
+    Args:
+        page (dict): The response of the page.
+        page_num (int): The number of the page, starting from 1.
+
+    Returns:
+        bool: False after the last page or an empty page.
+
+    """
+    if not page or not page.get('items'):
+        return False
+    page_count = page.get('pageCount')
+    return page_count is None or page_num < page_count
+
+
+def iter_pages(fetch_page, page_num=1, prefetch=True):
+    """Iterate over the responses of the pages, one page at a time.
+
+    At most two pages are held: the one given to the caller and, with the
+    prefetch, the next one being fetched in a background thread meanwhile.
+
+    Args:
+        fetch_page (callable): Get the response of a page from its number.
+        page_num (int, optional): The number of the first page.
+        prefetch (bool, optional): Whether the next page is fetched while
+            the caller processes the current one.
+
+    Yields:
+        dict: The response of each page.
+
+    """
+    executor = ThreadPoolExecutor(1) if prefetch else None
+    try:
+        page = fetch_page(page_num)
+        while True:
+            has_next = has_next_page(page, page_num)
+            future = None
+            if has_next and executor is not None:
+                future = executor.submit(fetch_page, page_num + 1)
+            yield page
+            if not has_next:
+                return
+            page_num += 1
+            page = (future.result() if future is not None else
+                    fetch_page(page_num))
+    finally:
+        if executor is not None:
+            # Do not wait for a page which the caller no longer needs.
+            executor.shutdown(wait=False)
+
+
+def iter_pages_concurrently(fetch_page, max_workers=4, ordered=True,
+                            executor=None):
+    """Iterate over the responses of the pages, fetched concurrently.
+
+    The first page is fetched to read the ``pageCount``, then the other
+    pages are fetched by up to ``max_workers`` threads. At most
+    ``max_workers`` pages are fetched ahead of the caller, whatever the
+    number of pages.
+
+    Args:
+        fetch_page (callable): Get the response of a page from its number.
+        max_workers (int, optional): The maximum number of pages fetched at
+            the same time.
+        ordered (bool, optional): Whether the pages are yielded in order,
+            otherwise as soon as they arrive.
+        executor (concurrent.futures.Executor, optional): Fetch the pages,
+            a new thread pool by default.
+
+    Yields:
+        dict: The response of each page.
+
+    """
+    first_page = fetch_page(1)
+    if not has_next_page(first_page, 1):
+        yield first_page
+        return
+    page_count = first_page.get('pageCount')
+    if page_count is None:
+        # The pages can only be discovered one after the other.
+        yield first_page
+        for page in iter_pages(fetch_page, page_num=2):
+            yield page
+        return
+
+    page_nums = iter(range(2, page_count + 1))
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers)
+    pending = deque() if ordered else set()
+    add = pending.append if ordered else pending.add
+
+    def _submit_next():
+        page_num = next(page_nums, None)
+        if page_num is not None:
+            add(executor.submit(fetch_page, page_num))
+
+    try:
+        for _ in range(max_workers):
+            _submit_next()
+        yield first_page
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                pending.difference_update(done)
+            for future in done:
+                page = future.result()
+                _submit_next()
+                yield page
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=False)
+
+
+def iter_items(pages):
+    """Iterate over the items of the pages.
+
+    Args:
+        pages (iterable of dict): The responses of the pages.
+
+    Yields:
+        dict: Each item of the pages.
+
+    """
+    for page in pages:
+        for item in page.get('items') or ():
+            yield item
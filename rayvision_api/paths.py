@@ -2,6 +2,7 @@
 
 # Import built-in modules
 import os
+import sys
 
 
 def package_root():
@@ -11,3 +12,34 @@ def package_root():
 def get_schema_file(name):
     root = package_root()
     return os.path.join(root, "schemas", "{}.yaml".format(name))
+
+
+def get_schema_artifact_file(name):
+    root = package_root()
+    return os.path.join(root, "schemas", "{}.json".format(name))
+
+
+def get_user_cache_dir():
+    """str: Get the directory of the caches of the current user.
+
+    The ``RAYVISION_API_CACHE_DIR`` environment variable overrides the
+    default directory of the system, e.g. ``~/.cache/rayvision_api`` on
+    Linux.
+
+    """
+    cache_dir = os.getenv("RAYVISION_API_CACHE_DIR")
+    if cache_dir:
+        return cache_dir
+    if os.name == 'nt':
+        root = os.getenv("LOCALAPPDATA") or os.path.expanduser("~")
+    elif sys.platform == 'darwin':
+        root = os.path.expanduser(os.path.join("~", "Library", "Caches"))
+    else:
+        root = (os.getenv("XDG_CACHE_HOME") or
+                os.path.expanduser(os.path.join("~", ".cache")))
+    return os.path.join(root, "rayvision_api")
+
+
+def get_disk_cache_file():
+    """str: Get the path of the persistent cache of the responses."""
+    return os.path.join(get_user_cache_dir(), "responses.sqlite")
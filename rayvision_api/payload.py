@@ -0,0 +1,108 @@
+"""Provides the encoding of the bodies of the requests.
+
+The task.json of a layered scene is uploaded as a JSON string embedded in
+the body of the request. The string is still escaped into the body, but by
+slices written straight to bytes, and optionally gzip compressed on the fly,
+so that neither a text copy of the whole body nor the uncompressed body is
+kept in memory.
+
+"""
+
+# Import built-in modules
+import io
+import json
+import zlib
+
+try:
+    from json.encoder import encode_basestring_ascii
+except ImportError:  # pragma: no cover
+    encode_basestring_ascii = json.dumps
+
+# The number of characters of a large string escaped at once.
+ENCODE_CHUNK_SIZE = 1 << 16
+
+# The compression level of the bodies, the JSON documents compress well even
+# with the fastest level.
+COMPRESS_LEVEL = 1
+
+# The content encoding of the compressed bodies.
+GZIP = 'gzip'
+
+
+def _iter_string(value):
+    """Yield the JSON string of a value, escaped by slices."""
+    if isinstance(value, bytes):
+        value = value.decode('utf-8')
+    yield '"'
+    for index in range(0, len(value), ENCODE_CHUNK_SIZE):
+        yield encode_basestring_ascii(
+            value[index:index + ENCODE_CHUNK_SIZE])[1:-1]
+    yield '"'
+
+
+def iter_json(data):
+    """Iterate over the JSON encoded data, by chunks.
+
+    The chunks are the same as ``json.dumps(data)``, the large string values
+    of a dict are escaped by slices of ``ENCODE_CHUNK_SIZE`` characters.
+
+    Args:
+        data (object): The data of a request.
+
+    Yields:
+        str: The chunks of the JSON document.
+
+    """
+    if not isinstance(data, dict):
+        yield json.dumps(data)
+        return
+    separator = '{'
+    for key, value in data.items():
+        yield separator
+        yield json.dumps(key)
+        yield ': '
+        if isinstance(value, (bytes, type(u''))) and (
+                len(value) > ENCODE_CHUNK_SIZE):
+            for chunk in _iter_string(value):
+                yield chunk
+        else:
+            yield json.dumps(value)
+        separator = ', '
+    yield '}' if data else '{}'
+
+
+def encode_body(data, compress_min_size=None):
+    """Encode the data of a request to the bytes of its body.
+
+    The body is compressed once it reaches ``compress_min_size`` bytes, the
+    uncompressed body of a large request is never held in memory.
+
+    Args:
+        data (object): The data of a request.
+        compress_min_size (int, optional): The minimum size in bytes of a
+            compressed body, the body is never compressed by default.
+
+    Returns:
+        tuple: The body and its content encoding, ``gzip`` or None.
+
+    """
+    buffer = io.BytesIO()
+    compressor = None
+    for chunk in iter_json(data):
+        chunk = chunk.encode('utf-8')
+        if compressor is None:
+            if (compress_min_size is None or
+                    buffer.tell() + len(chunk) < compress_min_size):
+                buffer.write(chunk)
+                continue
+            # Write the gzip container.
+            compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED,
+                                          16 + zlib.MAX_WBITS)
+            head = buffer.getvalue()
+            buffer = io.BytesIO()
+            buffer.write(compressor.compress(head))
+        buffer.write(compressor.compress(chunk))
+    if compressor is None:
+        return buffer.getvalue(), None
+    buffer.write(compressor.flush())
+    return buffer.getvalue(), GZIP
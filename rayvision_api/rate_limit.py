@@ -0,0 +1,299 @@
+"""Provides the client-side rate limiters of the requests.
+
+The buckets hand out *reservations*: ``reserve`` takes the tokens at once
+and returns how many seconds the caller has to wait before it may send, so
+the same bucket can be used from threads (``time.sleep``) and from asyncio
+(``asyncio.sleep``).
+
+A request limited by two buckets, the global and the one of its API url, is
+only given the tokens of both once they are available at the same time, a
+token reserved in advance would be refilled before the request is sent.
+
+Examples:
+    .. code-block:: python
+
+        >>> from rayvision_api import RayvisionAPI
+        >>> from rayvision_api.rate_limit import RateLimiter
+        >>> from rayvision_api.url import ApiUrl
+        >>> limiter = RateLimiter(rate=10,
+        ...                       per_url={ApiUrl.queryTaskFrames: 2})
+        >>> ray = RayvisionAPI(access_id="xxxxxx",
+        ...                    access_key="xxxxx",
+        ...                    rate_limiter=limiter)
+
+"""
+
+# Import built-in modules
+import json
+import os
+import threading
+import time
+
+if os.name == 'nt':
+    import msvcrt
+
+    def _lock_file(file_object):
+        file_object.seek(0)
+        msvcrt.locking(file_object.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(file_object):
+        file_object.seek(0)
+        msvcrt.locking(file_object.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock_file(file_object):
+        fcntl.flock(file_object.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(file_object):
+        fcntl.flock(file_object.fileno(), fcntl.LOCK_UN)
+
+_monotonic = getattr(time, 'monotonic', time.time)
+
+
+class TokenBucket(object):
+    """A thread-safe token bucket.
+
+    The bucket holds up to ``capacity`` tokens and is refilled with ``rate``
+    tokens per second, so the requests never exceed ``rate`` per second on
+    average and ``capacity`` in a burst.
+
+    """
+
+    def __init__(self, rate, capacity=None, clock=None):
+        """Initialize the bucket, it starts full.
+
+        Args:
+            rate (float): The number of tokens added per second.
+            capacity (float, optional): The maximum number of tokens, the
+                rate (one second of tokens) by default.
+            clock (callable, optional): Return the current time in seconds.
+
+        """
+        if rate <= 0:
+            raise ValueError("The rate must be positive.")
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(rate, 1))
+        self._clock = clock or _monotonic
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._last = self._clock()
+
+    def _refill(self, tokens, last, now):
+        """float: Get the tokens after refilling them since the last time."""
+        return min(self.capacity, tokens + (now - last) * self.rate)
+
+    def reserve(self, tokens=1):
+        """Take the tokens and get the time to wait until they are available.
+
+        Args:
+            tokens (float, optional): The number of tokens to take.
+
+        Returns:
+            float: The time in seconds to wait before sending.
+
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = self._refill(self._tokens, self._last, now)
+            self._last = now
+            self._tokens -= tokens
+            return max(-self._tokens / self.rate, 0.0)
+
+    def try_acquire(self, tokens=1):
+        """bool: Take the tokens only if they are available right now."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = self._refill(self._tokens, self._last, now)
+            self._last = now
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def get_delay(self, tokens=1):
+        """float: Get the time to wait until the tokens are available."""
+        with self._lock:
+            current = self._refill(self._tokens, self._last, self._clock())
+            return max((tokens - current) / self.rate, 0.0)
+
+    def release(self, tokens=1):
+        """Give back the tokens taken by a request which is not sent."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + tokens)
+
+    def acquire(self, tokens=1):
+        """Block until the tokens are available."""
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+
+
+class FileTokenBucket(TokenBucket):
+    """A token bucket shared by the processes through a locked file.
+
+    The state of the bucket is kept in the file and updated under an
+    exclusive file lock, so all the processes using the same path (e.g. the
+    workers of a pool) share one quota.
+
+    """
+
+    def __init__(self, path, rate, capacity=None, clock=None):
+        """Initialize the bucket.
+
+        Args:
+            path (str): The path of the file holding the state.
+            rate (float): The number of tokens added per second.
+            capacity (float, optional): The maximum number of tokens.
+            clock (callable, optional): Return the current time in seconds,
+                must be shared by the processes (the wall clock by default).
+
+        """
+        super(FileTokenBucket, self).__init__(rate, capacity,
+                                              clock=clock or time.time)
+        self.path = path
+
+    def _update(self, take):
+        """Refill the shared tokens and take some of them under the lock.
+
+        Args:
+            take (callable): Get the tokens to take from the current tokens.
+
+        Returns:
+            float: The tokens left, negative if reserved in advance.
+
+        """
+        with self._lock, open(self.path, 'a+') as file_object:
+            _lock_file(file_object)
+            try:
+                file_object.seek(0)
+                content = file_object.read()
+                now = self._clock()
+                if content:
+                    state = json.loads(content)
+                    tokens = self._refill(state['tokens'], state['last'], now)
+                else:
+                    tokens = self.capacity
+                tokens -= take(tokens)
+                file_object.seek(0)
+                file_object.truncate()
+                file_object.write(json.dumps({'tokens': tokens, 'last': now}))
+                file_object.flush()
+                return tokens
+            finally:
+                _unlock_file(file_object)
+
+    def reserve(self, tokens=1):
+        """Take the tokens and get the time to wait until they are available.
+
+        Args:
+            tokens (float, optional): The number of tokens to take.
+
+        Returns:
+            float: The time in seconds to wait before sending.
+
+        """
+        left = self._update(lambda current: tokens)
+        return max(-left / self.rate, 0.0)
+
+    def try_acquire(self, tokens=1):
+        """bool: Take the tokens only if they are available right now."""
+        taken = []
+
+        def _take(current):
+            if current < tokens:
+                return 0
+            taken.append(tokens)
+            return tokens
+
+        self._update(_take)
+        return bool(taken)
+
+    def get_delay(self, tokens=1):
+        """float: Get the time to wait until the tokens are available."""
+        current = self._update(lambda current: 0)
+        return max((tokens - current) / self.rate, 0.0)
+
+    def release(self, tokens=1):
+        """Give back the tokens taken by a request which is not sent."""
+        self._update(lambda current: -min(tokens, self.capacity - current))
+
+
+class RateLimiter(object):
+    """Limit the requests globally and per API url.
+
+    Any object with a ``reserve(api_url)`` method, returning zero once the
+    request may be sent or the seconds to wait before calling it again, can
+    be used as the rate limiter of a connection.
+
+    """
+
+    def __init__(self, rate=None, capacity=None, per_url=None, bucket=None):
+        """Initialize the limiter.
+
+        Args:
+            rate (float, optional): The global number of requests per second.
+            capacity (float, optional): The global burst of requests.
+            per_url (dict, optional): The limits of the API urls, map an api
+                url to its rate, to a tuple of rate and capacity, or to a
+                bucket.
+                e.g.:
+                    {
+                        ApiUrl.queryTaskFrames: 2,
+                        ApiUrl.queryTaskInfo: (5, 20),
+                    }
+            bucket (TokenBucket, optional): The global bucket, e.g. a
+                FileTokenBucket shared by several processes, instead of
+                ``rate`` and ``capacity``.
+
+        """
+        if bucket is None and rate:
+            bucket = TokenBucket(rate, capacity)
+        self.bucket = bucket
+        self._lock = threading.Lock()
+        self.buckets = {}
+        for api_url, limit in (per_url or {}).items():
+            if isinstance(limit, (int, float)):
+                limit = TokenBucket(limit)
+            elif isinstance(limit, (tuple, list)):
+                limit = TokenBucket(*limit)
+            self.buckets[api_url] = limit
+
+    def reserve(self, api_url):
+        """Take the tokens of a request if they are all available.
+
+        Nothing is taken in advance: the tokens of the global and the api
+        url buckets are either all taken at once, or all given back.
+
+        Args:
+            api_url (str): The api url of the request.
+
+        Returns:
+            float: Zero if the request may be sent now, otherwise the time in
+                seconds to wait before reserving it again.
+
+        """
+        buckets = [bucket for bucket in (self.buckets.get(api_url),
+                                         self.bucket)
+                   if bucket is not None]
+        with self._lock:
+            while True:
+                taken = []
+                for bucket in buckets:
+                    if not bucket.try_acquire():
+                        break
+                    taken.append(bucket)
+                else:
+                    return 0.0
+                for other in taken:
+                    other.release()
+                delay = bucket.get_delay()
+                if delay:
+                    return delay
+
+    def acquire(self, api_url):
+        """Block until the request of the api url may be sent."""
+        delay = self.reserve(api_url)
+        while delay:
+            time.sleep(delay)
+            delay = self.reserve(api_url)
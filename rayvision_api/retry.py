@@ -0,0 +1,105 @@
+"""Provides the retry policy of the requests."""
+
+# Import built-in modules
+import random
+
+# Import local modules
+from rayvision_api.url import IDEMPOTENT_API_URLS
+
+# The HTTP status codes of the transient server errors.
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+
+
+class RetryPolicy(object):
+    """Decide whether and when a failed request is sent again.
+
+    Only the requests of the idempotent API urls are replayed after a
+    transient failure, the others are only replayed if they never reached the
+    server (e.g. the connection could not be established). The delay between
+    the attempts grows exponentially up to ``backoff_max`` and is randomized
+    ("full jitter") so that many clients do not retry at the same moment.
+
+    Examples:
+        .. code-block:: python
+
+            >>> from rayvision_api import RayvisionAPI
+            >>> from rayvision_api.retry import RetryPolicy
+            >>> ray = RayvisionAPI(access_id="xxxxxx",
+            ...                    access_key="xxxxx",
+            ...                    retry=RetryPolicy(total=3,
+            ...                                      backoff_max=10))
+
+    References:
+        https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/
+
+    """
+
+    def __init__(self,
+                 total=5,
+                 backoff_factor=0.5,
+                 backoff_max=30,
+                 jitter=True,
+                 status_codes=RETRY_STATUS_CODES,
+                 idempotent_urls=IDEMPOTENT_API_URLS):
+        """Initialize the policy.
+
+        Args:
+            total (int, optional): The maximum number of retries, ``0``
+                disables the retries.
+            backoff_factor (float, optional): The delay in seconds before the
+                first retry, doubled for each further retry.
+            backoff_max (float, optional): The maximum delay in seconds
+                between two attempts.
+            jitter (bool, optional): Whether the delay is randomized between
+                zero and the exponential delay.
+            status_codes (iterable of int, optional): The HTTP status codes
+                of the transient server errors.
+            idempotent_urls (iterable of str, optional): The API urls which
+                are safe to replay.
+
+        """
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.status_codes = frozenset(status_codes)
+        self.idempotent_urls = frozenset(idempotent_urls)
+
+    def is_idempotent(self, api_url):
+        """bool: Whether the request of the API url is safe to replay."""
+        return api_url in self.idempotent_urls
+
+    def is_retryable_status(self, status_code):
+        """bool: Whether the HTTP status code is a transient server error."""
+        return status_code in self.status_codes
+
+    def should_retry(self, api_url, attempt, sent=True):
+        """Whether the failed attempt of a request is retried.
+
+        Args:
+            api_url (str): The api url of the request.
+            attempt (int): The number of the failed attempt, starting from
+                zero.
+            sent (bool, optional): False if the request surely did not reach
+                the server.
+
+        Returns:
+            bool: True if the request should be sent again.
+
+        """
+        if attempt >= self.total:
+            return False
+        return not sent or self.is_idempotent(api_url)
+
+    def get_backoff(self, attempt):
+        """float: Get the delay in seconds after the failed attempt."""
+        backoff = min(self.backoff_max, self.backoff_factor * (2 ** attempt))
+        if self.jitter:
+            return random.uniform(0, backoff)
+        return backoff
+
+    def __repr__(self):
+        return ('{}(total={}, backoff_factor={}, backoff_max={}, '
+                'jitter={})'.format(self.__class__.__name__, self.total,
+                                    self.backoff_factor, self.backoff_max,
+                                    self.jitter))
@@ -0,0 +1,139 @@
+"""Build and load the precompiled artifacts of the schema files.
+
+Parsing ``schema_v1.yaml`` with the pure-Python loader of PyYAML costs tens
+of milliseconds in every process validating a request. The schemas are also
+shipped as a JSON artifact next to the YAML file, which records the sha256 of
+the YAML it was built from. The artifact is used while it matches the YAML
+file, otherwise the YAML file is parsed.
+
+Build the artifact again after editing the schema file:
+
+    python -m rayvision_api.schema_artifact
+
+"""
+
+# Import built-in modules
+from __future__ import print_function
+import hashlib
+import json
+import logging
+
+# Import local modules
+from rayvision_api.constants import API_VERSION
+from rayvision_api.paths import get_schema_artifact_file
+from rayvision_api.paths import get_schema_file
+
+# The version of the layout of the artifacts.
+ARTIFACT_FORMAT = 1
+
+LOGGER = logging.getLogger(__name__)
+
+
+def hash_file(file_path):
+    """str: Get the sha256 hex digest of a file."""
+    with open(file_path, 'rb') as file_object:
+        return hashlib.sha256(file_object.read()).hexdigest()
+
+
+def read_artifact(artifact_path):
+    """Read an artifact.
+
+    Args:
+        artifact_path (str): The path of the artifact.
+
+    Returns:
+        dict: The artifact, None if it is missing or invalid.
+
+    """
+    try:
+        with open(artifact_path, 'r') as file_object:
+            artifact = json.load(file_object)
+    except (IOError, ValueError):
+        return None
+    if isinstance(artifact, dict) and artifact.get('format') == ARTIFACT_FORMAT:
+        return artifact
+    return None
+
+
+def is_fresh(artifact, schema_path):
+    """Whether the artifact was built from the current schema file.
+
+    Args:
+        artifact (dict): The artifact.
+        schema_path (str): The path of the YAML schema file.
+
+    Returns:
+        bool: True if the artifact matches the schema file, or if the schema
+            file is not shipped.
+
+    """
+    try:
+        return artifact['source_sha256'] == hash_file(schema_path)
+    except IOError:
+        return True
+
+
+def build_artifact(schema_path, artifact_path):
+    """Parse the YAML schema file and write its artifact.
+
+    Args:
+        schema_path (str): The path of the YAML schema file.
+        artifact_path (str): The path of the artifact to write.
+
+    Returns:
+        dict: The artifact.
+
+    """
+    from rayvision_api.file_operator import read_yaml
+    artifact = {
+        'format': ARTIFACT_FORMAT,
+        'source_sha256': hash_file(schema_path),
+        'schemas': read_yaml(schema_path),
+    }
+    with open(artifact_path, 'w') as file_object:
+        json.dump(artifact, file_object, indent=2, sort_keys=True)
+        file_object.write('\n')
+    return artifact
+
+
+def load_schema_file(schema_path, artifact_path):
+    """Load the schemas from the artifact, or from the YAML file if stale.
+
+    Args:
+        schema_path (str): The path of the YAML schema file.
+        artifact_path (str): The path of its artifact.
+
+    Returns:
+        dict: The schemas, by schema name.
+
+    Raises:
+        IOError: Neither the artifact nor the schema file could be read.
+
+    """
+    artifact = read_artifact(artifact_path)
+    if artifact is not None and is_fresh(artifact, schema_path):
+        return artifact['schemas']
+    LOGGER.debug('The schema artifact %s is missing or stale, parse %s.',
+                 artifact_path, schema_path)
+    # PyYAML is only imported when the artifact cannot be used.
+    from rayvision_api.file_operator import read_yaml
+    return read_yaml(schema_path)
+
+
+def load_schemas(api_version=API_VERSION):
+    """dict: Load the schemas of the api version, by schema name."""
+    name = 'schema_v{}'.format(api_version)
+    return load_schema_file(get_schema_file(name),
+                            get_schema_artifact_file(name))
+
+
+def main(api_version=API_VERSION):
+    """Build the artifact of the schema file of the api version."""
+    name = 'schema_v{}'.format(api_version)
+    artifact_path = get_schema_artifact_file(name)
+    build_artifact(get_schema_file(name), artifact_path)
+    print('Wrote {}'.format(artifact_path))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""Compile the simple schemas into specialized check functions.
+
+Most of the schemas of the api only check the types of some top-level fields
+and whether they are required, e.g.:
+
+    queryTaskInfo:
+      taskIds:
+        type: list
+        required: True
+
+Such a schema is compiled into a Python function doing only these checks,
+which is much faster than a ``cerberus.Validator``. The function reports the
+same errors as cerberus (with ``allow_unknown``), e.g.
+``{'taskIds': ['must be of list type']}``. The schemas using other rules,
+e.g. the task info of ``maya``, are not compiled and stay validated by
+cerberus.
+
+"""
+
+# The rules supported by the compiled functions.
+SUPPORTED_RULES = frozenset(['type', 'required'])
+
+_FUNCTION_TEMPLATE = '''def {name}(document, update=False):
+    errors = {{}}
+{checks}
+    return errors
+'''
+
+_REQUIRED_TEMPLATE = '''    if {field!r} not in document:
+        if not update:
+            errors[{field!r}] = ['required field']
+    else:
+{value_checks}'''
+
+_OPTIONAL_TEMPLATE = '''    if {field!r} in document:
+{value_checks}'''
+
+_VALUE_TEMPLATE = '''        value = document[{field!r}]
+        if value is None:
+            errors[{field!r}] = ['null value not allowed']
+        elif {type_check}:
+            errors[{field!r}] = ['must be of {type_name} type']
+'''
+
+
+def get_types_mapping():
+    """dict: Get the type definitions of cerberus, by type name."""
+    from cerberus import Validator
+    return Validator.types_mapping
+
+
+def is_compilable(schema):
+    """Whether the schema only uses the rules of the compiled functions.
+
+    Args:
+        schema (dict): The schema of a request, by field name.
+
+    Returns:
+        bool: True if the schema can be compiled.
+
+    """
+    types_mapping = get_types_mapping()
+    for rules in schema.values():
+        if not isinstance(rules, dict) or not set(rules) <= SUPPORTED_RULES:
+            return False
+        type_name = rules.get('type')
+        if (not isinstance(type_name, str) or
+                type_name not in types_mapping):
+            return False
+        if not isinstance(rules.get('required', False), bool):
+            return False
+    return True
+
+
+def generate_source(schema_name, schema):
+    """Generate the source code of the check function of a schema.
+
+    Args:
+        schema_name (str): The name of the schema, e.g. ``queryTaskInfo``.
+        schema (dict): The schema, it must be compilable.
+
+    Returns:
+        tuple: The name of the function, its source code and the types it
+            uses, by variable name.
+
+    """
+    name = 'check_{}'.format(schema_name)
+    types_mapping = get_types_mapping()
+    namespace = {}
+    checks = []
+    # Like cerberus, the errors are sorted by field name.
+    for index, field in enumerate(sorted(schema)):
+        rules = schema[field]
+        type_name = rules['type']
+        definition = types_mapping[type_name]
+        included = '_included_{}'.format(index)
+        namespace[included] = definition.included_types
+        type_check = 'not isinstance(value, {})'.format(included)
+        if definition.excluded_types:
+            excluded = '_excluded_{}'.format(index)
+            namespace[excluded] = definition.excluded_types
+            type_check = '{} or isinstance(value, {})'.format(type_check,
+                                                              excluded)
+        value_checks = _VALUE_TEMPLATE.format(field=field,
+                                              type_check=type_check,
+                                              type_name=type_name)
+        if rules.get('required', False):
+            template = _REQUIRED_TEMPLATE
+        else:
+            template = _OPTIONAL_TEMPLATE
+        checks.append(template.format(field=field, value_checks=value_checks))
+    source = _FUNCTION_TEMPLATE.format(name=name,
+                                       checks=''.join(checks).rstrip('\n'))
+    return name, source, namespace
+
+
+def compile_schema(schema_name, schema):
+    """Compile a schema into a check function.
+
+    Examples:
+        .. code-block:: python
+
+            >>> check = compile_schema(
+            ...     'queryTaskInfo',
+            ...     {'taskIds': {'type': 'list', 'required': True}})
+            >>> check({'taskIds': 1})
+            {'taskIds': ['must be of list type']}
+
+    Args:
+        schema_name (str): The name of the schema.
+        schema (dict): The schema of a request, by field name.
+
+    Returns:
+        callable: The function taking the document and the ``update`` flag
+            (skip the required fields) and returning the errors by field
+            name, or None if the schema cannot be compiled.
+
+    """
+    if not is_compilable(schema):
+        return None
+    name, source, namespace = generate_source(schema_name, schema)
+    code = compile(source, '<schema {}>'.format(schema_name), 'exec')
+    exec(code, namespace)  # pylint: disable=exec-used
+    function = namespace[name]
+    function.source = source
+    return function
@@ -1,13 +1,20 @@
-from builtins import bytes
 import base64
 import collections
-import copy
 import hashlib
 import hmac
 import random
 import re
 import time
 
+# The headers which do not participate in the signature.
+UNSIGNED_HEADERS = ('signature', 'Content-Type')
+
+# The headers which change for every request.
+DYNAMIC_HEADERS = ('UTCTimestamp', 'nonce')
+
+# The number of characters of a large value encoded at once when signing.
+ENCODE_CHUNK_SIZE = 1 << 16
+
 
 def generate_timestamp():
     """str: The timestamp."""
@@ -34,8 +41,8 @@ def generate_signature(key, msg):
         str: Decoded string.
 
     """
-    hash_obj = hmac.new(bytes(key, encoding='utf8'),
-                        msg=bytes(msg, encoding='utf8'),
+    hash_obj = hmac.new(key.encode('utf8'),
+                        msg=msg.encode('utf8'),
                         digestmod=hashlib.sha256)
     return base64.b64encode(hash_obj.digest())
 
@@ -81,25 +88,194 @@ def generate_headers_body_str(domain_name, api_url, header, body):
         str: Stitched string.
 
     """
-    header = copy.deepcopy(header)
-    body = copy.deepcopy(body)
-    try:
-        header.pop('signature')
-        header.pop('Content-Type')
-    except KeyError:
-        pass
-
-    header_body_dict = headers_body_sort(header, body)
-    header_body_list = [
-        '{0}={1}'.format(key, value)
-        for key, value in header_body_dict.items()
-    ]
-    result_str = '[POST]{domain_name}:{api_url}&{header_body_str}'.format(
-        domain_name=domain_name,
-        api_url=api_url,
-        header_body_str='&'.join(header_body_list)
-    )
-    return result_str
+    return ''.join(iter_headers_body_str(domain_name, api_url, header, body))
+
+
+def iter_headers_body_str(domain_name, api_url, header, body):
+    """Generate the formatted string piece by piece.
+
+    The fragments are yielded in order, joined they are the string of
+    ``generate_headers_body_str``, so they can be fed to a hash without
+    building the whole string.
+
+    Args:
+        domain_name (str): Domain name.
+        api_url (str): Requested path.
+        header (dict): Request header.
+        body (dict): Request body.
+
+    Yields:
+        str: The next fragment of the string.
+
+    """
+    # The inputs are only read, so they are not copied: the ``content`` of a
+    # ``taskJsonFile`` request can be several megabytes.
+    header_body = {
+        key: value
+        for key, value in header.items()
+        if key not in UNSIGNED_HEADERS
+    }
+    header_body.update(body)
+    header_body = formatted_headers(header_body)
+    return _iter_fragments(domain_name, api_url,
+                           ((key, header_body[key])
+                            for key in sorted(header_body)))
+
+
+def _iter_fragments(domain_name, api_url, items):
+    """Generate the fragments of the formatted string.
+
+    Args:
+        domain_name (str): Domain name.
+        api_url (str): Requested path.
+        items (iterable of tuple): The sorted keys and values of the
+            formatted header and body.
+
+    Yields:
+        str: The next fragment of the string.
+
+    """
+    yield '[POST]{domain_name}:{api_url}&'.format(domain_name=domain_name,
+                                                  api_url=api_url)
+    separator = ''
+    for key, value in items:
+        yield '{0}{1}='.format(separator, key)
+        yield value if isinstance(value, str) else '{0}'.format(value)
+        separator = '&'
+
+
+def generate_headers_body_signature(key, domain_name, api_url, header, body):
+    """Generate the signature of the request.
+
+    Same as ``generate_signature(key, generate_headers_body_str(...))``,
+    but the formatted string is fed to the HMAC piece by piece, a large value
+    is encoded in chunks.
+
+    Args:
+        key (str): String added to the processing.
+        domain_name (str): Domain name.
+        api_url (str): Requested path.
+        header (dict): Request header.
+        body (dict): Request body.
+
+    Returns:
+        bytes: The base64 encoded signature.
+
+    """
+    hash_obj = hmac.new(key.encode('utf8'), digestmod=hashlib.sha256)
+    update_hmac(hash_obj,
+                iter_headers_body_str(domain_name, api_url, header, body))
+    return base64.b64encode(hash_obj.digest())
+
+
+def update_hmac(hash_obj, fragments):
+    """Feed the UTF-8 encoded fragments to the HMAC.
+
+    The small fragments are joined and the large ones are split, so the HMAC
+    is updated with chunks of about ``ENCODE_CHUNK_SIZE`` characters.
+
+    Args:
+        hash_obj (hmac.HMAC): The HMAC to update.
+        fragments (iterable of str): The fragments of the string.
+
+    """
+    pending = []
+    pending_size = 0
+    for fragment in fragments:
+        if len(fragment) > ENCODE_CHUNK_SIZE:
+            if pending:
+                hash_obj.update(''.join(pending).encode('utf8'))
+                pending = []
+                pending_size = 0
+            for index in range(0, len(fragment), ENCODE_CHUNK_SIZE):
+                hash_obj.update(
+                    fragment[index:index + ENCODE_CHUNK_SIZE].encode('utf8'))
+            continue
+        pending.append(fragment)
+        pending_size += len(fragment)
+        if pending_size >= ENCODE_CHUNK_SIZE:
+            hash_obj.update(''.join(pending).encode('utf8'))
+            pending = []
+            pending_size = 0
+    if pending:
+        hash_obj.update(''.join(pending).encode('utf8'))
+
+
+class SigningContext(object):
+    """The precomputed state to sign the requests of a connection.
+
+    The HMAC keyed with the access key and the sorted static headers
+    (``accessId``, ``channel``, ``platform``, ``version``...) are prepared
+    once, signing a request only merges the timestamp, the nonce and the
+    body into them. The signatures are the same as the ones of
+    ``generate_headers_body_signature``.
+
+    """
+
+    def __init__(self, key, domain_name, headers):
+        """Initialize the context.
+
+        Args:
+            key (str): The access key.
+            domain_name (str): Domain name.
+            headers (dict): The headers of the connection.
+
+        """
+        self.domain_name = domain_name
+        self.headers = dict(headers)
+        self._hmac = hmac.new(key.encode('utf8'),
+                              digestmod=hashlib.sha256)
+        static_headers = formatted_headers({
+            key: value
+            for key, value in headers.items()
+            if key not in UNSIGNED_HEADERS and key not in DYNAMIC_HEADERS
+        })
+        self._static_items = sorted(static_headers.items())
+
+    def matches(self, domain_name, headers):
+        """bool: Whether the context was prepared for the headers."""
+        return domain_name == self.domain_name and headers == self.headers
+
+    def sign(self, api_url, dynamic_headers, body):
+        """Generate the signature of a request.
+
+        Args:
+            api_url (str): Requested path.
+            dynamic_headers (dict): The headers which change for every
+                request, e.g. the timestamp and the nonce.
+            body (dict): Request body.
+
+        Returns:
+            bytes: The base64 encoded signature.
+
+        """
+        dynamic = dict(dynamic_headers)
+        dynamic.update(body)
+        dynamic = formatted_headers(dynamic)
+        # Like ``header.update(body)``, a top-level key of the body replaces
+        # the header, whatever the keys it is flattened to.
+        items = [item for item in self._static_items
+                 if item[0] not in dynamic and item[0] not in body]
+        items.extend(dynamic.items())
+        items.sort()
+        hash_obj = self._hmac.copy()
+        if _get_size(dynamic) < ENCODE_CHUNK_SIZE:
+            # Format a small request at once, the streaming costs more than
+            # the whole string.
+            hash_obj.update('[POST]{0}:{1}&{2}'.format(
+                self.domain_name, api_url,
+                '&'.join(['{0}={1}'.format(key, value)
+                          for key, value in items])).encode('utf8'))
+        else:
+            update_hmac(hash_obj,
+                        _iter_fragments(self.domain_name, api_url, items))
+        return base64.b64encode(hash_obj.digest())
+
+
+def _get_size(items):
+    """int: Get the number of characters of the string values."""
+    return sum(len(value) for value in items.values()
+               if isinstance(value, str))
 
 
 def formatted_headers(headers):
@@ -199,10 +375,9 @@ def headers_body_sort(header, body):
             request parameters are sorted.
 
     """
-    copy_header = copy.deepcopy(header)
-    body = copy.deepcopy(body)
-    copy_header.update(body)
-    new_header = formatted_headers(copy_header)
+    header_body = dict(header)
+    header_body.update(body)
+    new_header = formatted_headers(header_body)
     sorted_key_list = sorted(new_header)
     new_dict = collections.OrderedDict()
     for key in sorted_key_list:
@@ -0,0 +1,241 @@
+"""Provides the pool of the task IDs created in advance.
+
+The submission of a job starts with the creation of its task, the pool keeps
+task IDs created in advance by a background thread, so that a job can be
+uploaded and submitted without waiting for ``createTask``.
+
+Examples:
+    .. code-block:: python
+
+        >>> from rayvision_api import RayvisionAPI
+        >>> with RayvisionAPI(access_id="xxxxxx",
+        ...                   access_key="xxxxx") as ray:
+        ...     ray.render_jobs.start_task_id_pool(size=5)
+        ...     # The task ID is taken from the pool.
+        ...     ray.render_jobs.submit_job(job_info)
+
+"""
+
+# Import built-in modules
+from collections import deque
+import logging
+import threading
+import time
+
+# The default number of task IDs kept in advance.
+DEFAULT_POOL_SIZE = 10
+
+# The default age in seconds after which an unused task ID is discarded.
+DEFAULT_MAX_AGE = 30 * 60
+
+# The delay in seconds before creating the task IDs again after a failure.
+RETRY_DELAY = 5
+
+_monotonic = getattr(time, 'monotonic', time.time)
+
+LOGGER = logging.getLogger(__name__)
+
+
+class TaskIdPool(object):
+    """A thread-safe pool of task IDs refilled in the background.
+
+    The pool is refilled with a single ``createTask`` request once it holds
+    ``min_size`` IDs or less, and ``RETRY_DELAY`` seconds after a failed
+    refill. The IDs older than ``max_age`` are discarded, and the unused ones
+    are deleted on shutdown.
+
+    """
+
+    def __init__(self, render_jobs, size=DEFAULT_POOL_SIZE, min_size=None,
+                 max_age=DEFAULT_MAX_AGE, clock=None):
+        """Initialize the pool, it is filled once started.
+
+        Args:
+            render_jobs (rayvision_api.operators.RenderJobs): The operator
+                creating the tasks.
+            size (int, optional): The number of task IDs kept in advance.
+            min_size (int, optional): The number of IDs left which triggers
+                a refill, half of the size by default, it must be less than
+                the size.
+            max_age (float, optional): The age in seconds after which an
+                unused task ID is discarded.
+            clock (callable, optional): Return the current time in seconds.
+
+        """
+        if size < 1:
+            raise ValueError('The size of the pool must be positive.')
+        min_size = size // 2 if min_size is None else min_size
+        if not 0 <= min_size < size:
+            raise ValueError('The minimum size of the pool must be between '
+                             '0 and the size of the pool excluded.')
+        self.size = size
+        self.min_size = min_size
+        self.max_age = max_age
+        self._render_jobs = render_jobs
+        self._clock = clock or _monotonic
+        self._condition = threading.Condition()
+        self._task_ids = deque()
+        self._expired = []
+        self._thread = None
+        self._closed = False
+        self._retry_at = None
+        self.error = None
+
+    def __len__(self):
+        return len(self._task_ids)
+
+    def _discard_expired(self):
+        """Move the expired IDs to the ones to delete, under the lock."""
+        deadline = self._clock() - self.max_age
+        while self._task_ids and self._task_ids[0][1] <= deadline:
+            self._expired.append(self._task_ids.popleft()[0])
+
+    def _needs_refill(self):
+        """bool: Whether the pool must be refilled, under the lock."""
+        self._discard_expired()
+        return len(self._task_ids) <= self.min_size
+
+    def _get_wait_timeout(self):
+        """float: Get the seconds until the oldest ID expires."""
+        if not self._task_ids:
+            return None
+        return max(self._task_ids[0][1] + self.max_age - self._clock(), 0)
+
+    def _get_retry_delay(self):
+        """float: Get the seconds left before a failed refill is retried."""
+        if self._retry_at is None:
+            return 0
+        return max(self._retry_at - self._clock(), 0)
+
+    def start(self):
+        """Start refilling the pool in the background.
+
+        Returns:
+            TaskIdPool: The pool itself.
+
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('The task ID pool is shut down.')
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run,
+                                                name='TaskIdPool')
+                self._thread.daemon = True
+                self._thread.start()
+        return self
+
+    def _run(self):
+        """Refill the pool until it is shut down."""
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if not self._needs_refill():
+                        timeout = self._get_wait_timeout()
+                    else:
+                        timeout = self._get_retry_delay()
+                        if not timeout:
+                            break
+                    self._condition.wait(timeout)
+                if self._closed:
+                    return
+                count = self.size - len(self._task_ids)
+                expired, self._expired = self._expired, []
+            self._delete(expired)
+            if count <= 0:
+                continue
+            try:
+                task_ids = self._render_jobs.create_task_ids(count)
+            except Exception as error:  # pylint: disable=broad-except
+                LOGGER.warning('Failed to create %s task IDs: %s', count,
+                               error)
+                with self._condition:
+                    self.error = error
+                    self._retry_at = self._clock() + RETRY_DELAY
+                continue
+            created_at = self._clock()
+            with self._condition:
+                closed = self._closed
+                if not closed:
+                    self._task_ids.extend((task_id, created_at)
+                                          for task_id in task_ids)
+                    self.error = None
+                    self._retry_at = None
+            if closed:
+                # The pool was shut down without waiting for this refill.
+                self._delete(task_ids)
+                return
+
+    def acquire(self):
+        """Take a task ID.
+
+        The ID is taken from the pool if any is left, otherwise a task is
+        created right away.
+
+        Returns:
+            str: The ID of an unused task.
+
+        Raises:
+            RuntimeError: The pool is shut down.
+
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('The task ID pool is shut down.')
+            self._discard_expired()
+            task_id = self._task_ids.popleft()[0] if self._task_ids else None
+            # Wake up the refill if the pool runs low, unless it backs off
+            # after a failure.
+            if self._needs_refill() and not self._get_retry_delay():
+                self._condition.notify_all()
+        if task_id is None:
+            task_id = self._render_jobs.create_task_ids(1)[0]
+        return task_id
+
+    def _delete(self, task_ids):
+        """Delete the unused tasks, the failures are only logged."""
+        if not task_ids:
+            return
+        try:
+            self._render_jobs.delete_jobs(task_ids)
+        except Exception as error:  # pylint: disable=broad-except
+            LOGGER.warning('Failed to delete the unused tasks %s: %s',
+                           task_ids, error)
+
+    def shutdown(self, release=True, wait=True):
+        """Stop refilling the pool and release the unused task IDs.
+
+        The tasks of a refill still running without waiting for it are
+        deleted once created.
+
+        Args:
+            release (bool, optional): Whether the unused tasks are deleted.
+            wait (bool, optional): Whether to wait for the running refill.
+
+        Returns:
+            list of str: The unused task IDs.
+
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if wait and thread is not None:
+            thread.join()
+        with self._condition:
+            task_ids = [task_id for task_id, _ in self._task_ids]
+            task_ids.extend(self._expired)
+            self._task_ids.clear()
+            self._expired = []
+        if release:
+            self._delete(task_ids)
+        return task_ids
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    def __repr__(self):
+        return '{}(size={}, available={})'.format(self.__class__.__name__,
+                                                  self.size, len(self))
@@ -8,11 +8,27 @@ References:
 
 """
 import os, sys
+import json
 import re
+import threading
+import zlib
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
 
 # pylint: disable=import-error
 import pytest
 
+# The asyncio API needs the ``async`` generators of Python 3.6, its tests do
+# not even parse with the older versions.
+collect_ignore = []
+if sys.version_info < (3, 6):
+    collect_ignore.append('test_aio.py')
+
 
 @pytest.fixture(name='user_info_dict')
 def user_info():
@@ -96,3 +112,92 @@ def rayvision_connect(user_info_dict):
     from rayvision_api.connect import Connect
     user_info_dict['headers'] = {'version': 'dev'}
     return Connect(**user_info_dict)
+
+
+class _FarmServer(ThreadingMixIn, HTTPServer):
+    """A local stand-in of the farm that speaks the envelope."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), _FarmHandler)
+        self.domain = '127.0.0.1:{}'.format(self.server_address[1])
+        self.received = []
+        # Map the last part of the api url to the data, or to a callable
+        # which gets the decoded body and returns the whole envelope, or the
+        # HTTP status and the envelope.
+        self.responses = {}
+
+    def respond(self, schema_name, body):
+        response = self.responses.get(schema_name, {})
+        if callable(response):
+            return response(body)
+        envelope = {'code': 200, 'message': 'success', 'data': {}}
+        envelope.update(response)
+        return envelope
+
+
+class _FarmHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        length = int(self.headers.get('Content-Length', 0))
+        content = self.rfile.read(length)
+        if self.headers.get('Content-Encoding') == 'gzip':
+            content = zlib.decompress(content, 16 + zlib.MAX_WBITS)
+        body = json.loads(content.decode('utf-8'))
+        self.server.received.append((self.path, dict(self.headers), body))
+        envelope = self.server.respond(self.path.split('/')[-1], body)
+        status = 200
+        if isinstance(envelope, tuple):
+            status, envelope = envelope
+        content = json.dumps(envelope).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+@pytest.fixture()
+def farm_server():
+    """Run a local HTTP server which answers like the render farm."""
+    server = _FarmServer()
+    thread = threading.Thread(target=server.serve_forever,
+                              kwargs={'poll_interval': 0.01})
+    thread.daemon = True
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture()
+def farm_connect(farm_server, user_info_dict):
+    """Create a connection to the local farm server."""
+    from rayvision_api.connect import Connect
+    return Connect(user_info_dict['access_id'],
+                   user_info_dict['access_key'],
+                   'http',
+                   farm_server.domain,
+                   '2')
+
+
+class FakeClock(object):
+    """A clock which only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def clock():
+    """Get a clock which only moves when told to."""
+    return FakeClock()
@@ -0,0 +1,93 @@
+"""Test rayvision_api.adapters.TransportAdapter functions."""
+
+# Import built-in modules
+import threading
+
+# pylint: disable=import-error
+import pytest
+from requests.adapters import HTTPAdapter
+
+from rayvision_api.adapters import TransportAdapter
+from rayvision_api.connect import Connect
+
+
+@pytest.fixture()
+def connect_factory(farm_server, user_info_dict):
+    """Create connections to the local farm server."""
+
+    def _connect(**kwargs):
+        kwargs.setdefault('cache', False)
+        return Connect(user_info_dict['access_id'],
+                       user_info_dict['access_key'],
+                       'http',
+                       farm_server.domain,
+                       '2',
+                       **kwargs)
+
+    return _connect
+
+
+# pylint: disable=redefined-outer-name
+def test_keep_alive_reuses_connection(connect_factory):
+    """Test the sequential requests are sent on one connection."""
+    connect = connect_factory()
+    for _ in range(5):
+        connect.post(connect.url.queryAllFrameStats, validator=False)
+    assert connect.connection_stats == {'requests': 5,
+                                        'new_connections': 1,
+                                        'reused_connections': 4}
+
+
+def test_disable_keep_alive(connect_factory):
+    """Test every request opens a new connection without keep-alive."""
+    connect = connect_factory(keep_alive=False)
+    for _ in range(3):
+        connect.post(connect.url.queryAllFrameStats, validator=False)
+    assert connect.connection_stats['new_connections'] == 3
+
+
+def test_blocking_pool_bounds_connections(connect_factory):
+    """Test the threads share the connections of a blocking pool."""
+    connect = connect_factory(pool_maxsize=2, pool_block=True)
+
+    def _poll():
+        for _ in range(5):
+            connect.post(connect.url.queryAllFrameStats, validator=False)
+
+    threads = [threading.Thread(target=_poll) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = connect.connection_stats
+    assert stats['requests'] == 30
+    assert stats['new_connections'] <= 2
+
+
+def test_timeouts(connect_factory, mocker):
+    """Test the default and the per-request timeouts are sent."""
+    send = mocker.spy(HTTPAdapter, 'send')
+    connect = connect_factory(timeout=(3, 30))
+    connect.post(connect.url.queryAllFrameStats, validator=False)
+    assert send.call_args[1]['timeout'] == (3, 30)
+    connect.post(connect.url.queryAllFrameStats, validator=False, timeout=1)
+    assert send.call_args[1]['timeout'] == 1
+
+
+def test_hooks(connect_factory):
+    """Test the custom hooks are called for the responses."""
+    urls = []
+    connect = connect_factory(
+        hooks={'response': [lambda resp, *args, **kwargs: urls.append(
+            resp.url)]})
+    connect.post(connect.url.queryAllFrameStats, validator=False)
+    assert urls[0].endswith('/api/render/task/queryAllFrameStats')
+
+
+def test_custom_session_has_no_stats(connect_factory):
+    """Test the counters are only kept for the sessions we created."""
+    import requests
+    connect = connect_factory(session=requests.Session())
+    assert connect.connection_stats == {}
+    assert isinstance(connect_factory().session.get_adapter('https://'),
+                      TransportAdapter)
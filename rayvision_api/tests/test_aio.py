@@ -0,0 +1,366 @@
+"""Test the rayvision_api.aio asyncio API."""
+
+# pylint: disable=import-error
+import pytest
+
+pytest.importorskip('aiohttp')
+
+# pylint: disable=wrong-import-position
+import asyncio
+import json
+import time
+
+from rayvision_api import signature
+from rayvision_api.aio import AsyncRayvisionAPI
+from rayvision_api.exception import RayvisionAPIError
+from rayvision_api.exception import RayvisionAPIParameterError
+from rayvision_api.rate_limit import RateLimiter
+from rayvision_api.retry import RetryPolicy
+
+
+def run(coroutine):
+    """Run the coroutine in a new event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+@pytest.fixture()
+def async_api(farm_server, user_info_dict):
+    """Get an AsyncRayvisionAPI which talks to the local farm server."""
+    return AsyncRayvisionAPI(access_id=user_info_dict['access_id'],
+                             access_key=user_info_dict['access_key'],
+                             domain=farm_server.domain,
+                             render_platform='2',
+                             protocol='http')
+
+
+# pylint: disable=redefined-outer-name
+def test_post_is_signed(async_api, farm_server, user_info_dict):
+    """Test the server can verify the signature of the async requests."""
+    farm_server.responses['queryTaskFrames'] = {'data': {'items': [1]}}
+
+    async def _main():
+        async with async_api as api:
+            return await api.render_jobs.get_task_frames('1658434')
+
+    assert run(_main()) == {'items': [1]}
+    path, headers, body = farm_server.received[0]
+    header = {key: headers[key] for key in ('accessId', 'channel',
+                                            'platform', 'UTCTimestamp',
+                                            'nonce', 'version')}
+    msg = signature.generate_headers_body_str(farm_server.domain, path,
+                                              header, body)
+    expected = signature.generate_signature(user_info_dict['access_key'], msg)
+    assert headers['signature'] == expected.decode('utf-8')
+    assert body == {'taskId': '1658434', 'pageNum': 1, 'pageSize': 1}
+
+
+def test_error_mapping(async_api, farm_server):
+    """Test the error codes are mapped to the same exceptions."""
+    farm_server.responses['stopTask'] = {'code': 604,
+                                         'message': 'Stop task failed.'}
+    farm_server.responses['deleteTask'] = {'code': 601,
+                                           'message': 'Delete task failed.'}
+
+    async def _main(operator, jobs_id):
+        async with async_api as api:
+            return await getattr(api.render_jobs, operator)(jobs_id)
+
+    with pytest.raises(RayvisionAPIError) as err:
+        run(_main('stop_jobs', ['336463']))
+    assert 'Stop task failed.' in str(err.value)
+    with pytest.raises(RayvisionAPIParameterError):
+        run(_main('delete_jobs', ['336463']))
+
+
+def test_validation_before_sending(async_api, farm_server):
+    """Test invalid data is rejected before any request is sent."""
+    with pytest.raises(ValueError):
+        run(async_api.render_jobs.stop_jobs('336463'))
+    assert not farm_server.received
+
+
+def test_concurrent_requests(async_api, farm_server):
+    """Test many requests can be in flight on one event loop."""
+    farm_server.responses['queryTaskInfo'] = lambda body: {
+        'code': 200, 'message': 'success',
+        'data': {'items': [{'id': body['taskIds'][0]}]}}
+
+    async def _main():
+        async with async_api as api:
+            return await asyncio.gather(*[
+                api.render_jobs.get_job_info([task_id])
+                for task_id in range(20)])
+
+    results = run(_main())
+    assert [result['items'][0]['id'] for result in results] == list(range(20))
+
+
+def test_login(async_api, farm_server):
+    """Test the user profile is loaded from the three queries."""
+    farm_server.responses['queryUserProfile'] = {'data': {'userName': 'ray',
+                                                          'userId': 1}}
+    farm_server.responses['queryUserSetting'] = {'data': {'taskOverTime': 12}}
+    farm_server.responses['getTransferBid'] = {'data': {'input_bid': '10201'}}
+
+    async def _main():
+        async with async_api as api:
+            await api.login()
+            return api.user_profile
+
+    user_profile = run(_main())
+    assert user_profile.user_name == 'ray'
+    assert user_profile.task_over_time == 12
+    assert user_profile.input_bid == '10201'
+
+
+def test_submit_job(async_api, farm_server):
+    """Test the job is uploaded and submitted to the same task."""
+    farm_server.responses['createTask'] = {'data': {'taskIdList': [1658434]}}
+
+    async def _main():
+        async with async_api as api:
+            return await api.render_jobs.submit_job({'task_info': {}},
+                                                    only_id=True)
+
+    assert run(_main()) == '1658434'
+    paths = [path.split('/')[-1] for path, _, _ in farm_server.received]
+    assert paths == ['createTask', 'taskJsonFile', 'submitTask']
+    assert farm_server.received[1][2]['taskId'] == '1658434'
+    assert farm_server.received[2][2] == {'taskId': '1658434'}
+
+
+def test_connection_stats(farm_server, user_info_dict):
+    """Test the kept-alive connections are reused by the async requests."""
+    api = AsyncRayvisionAPI(access_id=user_info_dict['access_id'],
+                            access_key=user_info_dict['access_key'],
+                            domain=farm_server.domain,
+                            protocol='http',
+                            pool_maxsize=1)
+
+    async def _main():
+        async with api:
+            await asyncio.gather(*[api.render_jobs.get_all_job_frame_status()
+                                   for _ in range(5)])
+            return api.connect.connection_stats
+
+    assert run(_main()) == {'requests': 5,
+                            'new_connections': 1,
+                            'reused_connections': 4}
+
+
+def test_retry(async_api, farm_server):
+    """Test the async idempotent requests are retried."""
+    statuses = [503, 200]
+    farm_server.responses['queryTaskInfo'] = lambda body: (
+        statuses.pop(0), {'code': 200, 'message': '', 'data': {'items': []}})
+    async_api.connect.retry = RetryPolicy(backoff_factor=0)
+
+    async def _main():
+        async with async_api as api:
+            return await api.render_jobs.get_job_info([1])
+
+    assert run(_main()) == {'items': []}
+    assert len(farm_server.received) == 2
+    assert (farm_server.received[0][1]['nonce'] !=
+            farm_server.received[1][1]['nonce'] or
+            farm_server.received[0][1]['signature'] !=
+            farm_server.received[1][1]['signature'])
+
+
+def test_rate_limiter(async_api, farm_server):
+    """Test the async requests wait for the rate limiter."""
+    async_api.connect.rate_limiter = RateLimiter(rate=50, capacity=1)
+
+    async def _main():
+        async with async_api as api:
+            start = time.time()
+            await asyncio.gather(*[api.render_jobs.get_all_job_frame_status()
+                                   for _ in range(5)])
+            return time.time() - start
+
+    assert run(_main()) >= 0.08
+    assert len(farm_server.received) == 5
+
+
+def test_iter_jobs(async_api, farm_server):
+    """Test the jobs of all the pages are iterated asynchronously."""
+    jobs = [{'id': index} for index in range(5)]
+
+    def _respond(body):
+        start = (body['pageNum'] - 1) * body['pageSize']
+        return {'code': 200, 'message': 'success', 'data': {
+            'pageCount': 3,
+            'pageNum': body['pageNum'],
+            'items': jobs[start:start + body['pageSize']],
+        }}
+
+    farm_server.responses['getTaskList'] = _respond
+
+    async def _main():
+        async with async_api as api:
+            return [job async for job in api.render_jobs.iter_jobs(
+                page_size=2)]
+
+    assert run(_main()) == jobs
+    assert len(farm_server.received) == 3
+
+
+def test_iter_task_frames(async_api, farm_server):
+    """Test the frames of all the pages are fetched concurrently."""
+    frames = [{'id': index} for index in range(7)]
+
+    def _respond(body):
+        start = (body['pageNum'] - 1) * body['pageSize']
+        return {'code': 200, 'message': 'success', 'data': {
+            'pageCount': 4,
+            'pageNum': body['pageNum'],
+            'items': frames[start:start + body['pageSize']],
+        }}
+
+    farm_server.responses['queryTaskFrames'] = _respond
+
+    async def _main():
+        async with async_api as api:
+            ordered = [frame async for frame in
+                       api.render_jobs.iter_task_frames('1', page_size=2)]
+            arrived = [frame async for frame in
+                       api.render_jobs.iter_task_frames('1', page_size=2,
+                                                         ordered=False)]
+            return ordered, arrived
+
+    ordered, arrived = run(_main())
+    assert ordered == frames
+    assert sorted(arrived, key=lambda frame: frame['id']) == frames
+
+
+def test_get_jobs_info(async_api, farm_server):
+    """Test the chunks of the job details are queried concurrently."""
+
+    def _respond(body):
+        if 13 in body['taskIds']:
+            return {'code': 604, 'message': 'Query task failed.', 'data': {}}
+        return {'code': 200, 'message': 'success', 'data': {
+            'items': [{'id': job_id} for job_id in body['taskIds']]}}
+
+    farm_server.responses['queryTaskInfo'] = _respond
+
+    async def _main():
+        async with async_api as api:
+            return await api.render_jobs.get_jobs_info(list(range(20)),
+                                                        chunk_size=4)
+
+    result = run(_main())
+    assert result.failed_ids == [12, 13, 14, 15]
+    assert list(result.items) == [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 16,
+                                  17, 18, 19]
+
+
+def test_run_bulk(async_api, farm_server):
+    """Test the bulk operations isolate the rejected IDs."""
+
+    def _respond(body):
+        if 5 in body['taskIds']:
+            return {'code': 604, 'message': 'Rejected.', 'data': {}}
+        return {'code': 200, 'message': 'success', 'data': {}}
+
+    farm_server.responses['deleteTask'] = _respond
+    async_api.connect.retry = RetryPolicy(total=0, backoff_factor=0)
+
+    async def _main():
+        async with async_api as api:
+            return await api.render_jobs.run_bulk(
+                'delete_jobs', list(range(8)), chunk_size=4, retries=2)
+
+    result = run(_main())
+    assert result.failed_ids == [5]
+    assert sorted(result.succeeded_ids) == [0, 1, 2, 3, 4, 6, 7]
+
+
+def test_submit_jobs(async_api, farm_server):
+    """Test a batch of jobs is submitted concurrently."""
+    farm_server.responses['createTask'] = lambda body: {
+        'code': 200, 'message': 'success',
+        'data': {'taskIdList': list(range(1, body['count'] + 1))}}
+
+    async def _main():
+        async with async_api as api:
+            return await api.render_jobs.submit_jobs([{}] * 5)
+
+    submissions = run(_main())
+    assert [submission.task_id for submission in submissions] == [
+        '1', '2', '3', '4', '5']
+    assert all(submission.ok for submission in submissions)
+    assert len(farm_server.received) == 1 + 5 * 2
+
+
+def test_upload_compressed(farm_server, user_info_dict):
+    """Test the task info is uploaded gzip compressed."""
+    job_info = {'scene_info': {'layers': [{'name': 'layer'}] * 1000}}
+
+    async def _main():
+        async with AsyncRayvisionAPI(
+                access_id=user_info_dict['access_id'],
+                access_key=user_info_dict['access_key'],
+                domain=farm_server.domain, render_platform='2',
+                protocol='http', compress_min_size=1024) as api:
+            return await api.render_jobs.submit_jobs([job_info],
+                                                     task_ids=['9'])
+
+    assert run(_main())[0].ok
+    _, headers, body = farm_server.received[0]
+    assert headers['Content-Encoding'] == 'gzip'
+    assert json.loads(body['content']) == job_info
+
+
+def test_submit_job_from_tasks(async_api, farm_server):
+    """Test the concurrent asyncio tasks submit to their own task."""
+    task_ids = iter(range(1, 100))
+    uploads = {}
+    farm_server.responses['createTask'] = lambda body: {
+        'code': 200, 'message': 'success',
+        'data': {'taskIdList': [next(task_ids)]}}
+
+    def _upload(body):
+        uploads[body['taskId']] = json.loads(body['content'])
+        return {'code': 200, 'message': 'success', 'data': {}}
+
+    farm_server.responses['taskJsonFile'] = _upload
+
+    async def _submit(api, shot):
+        task_id = await api.render_jobs.task_id
+        await asyncio.sleep(0.01)
+        await api.render_jobs.submit_job({'shot': shot})
+        return task_id
+
+    async def _main():
+        async with async_api as api:
+            return await asyncio.gather(*[_submit(api, shot)
+                                          for shot in range(4)])
+
+    task_ids_by_shot = run(_main())
+    assert len(set(task_ids_by_shot)) == 4
+    for shot, task_id in enumerate(task_ids_by_shot):
+        assert uploads[task_id] == {'shot': shot}
+
+
+def test_allocate_task_id(async_api, farm_server):
+    """Test the ID of a new task is allocated asynchronously."""
+    farm_server.responses['createTask'] = {'data': {'taskIdList': [1658434]}}
+
+    async def _main():
+        async with async_api as api:
+            return await api.render_jobs.allocate_task_id()
+
+    assert run(_main()) == '1658434'
+    assert farm_server.received[0][2]['count'] == 1
+
+
+def test_no_task_id_pool(async_api):
+    """Test the asyncio operator points to the batch allocation instead."""
+    with pytest.raises(TypeError) as err:
+        async_api.render_jobs.start_task_id_pool(size=5)
+    assert 'create_task_ids' in str(err.value)
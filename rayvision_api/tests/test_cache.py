@@ -0,0 +1,261 @@
+"""Test rayvision_api.cache.ResponseCache functions."""
+
+# Import built-in modules
+import gc
+import weakref
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api.cache import DEFAULT_TTLS
+from rayvision_api.cache import INVALIDATIONS
+from rayvision_api.cache import JOB_STATE_TTLS
+from rayvision_api.cache import ResponseCache
+from rayvision_api.exception import RayvisionError
+from rayvision_api.operators import ProjectSettings
+from rayvision_api.operators import RenderJobs
+from rayvision_api.url import ApiUrl
+
+# The time to live of the cached queries, including the state of the jobs.
+TTLS = dict(DEFAULT_TTLS)
+TTLS.update(JOB_STATE_TTLS)
+
+
+def test_time_to_live(clock):
+    """Test the responses expire after the time to live of their API url."""
+    cache = ResponseCache(ttls={ApiUrl.queryTaskInfo: 5}, clock=clock)
+    cache.set(ApiUrl.queryTaskInfo, {'taskIds': [1]}, {'items': [1]})
+    assert cache.get(ApiUrl.queryTaskInfo, {'taskIds': [1]}) == (
+        True, {'items': [1]})
+    assert cache.get(ApiUrl.queryTaskInfo, {'taskIds': [2]}) == (False, None)
+    clock.now += 5
+    assert cache.get(ApiUrl.queryTaskInfo, {'taskIds': [1]}) == (False, None)
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_uncached_api_url():
+    """Test the API urls without a time to live are not cached."""
+    cache = ResponseCache(ttls=TTLS)
+    cache.set(ApiUrl.stopTask, {'taskIds': [1]}, {})
+    assert cache.get(ApiUrl.stopTask, {'taskIds': [1]}) == (False, None)
+    assert len(cache) == 0
+
+
+def test_canonical_key():
+    """Test the equal data share their cached response."""
+    cache = ResponseCache(ttls=TTLS)
+    cache.set(ApiUrl.queryTaskFrames, {'taskId': 1, 'pageNum': 1}, [1])
+    assert cache.get(ApiUrl.queryTaskFrames, {'pageNum': 1, 'taskId': 1})[0]
+
+
+def test_least_recently_used_eviction():
+    """Test the least recently used response is evicted first."""
+    cache = ResponseCache(ttls=TTLS, maxsize=2)
+    for task_id in (1, 2):
+        cache.set(ApiUrl.queryTaskInfo, {'taskIds': [task_id]}, task_id)
+    assert cache.get(ApiUrl.queryTaskInfo, {'taskIds': [1]})[0]
+    cache.set(ApiUrl.queryTaskInfo, {'taskIds': [3]}, 3)
+    assert cache.get(ApiUrl.queryTaskInfo, {'taskIds': [1]})[0]
+    assert not cache.get(ApiUrl.queryTaskInfo, {'taskIds': [2]})[0]
+    assert len(cache) == 2
+
+
+def test_responses_are_copied():
+    """Test modifying a response does not modify the cached one."""
+    cache = ResponseCache(ttls=TTLS)
+    response = {'items': [1]}
+    cache.set(ApiUrl.queryTaskInfo, None, response)
+    response['items'].append(2)
+    cache.get(ApiUrl.queryTaskInfo)[1]['items'].append(3)
+    assert cache.get(ApiUrl.queryTaskInfo) == (True, {'items': [1]})
+
+
+def test_invalidate():
+    """Test the responses of an API url are removed."""
+    cache = ResponseCache(ttls=TTLS)
+    cache.set(ApiUrl.getLabelList, None, [])
+    cache.set(ApiUrl.queryTaskInfo, {'taskIds': [1]}, {})
+    cache.set(ApiUrl.queryTaskInfo, {'taskIds': [2]}, {})
+    assert cache.invalidate(ApiUrl.queryTaskInfo) == 2
+    assert cache.get(ApiUrl.getLabelList)[0]
+    cache.clear()
+    assert len(cache) == 0
+
+
+@pytest.fixture()
+def job_info_requests(requests_mock, rayvision_connect):
+    """Answer the queries of the job info, cached by the connection."""
+    rayvision_connect.cache = ResponseCache(ttls=TTLS)
+    return requests_mock.post(
+        'https://{}{}'.format(rayvision_connect.domain, ApiUrl.queryTaskInfo),
+        json={'code': 200, 'message': '', 'data': {'items': []}})
+
+
+# pylint: disable=redefined-outer-name
+def test_connect_caches_queries(rayvision_connect, job_info_requests):
+    """Test the repeated queries are answered from the cache."""
+    render_jobs = RenderJobs(rayvision_connect)
+    assert render_jobs.get_job_info([1]) == {'items': []}
+    assert render_jobs.get_job_info([1]) == {'items': []}
+    assert job_info_requests.call_count == 1
+    rayvision_connect.post(ApiUrl.queryTaskInfo, {'taskIds': [1]},
+                           use_cache=False)
+    assert job_info_requests.call_count == 2
+
+
+def test_cache_per_connection(user_info_dict, job_info_requests):
+    """Test the connections do not share their cache."""
+    from rayvision_api.connect import Connect
+    for _ in range(2):
+        RenderJobs(Connect(**user_info_dict)).get_job_info([1])
+    assert job_info_requests.call_count == 2
+
+
+def test_disable_cache(user_info_dict, job_info_requests):
+    """Test the responses are not cached without a cache."""
+    from rayvision_api.connect import Connect
+    render_jobs = RenderJobs(Connect(cache=False, **user_info_dict))
+    render_jobs.get_job_info([1])
+    render_jobs.get_job_info([1])
+    assert job_info_requests.call_count == 2
+
+
+def test_operators_are_not_leaked(rayvision_connect, job_info_requests):
+    """Test the cache does not keep the operators alive."""
+    render_jobs = RenderJobs(rayvision_connect)
+    render_jobs.get_job_info([1])
+    reference = weakref.ref(render_jobs)
+    del render_jobs
+    gc.collect()
+    assert reference() is None
+
+
+def test_delete_project_invalidates_projects(rayvision_connect,
+                                             requests_mock):
+    """Test the projects are queried again after a project is deleted."""
+    labels = requests_mock.post(
+        'https://{}{}'.format(rayvision_connect.domain, ApiUrl.getLabelList),
+        [{'json': {'code': 200, 'message': '', 'data': {
+            'projectNameList': [{'projectId': 1, 'projectName': 'old'}]}}},
+         {'json': {'code': 200, 'message': '', 'data': {
+             'projectNameList': []}}}])
+    requests_mock.post(
+        'https://{}{}'.format(rayvision_connect.domain, ApiUrl.deleteLabel),
+        json={'code': 200, 'message': '', 'data': {}})
+    project = ProjectSettings(rayvision_connect)
+    assert project.get_projects() == [{'projectId': 1, 'projectName': 'old'}]
+    assert project.get_projects() == [{'projectId': 1, 'projectName': 'old'}]
+    assert labels.call_count == 1
+    project.delete_project('old')
+    assert project.get_projects() == []
+    assert labels.call_count == 2
+
+
+def test_invalidate_for():
+    """Test an update removes the responses of the queries it makes stale."""
+    cache = ResponseCache(ttls=TTLS)
+    cache.set(ApiUrl.getRenderEnv, {'cgId': 2000}, [])
+    cache.set(ApiUrl.queryTaskInfo, {'taskIds': [1]}, {})
+    cache.set(ApiUrl.queryPlatforms, None, [])
+    assert cache.invalidate_for(ApiUrl.queryPlatforms) == 0
+    assert cache.invalidate_for(ApiUrl.setDefaultRenderEnv) == 1
+    assert cache.invalidate_for(ApiUrl.stopTask) == 1
+    assert len(cache) == 1
+
+
+def test_invalidated_generation():
+    """Test a response read before an invalidation is not cached."""
+    cache = ResponseCache(ttls=TTLS)
+    generation = cache.get_generation(ApiUrl.getLabelList)
+    cache.invalidate_for(ApiUrl.deleteLabel)
+    cache.set(ApiUrl.getLabelList, None, [], generation)
+    assert len(cache) == 0
+    cache.set(ApiUrl.getLabelList, None, [],
+              cache.get_generation(ApiUrl.getLabelList))
+    assert len(cache) == 1
+
+
+def test_update_during_query(rayvision_connect, requests_mock):
+    """Test a query answered before a concurrent update is not cached."""
+    delete_label = requests_mock.post(
+        'https://{}{}'.format(rayvision_connect.domain, ApiUrl.deleteLabel),
+        json={'code': 200, 'message': '', 'data': {}})
+
+    def _answer(request, context):
+        # The project is deleted while the query is outstanding.
+        if not delete_label.called:
+            ProjectSettings(rayvision_connect).delete_project('old')
+        return {'code': 200, 'message': '', 'data': {
+            'projectNameList': [{'projectId': 1, 'projectName': 'old'}]}}
+
+    labels = requests_mock.post(
+        'https://{}{}'.format(rayvision_connect.domain, ApiUrl.getLabelList),
+        json=_answer)
+    project = ProjectSettings(rayvision_connect)
+    project.get_projects()
+    project.get_projects()
+    assert delete_label.call_count == 1
+    assert labels.call_count == 2
+
+
+def test_invalidations_only_target_cached_queries():
+    """Test the declared invalidations are updates of cached queries."""
+    for api_url, stale_urls in INVALIDATIONS.items():
+        assert api_url not in TTLS
+        assert all(url in TTLS for url in stale_urls)
+
+
+def test_job_state_is_not_cached_by_default(user_info_dict, requests_mock):
+    """Test the polled state of the jobs is only cached when asked for."""
+    from rayvision_api.connect import Connect
+    connect = Connect(**user_info_dict)
+    job_info = requests_mock.post(
+        'https://{}{}'.format(connect.domain, ApiUrl.queryTaskInfo),
+        json={'code': 200, 'message': '', 'data': {'items': []}})
+    render_jobs = RenderJobs(connect)
+    render_jobs.get_job_info([1])
+    render_jobs.get_job_info([1])
+    assert job_info.call_count == 2
+
+
+def test_stop_job_invalidates_job_info(rayvision_connect, job_info_requests,
+                                       requests_mock):
+    """Test the job info is queried again after the job is stopped."""
+    requests_mock.post(
+        'https://{}{}'.format(rayvision_connect.domain, ApiUrl.stopTask),
+        json={'code': 200, 'message': '', 'data': {}})
+    render_jobs = RenderJobs(rayvision_connect)
+    render_jobs.get_job_info([1])
+    render_jobs.stop_jobs([1])
+    render_jobs.get_job_info([1])
+    assert job_info_requests.call_count == 2
+
+
+def test_prepared_update_invalidates_job_info(rayvision_connect,
+                                              job_info_requests,
+                                              requests_mock):
+    """Test an update sent as a prepared request removes the stale job info."""
+    requests_mock.post(
+        'https://{}{}'.format(rayvision_connect.domain, ApiUrl.stopTask),
+        json={'code': 200, 'message': '', 'data': {}})
+    render_jobs = RenderJobs(rayvision_connect)
+    render_jobs.get_job_info([1])
+    rayvision_connect.send(rayvision_connect.prepare(ApiUrl.stopTask,
+                                                     {'taskIds': [1]}))
+    render_jobs.get_job_info([1])
+    assert job_info_requests.call_count == 2
+
+
+def test_failed_update_keeps_cache(rayvision_connect, job_info_requests,
+                                   requests_mock):
+    """Test a failed update does not remove the cached responses."""
+    requests_mock.post(
+        'https://{}{}'.format(rayvision_connect.domain, ApiUrl.stopTask),
+        json={'code': 404, 'message': 'not found', 'data': {}})
+    render_jobs = RenderJobs(rayvision_connect)
+    render_jobs.get_job_info([1])
+    with pytest.raises(RayvisionError):
+        render_jobs.stop_jobs([1])
+    render_jobs.get_job_info([1])
+    assert job_info_requests.call_count == 1
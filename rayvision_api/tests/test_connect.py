@@ -1,5 +1,17 @@
 """Test the rayvison_api.rayvision_connect functions."""
 
+# Import built-in modules
+from concurrent.futures import ThreadPoolExecutor
+import json
+import time
+import zlib
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api import connect
+from rayvision_api.url import ApiUrl
+
 
 def test_headers(rayvision_connect):
     """Test we can get correct requests headers."""
@@ -14,3 +26,123 @@ def test_headers(rayvision_connect):
 
     assert rayvision_connect.headers['accessId'] == 'test_access_id'
     assert rayvision_connect.headers['version'] == 'dev'
+
+
+def test_signing_context(rayvision_connect):
+    """Test the signing context is prepared again when the headers change."""
+    context = rayvision_connect.signing_context
+    assert rayvision_connect.signing_context is context
+    rayvision_connect.headers['version'] = '2.0.0'
+    assert rayvision_connect.signing_context is not context
+    assert rayvision_connect.signing_context.headers['version'] == '2.0.0'
+
+
+def test_prepare(rayvision_connect):
+    """Test the prepared request is validated, encoded and signed."""
+    prepared = rayvision_connect.prepare(ApiUrl.queryTaskInfo,
+                                         {'taskIds': [1]})
+    assert prepared.address == ('https://task.renderbus.com'
+                                '/api/render/task/queryTaskInfo')
+    assert json.loads(prepared.body) == {'taskIds': [1]}
+    context = rayvision_connect.signing_context
+    assert prepared.headers['signature'] == context.sign(
+        ApiUrl.queryTaskInfo,
+        {'UTCTimestamp': prepared.headers['UTCTimestamp'],
+         'nonce': prepared.headers['nonce']},
+        {'taskIds': [1]})
+
+
+def test_prepare_invalid_data(rayvision_connect):
+    """Test the data is validated when the request is prepared."""
+    with pytest.raises(ValueError):
+        rayvision_connect.prepare(ApiUrl.queryTaskInfo, {'taskIds': 'x'})
+
+
+@pytest.mark.parametrize('use_executor', [False, True])
+def test_prepare_many(rayvision_connect, requests_mock, use_executor):
+    """Test the prepared requests are sent with their own signatures."""
+    requests_mock.post('https://task.renderbus.com/api/render/task/'
+                       'queryTaskInfo',
+                       json={'code': 200, 'message': '', 'data': {}})
+    items = [(ApiUrl.queryTaskInfo, {'taskIds': [task_id]})
+             for task_id in range(10)]
+    with ThreadPoolExecutor(4) as executor:
+        prepared = list(rayvision_connect.prepare_many(
+            items, executor=executor if use_executor else None))
+    assert [request.data for request in prepared] == [
+        data for _, data in items]
+    for request in prepared:
+        assert rayvision_connect.send(request) == {}
+    history = requests_mock.request_history
+    assert [json.loads(request.text) for request in history] == [
+        data for _, data in items]
+    assert [request.headers['signature'] for request in history] == [
+        request.headers['signature'] for request in prepared]
+
+
+def test_prepare_many_overlaps_send(rayvision_connect, mocker):
+    """Test the first requests are sent while the next ones are prepared."""
+    events = []
+    prepare = rayvision_connect.prepare
+
+    def _prepare(api_url, post_data, validator):
+        time.sleep(0.02)
+        events.append('prepare')
+        return prepare(api_url, post_data, validator)
+
+    mocker.patch.object(rayvision_connect, 'prepare', side_effect=_prepare)
+    mocker.patch.object(rayvision_connect, 'send',
+                        side_effect=lambda request: events.append('send'))
+    items = [(ApiUrl.queryTaskInfo, {'taskIds': [task_id]})
+             for task_id in range(8)]
+    with ThreadPoolExecutor(2) as executor:
+        futures = [executor.submit(rayvision_connect.send, request)
+                   for request in rayvision_connect.prepare_many(
+                       items, executor=executor, ahead=1)]
+        for future in futures:
+            future.result()
+    assert events.count('send') == 8
+    last_prepare = max(index for index, event in enumerate(events)
+                       if event == 'prepare')
+    assert events.index('send') < last_prepare
+
+
+def test_send_outdated_request(rayvision_connect, requests_mock, mocker):
+    """Test the outdated prepared request is signed again."""
+    requests_mock.post('https://task.renderbus.com/api/render/task/'
+                       'queryTaskInfo',
+                       json={'code': 200, 'message': '', 'data': {}})
+    prepared = rayvision_connect.prepare(ApiUrl.queryTaskInfo,
+                                         {'taskIds': [1]})
+    prepared.signed_at -= connect.SIGNATURE_MAX_AGE
+    mocker.patch.object(connect.signature, 'generate_nonce',
+                        return_value='000000')
+    rayvision_connect.send(prepared)
+    assert requests_mock.last_request.headers['nonce'] == '000000'
+
+
+def test_compressed_body(user_info_dict, requests_mock):
+    """Test the large bodies are sent gzip compressed and signed as is."""
+    rayvision_connect = connect.Connect(compress_min_size=1024,
+                                        **user_info_dict)
+    history = requests_mock.post(
+        'https://task.renderbus.com/api/render/task/taskJsonFile',
+        json={'code': 200, 'message': '', 'data': {}})
+    small = {'taskId': '1', 'fileName': 'task.json', 'content': '{}'}
+    large = dict(small, content=json.dumps({'layers': ['layer'] * 1000}))
+    for data in (small, large):
+        prepared = rayvision_connect.prepare(ApiUrl.taskJsonFile, data,
+                                             validator=False)
+        assert rayvision_connect.send(prepared) == {}
+        assert prepared.headers['signature'] == (
+            rayvision_connect.signing_context.sign(
+                ApiUrl.taskJsonFile,
+                {'UTCTimestamp': prepared.headers['UTCTimestamp'],
+                 'nonce': prepared.headers['nonce']},
+                data))
+    first, second = history.request_history
+    assert 'Content-Encoding' not in first.headers
+    assert json.loads(first.body) == small
+    assert second.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(zlib.decompress(second.body,
+                                      16 + zlib.MAX_WBITS)) == large
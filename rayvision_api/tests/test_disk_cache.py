@@ -0,0 +1,159 @@
+"""Test rayvision_api.disk_cache.DiskCache functions."""
+
+# Import built-in modules
+import multiprocessing
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api.connect import Connect
+from rayvision_api.disk_cache import DiskCache
+from rayvision_api.disk_cache import main
+from rayvision_api.url import ApiUrl
+
+
+def _write_responses(path):
+    """Write responses to the cache from another process."""
+    disk_cache = DiskCache(path)
+    for index in range(50):
+        disk_cache.set(ApiUrl.queryErrorDetail, {'code': index}, [index])
+    return len(disk_cache)
+
+
+@pytest.fixture()
+def disk_cache(tmpdir):
+    """Create a persistent cache in a temporary directory."""
+    return DiskCache(str(tmpdir.join('cache', 'responses.sqlite')))
+
+
+@pytest.fixture()
+def platforms_requests(requests_mock, user_info_dict):
+    """Answer the queries of the platforms."""
+    return requests_mock.post(
+        'https://{}{}'.format(user_info_dict['domain'],
+                              ApiUrl.queryPlatforms),
+        json={'code': 200, 'message': '', 'data': [{'platform': 2}]})
+
+
+# pylint: disable=redefined-outer-name
+def test_time_to_live(tmpdir, clock):
+    """Test the responses expire after the time to live of their API url."""
+    disk_cache = DiskCache(str(tmpdir.join('responses.sqlite')),
+                           ttls={ApiUrl.queryPlatforms: 60}, clock=clock)
+    disk_cache.set(ApiUrl.queryPlatforms, None, [{'platform': 2}])
+    disk_cache.set(ApiUrl.queryTaskInfo, {'taskIds': [1]}, {})
+    assert disk_cache.get(ApiUrl.queryPlatforms) == (True, [{'platform': 2}])
+    assert disk_cache.get(ApiUrl.queryTaskInfo, {'taskIds': [1]}) == (
+        False, None)
+    clock.now += 60
+    assert disk_cache.get(ApiUrl.queryPlatforms) == (False, None)
+    assert disk_cache.info() == {
+        ApiUrl.queryPlatforms.value: {'fresh': 0, 'expired': 1}}
+    assert disk_cache.purge() == 1
+    assert len(disk_cache) == 0
+
+
+def test_scopes(disk_cache):
+    """Test the responses of the farms and the accounts are kept apart."""
+    disk_cache.set(ApiUrl.queryPlatforms, None, [1], scope='first')
+    assert disk_cache.get(ApiUrl.queryPlatforms, scope='first')[0]
+    assert not disk_cache.get(ApiUrl.queryPlatforms, scope='second')[0]
+
+
+def test_invalidate_and_clear(disk_cache):
+    """Test the responses are removed by API url or all at once."""
+    disk_cache.set(ApiUrl.queryPlatforms, None, [])
+    disk_cache.set(ApiUrl.querySupportedSoftware, None, {})
+    assert disk_cache.invalidate(ApiUrl.queryPlatforms) == 1
+    assert len(disk_cache) == 1
+    disk_cache.clear()
+    assert len(disk_cache) == 0
+
+
+def test_shared_by_processes(disk_cache):
+    """Test the processes write to the same file concurrently."""
+    pool = multiprocessing.Pool(4)
+    try:
+        pool.map(_write_responses, [disk_cache.path] * 4)
+    finally:
+        pool.close()
+        pool.join()
+    assert len(disk_cache) == 50
+    assert disk_cache.get(ApiUrl.queryErrorDetail, {'code': 7}) == (True, [7])
+
+
+def test_read_errors_are_misses(tmpdir):
+    """Test a broken file makes cache misses instead of failures."""
+    path = tmpdir.join('responses.sqlite')
+    path.write('not a database')
+    disk_cache = DiskCache(str(path))
+    assert disk_cache.get(ApiUrl.queryPlatforms) == (False, None)
+
+
+def test_write_errors_are_logged(tmpdir):
+    """Test a broken file does not make the removals fail."""
+    path = tmpdir.join('responses.sqlite')
+    path.write('not a database')
+    disk_cache = DiskCache(str(path))
+    assert disk_cache.invalidate(ApiUrl.queryPlatforms) == 0
+    assert disk_cache.purge() == 0
+    disk_cache.clear()
+    assert len(disk_cache) == 0
+    assert disk_cache.info() == {}
+
+
+def test_directory_errors_are_misses(tmpdir, user_info_dict,
+                                    platforms_requests):
+    """Test a cache directory which cannot be created never fails a query."""
+    # A file stands where the cache directory should be created.
+    blocker = tmpdir.join('blocker')
+    blocker.write('')
+    disk_cache = DiskCache(str(blocker.join('cache', 'responses.sqlite')))
+    assert disk_cache.get(ApiUrl.queryPlatforms, {'zone': 1}) == (False, None)
+    disk_cache.set(ApiUrl.queryPlatforms, {'zone': 1}, [])
+    assert disk_cache.invalidate(ApiUrl.queryPlatforms) == 0
+    assert len(disk_cache) == 0
+    connect = Connect(disk_cache=disk_cache, **user_info_dict)
+    assert connect.post(ApiUrl.queryPlatforms, {'zone': 1}) == [
+        {'platform': 2}]
+
+
+def test_connect_uses_disk_cache(disk_cache, user_info_dict,
+                                 platforms_requests):
+    """Test a new connection answers the catalogs from the file."""
+    for _ in range(3):
+        connect = Connect(disk_cache=disk_cache, **user_info_dict)
+        assert connect.post(ApiUrl.queryPlatforms,
+                            validator=False) == [{'platform': 2}]
+    assert platforms_requests.call_count == 1
+    assert disk_cache.get(ApiUrl.queryPlatforms,
+                          scope=connect.cache_scope)[0]
+    connect.invalidate_cache(ApiUrl.queryPlatforms)
+    assert len(disk_cache) == 0
+
+
+def test_main(disk_cache, user_info_dict, platforms_requests, requests_mock,
+              capsys):
+    """Test the command line warms and clears the cache."""
+    for api_url in (ApiUrl.querySupportedSoftware,
+                    ApiUrl.querySupportedPlugin):
+        requests_mock.post(
+            'https://{}{}'.format(user_info_dict['domain'], api_url),
+            json={'code': 200, 'message': '', 'data': {}})
+    assert main(['--path', disk_cache.path, 'warm',
+                 '--access-id', user_info_dict['access_id'],
+                 '--access-key', user_info_dict['access_key'],
+                 '--domain', user_info_dict['domain'],
+                 '--platform', user_info_dict['render_platform'],
+                 '--app', 'maya', '--os', 'windows', '--os', 'linux']) == 0
+    assert len(disk_cache) == 4
+    assert platforms_requests.last_request.json() == {'zone': 1}
+    connect = Connect(disk_cache=disk_cache, **user_info_dict)
+    assert connect.post(ApiUrl.queryPlatforms, {'zone': 1}) == [
+        {'platform': 2}]
+    assert platforms_requests.call_count == 1
+    assert main(['--path', disk_cache.path, 'info']) == 0
+    assert '/api/render/common/querySupportedPlugin: 2 fresh' in (
+        capsys.readouterr().out)
+    assert main(['--path', disk_cache.path, 'clear']) == 0
+    assert len(disk_cache) == 0
@@ -0,0 +1,82 @@
+"""Test the cost of importing the rayvision_api."""
+
+# Import built-in modules
+import subprocess
+import sys
+
+# pylint: disable=import-error
+import pytest
+
+# The budget in milliseconds of ``from rayvision_api import RayvisionAPI``,
+# importing all the dependencies took about 300 ms.
+IMPORT_BUDGET_MS = 150
+
+# The dependencies imported on first use only.
+LAZY_MODULES = ('cerberus', 'future', 'pkg_resources', 'rayvision_log',
+                'requests', 'yaml')
+
+
+def run_python(*args):
+    """str: Run a new interpreter and get its output and its errors."""
+    return subprocess.check_output((sys.executable,) + args,
+                                   stderr=subprocess.STDOUT,
+                                   universal_newlines=True)
+
+
+def get_import_time(output):
+    """int: Sum the time of the rayvision_api modules in ``-X importtime``.
+
+    Only the modules imported at the top level are counted, their cumulative
+    time includes the modules they import.
+
+    """
+    total = 0
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.split('|')
+        # The nested modules are indented after the separator.
+        if name[1:].startswith('rayvision_api'):
+            total += int(cumulative)
+    return total
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7),
+                    reason='The lazy imports need the module __getattr__.')
+def test_import_is_lazy():
+    """Test importing the API does not import the heavy dependencies."""
+    output = run_python('-c',
+                        'import sys\n'
+                        'from rayvision_api import RayvisionAPI\n'
+                        'print(sorted(set({!r}) & set(sys.modules)))'.format(
+                            LAZY_MODULES))
+    assert output.splitlines()[-1] == '[]'
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7),
+                    reason='The lazy imports need the module __getattr__.')
+def test_import_time_budget():
+    """Test ``from rayvision_api import RayvisionAPI`` stays cheap."""
+    # The best of a few runs, the first one may fill the bytecode cache.
+    import_time = min(
+        get_import_time(run_python('-X', 'importtime', '-c',
+                                   'from rayvision_api import RayvisionAPI'))
+        for _ in range(3))
+    assert import_time / 1000.0 < IMPORT_BUDGET_MS
+
+
+def test_validation_does_not_parse_yaml():
+    """Test the schemas are loaded from the artifact, without PyYAML."""
+    output = run_python('-c',
+                        'import sys\n'
+                        'from rayvision_api.validator import validate_data\n'
+                        'validate_data({"taskIds": [1]}, "queryTaskInfo")\n'
+                        'print("yaml" in sys.modules)')
+    assert output.splitlines()[-1] == 'False'
+
+
+def test_version():
+    """Test the version is still available."""
+    output = run_python('-c', 'import rayvision_api\n'
+                              'print(rayvision_api.__version__)')
+    assert output.strip()
@@ -0,0 +1,35 @@
+"""Test rayvision_api.payload functions."""
+
+# Import built-in modules
+import json
+import zlib
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api import payload
+
+
+@pytest.mark.parametrize('data', [
+    {},
+    [1, 2],
+    {'taskIds': [1], 'name': u'\u955c\u5934'},
+    {'taskId': '1', 'content': u'{"a": "\\"\u955c\u5934\\n"}' * 20000},
+])
+def test_iter_json(data):
+    """Test the chunks make the same document as ``json.dumps``."""
+    assert ''.join(payload.iter_json(data)) == json.dumps(data)
+
+
+def test_encode_body():
+    """Test the body is compressed once it reaches the minimum size."""
+    data = {'taskId': '1',
+            'content': json.dumps({'layers': ['layer'] * 10000})}
+    body, content_encoding = payload.encode_body(data)
+    assert content_encoding is None
+    assert body == json.dumps(data).encode('utf-8')
+    assert payload.encode_body(data, len(body) + 1) == (body, None)
+    compressed, content_encoding = payload.encode_body(data, 1024)
+    assert content_encoding == 'gzip'
+    assert len(compressed) < len(body) // 10
+    assert zlib.decompress(compressed, 16 + zlib.MAX_WBITS) == body
@@ -0,0 +1,135 @@
+"""Test rayvision_api.rate_limit functions."""
+
+# Import built-in modules
+import multiprocessing
+import threading
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api.rate_limit import FileTokenBucket
+from rayvision_api.rate_limit import RateLimiter
+from rayvision_api.rate_limit import TokenBucket
+from rayvision_api.url import ApiUrl
+
+
+def _reserve_from_file(path):
+    """list of float: Reserve five tokens from the shared bucket."""
+    bucket = FileTokenBucket(path, rate=1, capacity=10)
+    return [bucket.reserve() for _ in range(5)]
+
+
+def test_token_bucket_reserve(clock):
+    """Test the tokens are reserved in advance once the bucket is empty."""
+    bucket = TokenBucket(rate=1, capacity=2, clock=clock)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 1]
+    clock.now += 1
+    assert bucket.reserve() == 1
+    clock.now += 10
+    assert bucket.reserve() == 0
+
+
+def test_token_bucket_try_acquire(clock):
+    """Test try_acquire never takes tokens in advance."""
+    bucket = TokenBucket(rate=2, capacity=1, clock=clock)
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    clock.now += 0.5
+    assert bucket.try_acquire()
+
+
+def test_token_bucket_threads(clock):
+    """Test the concurrent reservations never exceed the rate."""
+    bucket = TokenBucket(rate=100, capacity=10, clock=clock)
+    delays = []
+
+    def _reserve():
+        for _ in range(10):
+            delays.append(bucket.reserve())
+
+    threads = [threading.Thread(target=_reserve) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    expected = [0.0] * 10 + [index / 100.0 for index in range(1, 71)]
+    assert sorted(delays) == pytest.approx(expected)
+
+
+def test_file_token_bucket_is_shared(tmpdir, clock):
+    """Test the buckets using the same file share the tokens."""
+    path = str(tmpdir.join('bucket'))
+    first = FileTokenBucket(path, rate=1, capacity=2, clock=clock)
+    second = FileTokenBucket(path, rate=1, capacity=2, clock=clock)
+    assert first.reserve() == 0
+    assert second.try_acquire()
+    assert not first.try_acquire()
+    assert second.reserve() == 1
+
+
+def test_file_token_bucket_processes(tmpdir):
+    """Test the processes of a pool share one quota."""
+    path = str(tmpdir.join('bucket'))
+    pool = multiprocessing.Pool(4)
+    try:
+        results = pool.map(_reserve_from_file, [path] * 4)
+    finally:
+        pool.close()
+        pool.join()
+    delays = sorted(delay for result in results for delay in result)
+    assert len([delay for delay in delays if delay == 0]) <= 11
+    assert delays[-1] > 8
+
+
+def test_rate_limiter_per_url(clock):
+    """Test the global and the per url limits are both applied."""
+    limiter = RateLimiter(
+        bucket=TokenBucket(rate=10, capacity=10, clock=clock),
+        per_url={ApiUrl.queryTaskFrames: TokenBucket(rate=1, capacity=1,
+                                                     clock=clock)})
+    assert limiter.reserve(ApiUrl.queryTaskFrames) == 0
+    assert limiter.reserve(ApiUrl.queryTaskFrames) == 1
+    assert limiter.reserve(ApiUrl.queryTaskInfo) == 0
+    assert RateLimiter().reserve(ApiUrl.queryTaskInfo) == 0
+
+
+def test_rate_limiter_gives_back_tokens(clock):
+    """Test a request delayed by its url does not hold the global tokens."""
+    bucket = TokenBucket(rate=1, capacity=1, clock=clock)
+    limiter = RateLimiter(
+        bucket=bucket,
+        per_url={ApiUrl.queryTaskFrames: TokenBucket(rate=0.5, capacity=1,
+                                                     clock=clock)})
+    assert limiter.reserve(ApiUrl.queryTaskFrames) == 0
+    clock.now += 1
+    assert limiter.reserve(ApiUrl.queryTaskFrames) == 1
+    assert limiter.reserve(ApiUrl.queryTaskInfo) == 0
+    clock.now += 1
+    assert limiter.reserve(ApiUrl.queryTaskFrames) == 0
+    assert bucket.get_delay() == 1
+
+
+def test_file_token_bucket_release(tmpdir, clock):
+    """Test the tokens given back to a shared bucket."""
+    bucket = FileTokenBucket(str(tmpdir.join('bucket.json')), rate=1,
+                             capacity=1, clock=clock)
+    assert bucket.try_acquire()
+    assert bucket.get_delay() == 1
+    bucket.release()
+    bucket.release()
+    assert bucket.get_delay() == 0
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+
+def test_connect_waits(rayvision_connect, mock_requests, mocker):
+    """Test the connection waits for the limiter before sending."""
+    mock_requests({'code': 200, 'data': {}})
+    sleep = mocker.patch('rayvision_api.connect.time.sleep')
+    limiter = mocker.Mock()
+    limiter.reserve.side_effect = [0.5, 0.0]
+    rayvision_connect.rate_limiter = limiter
+    rayvision_connect.post(ApiUrl.queryAllFrameStats, validator=False)
+    assert limiter.reserve.call_args_list == [
+        mocker.call(ApiUrl.queryAllFrameStats)] * 2
+    sleep.assert_called_once_with(0.5)
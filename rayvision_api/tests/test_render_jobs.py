@@ -1,11 +1,20 @@
 """Test rayvision_api.task.Task functions."""
 
+# Import built-in modules
+import itertools
+import json
+import threading
+import time
+
 # pylint: disable=import-error
 import pytest
+import requests
 
 from rayvision_api.exception import RayvisionAPIError
 from rayvision_api.exception import RayvisionAPIParameterError
 from rayvision_api.operators import RenderJobs
+from rayvision_api.retry import RetryPolicy
+from rayvision_api.url import ApiUrl
 
 
 @pytest.fixture()
@@ -138,3 +147,365 @@ def test_error_detail(fixture_render_jobs, mock_requests):
     details = fixture_render_jobs.error_detail(12345)
     assert details[0]['code'] == 12345
     assert details[0]['solutionPath'] == 'c:/tests.com'
+
+
+def _task_list_pages(jobs, delay=0):
+    """Answer the pages of the task list from the jobs."""
+
+    def _respond(body):
+        time.sleep(delay)
+        matching = [job for job in jobs
+                    if job['taskStatus'] in body.get('statusList', [0, 5])]
+        size = body['pageSize']
+        start = (body['pageNum'] - 1) * size
+        return {'code': 200, 'message': 'success', 'data': {
+            'pageCount': (len(matching) + size - 1) // size,
+            'pageNum': body['pageNum'],
+            'total': len(matching),
+            'size': size,
+            'items': matching[start:start + size],
+        }}
+
+    return _respond
+
+
+def test_iter_jobs(farm_connect, farm_server):
+    """Test all the pages of the task list are iterated in order."""
+    jobs = [{'id': index, 'taskStatus': index % 2 * 5}
+            for index in range(25)]
+    farm_server.responses['getTaskList'] = _task_list_pages(jobs)
+    render_jobs = RenderJobs(farm_connect)
+    assert list(render_jobs.iter_jobs(page_size=10)) == jobs
+    assert [body['pageNum'] for _, _, body in farm_server.received] == [
+        1, 2, 3]
+    del farm_server.received[:]
+    assert [job['id'] for job in render_jobs.iter_jobs(
+        status_list=[5], page_size=10, prefetch=False)] == list(
+            range(1, 25, 2))
+    assert farm_server.received[0][2] == {'pageNum': 1, 'pageSize': 10,
+                                          'statusList': [5]}
+
+
+def test_iter_jobs_empty(farm_connect, farm_server):
+    """Test an account without jobs sends a single request."""
+    farm_server.responses['getTaskList'] = _task_list_pages([])
+    assert list(RenderJobs(farm_connect).iter_jobs()) == []
+    assert len(farm_server.received) == 1
+
+
+def test_iter_jobs_prefetch(farm_connect, farm_server):
+    """Test the next page is fetched while the current one is processed."""
+    jobs = [{'id': index, 'taskStatus': 0} for index in range(3)]
+    farm_server.responses['getTaskList'] = _task_list_pages(jobs, delay=0.1)
+    start = time.time()
+    for _ in RenderJobs(farm_connect).iter_jobs(page_size=1):
+        time.sleep(0.1)
+    # Three requests and three pauses overlap instead of adding up.
+    assert time.time() - start < 0.55
+
+
+def test_iter_jobs_stops_early(farm_connect, farm_server):
+    """Test the pages after the last consumed one are not fetched."""
+    jobs = [{'id': index, 'taskStatus': 0} for index in range(50)]
+    farm_server.responses['getTaskList'] = _task_list_pages(jobs)
+    jobs_iterator = RenderJobs(farm_connect).iter_jobs(page_size=5)
+    assert next(jobs_iterator) == jobs[0]
+    jobs_iterator.close()
+    # The first page and at most the prefetched one.
+    assert len(farm_server.received) <= 2
+
+
+class _TaskFramesPages(object):
+    """Answer the pages of the frames and record the concurrent requests."""
+
+    def __init__(self, frames, delays=None):
+        self.frames = frames
+        self.delays = delays or {}
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def __call__(self, body):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delays.get(body['pageNum'], 0.02))
+            size = body['pageSize']
+            start = (body['pageNum'] - 1) * size
+            return {'code': 200, 'message': 'success', 'data': {
+                'pageCount': (len(self.frames) + size - 1) // size,
+                'pageNum': body['pageNum'],
+                'total': len(self.frames),
+                'size': size,
+                'items': self.frames[start:start + size],
+            }}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def test_iter_task_frames(farm_connect, farm_server):
+    """Test the frames of all the pages are yielded in order."""
+    frames = [{'id': index} for index in range(95)]
+    pages = _TaskFramesPages(frames)
+    farm_server.responses['queryTaskFrames'] = pages
+    render_jobs = RenderJobs(farm_connect)
+    assert list(render_jobs.iter_task_frames(
+        '1658434', page_size=10, search_keyword='0-1',
+        max_workers=3)) == frames
+    assert len(farm_server.received) == 10
+    assert 1 < pages.max_active <= 3
+    assert farm_server.received[0][2] == {'taskId': '1658434', 'pageNum': 1,
+                                          'pageSize': 10,
+                                          'searchKeyword': '0-1'}
+    # The streamed pages are not kept by the cache of the connection.
+    assert len(farm_connect.cache) == 0
+
+
+def test_iter_task_frames_as_they_arrive(farm_connect, farm_server):
+    """Test the frames of a slow page do not hold the later ones."""
+    frames = [{'id': index} for index in range(4)]
+    farm_server.responses['queryTaskFrames'] = _TaskFramesPages(
+        frames, delays={2: 0.3})
+    render_jobs = RenderJobs(farm_connect)
+    frame_ids = [frame['id'] for frame in render_jobs.iter_task_frames(
+        '1', page_size=1, ordered=False)]
+    assert sorted(frame_ids) == [0, 1, 2, 3]
+    assert frame_ids[-1] == 1
+
+
+def test_iter_task_frames_single_page(farm_connect, farm_server):
+    """Test a task with a single page sends a single request."""
+    farm_server.responses['queryTaskFrames'] = _TaskFramesPages([{'id': 1}])
+    assert list(RenderJobs(farm_connect).iter_task_frames('1')) == [{'id': 1}]
+    assert len(farm_server.received) == 1
+
+
+def _task_info(body):
+    """Answer the details of the jobs, the job 404 fails its chunk."""
+    if 404 in body['taskIds']:
+        return {'code': 604, 'message': 'Query task failed.', 'data': {}}
+    return {'code': 200, 'message': 'success', 'data': {
+        'items': [{'id': job_id, 'taskStatus': 5}
+                  for job_id in body['taskIds']]}}
+
+
+def test_get_jobs_info(farm_connect, farm_server):
+    """Test the details of many jobs are queried by chunks and merged."""
+    farm_server.responses['queryTaskInfo'] = _task_info
+    jobs_id = list(range(1000, 3000)) + [1000, 1001]
+    result = RenderJobs(farm_connect).get_jobs_info(jobs_id, chunk_size=300)
+    assert result.ok
+    assert list(result.items) == list(range(1000, 3000))
+    assert len(farm_server.received) == 7
+    assert max(len(body['taskIds'])
+               for _, _, body in farm_server.received) == 300
+
+
+def test_get_jobs_info_failures(farm_connect, farm_server):
+    """Test a failed chunk is reported without losing the others."""
+    farm_server.responses['queryTaskInfo'] = _task_info
+    result = RenderJobs(farm_connect).get_jobs_info(list(range(400, 420)),
+                                                    chunk_size=5)
+    assert not result.ok
+    assert result.failed_ids == [400, 401, 402, 403, 404]
+    assert list(result.items) == list(range(405, 420))
+    assert isinstance(result.failures[0].error, RayvisionAPIError)
+    with pytest.raises(RayvisionAPIError):
+        result.raise_for_failures()
+
+
+def _control_jobs(rejected_id, failures=None):
+    """Answer the job controls, the ``rejected_id`` fails its chunk."""
+    failures = failures or {}
+
+    def _respond(body):
+        chunk = tuple(body['taskIds'])
+        if rejected_id in chunk:
+            return {'code': 604, 'message': 'Rejected.', 'data': {}}
+        if failures.get(chunk):
+            failures[chunk] -= 1
+            return {'code': 605, 'message': 'Busy.', 'data': {}}
+        return {'code': 200, 'message': 'success', 'data': {}}
+
+    return _respond
+
+
+def test_run_bulk(farm_connect, farm_server):
+    """Test the rejected IDs are isolated by retrying the failed chunks."""
+    farm_connect.retry = RetryPolicy(total=0, backoff_factor=0)
+    farm_server.responses['stopTask'] = _control_jobs(
+        13, failures={(30, 31, 32, 33, 34, 35, 36, 37, 38, 39): 1})
+    result = RenderJobs(farm_connect).run_bulk('stop_jobs', list(range(40)),
+                                               chunk_size=10)
+    assert result.failed_ids == [12, 13, 14]
+    assert sorted(result.succeeded_ids) == sorted(
+        set(range(40)) - {12, 13, 14})
+    assert isinstance(result.errors[13], RayvisionAPIError)
+    # 4 chunks, 2 halves of 2 failed chunks, 2 quarters of 1 failed half.
+    assert len(farm_server.received) == 4 + 4 + 2
+
+
+@pytest.mark.parametrize('operation, api_url, call_count', [
+    ('delete_jobs', ApiUrl.deleteTask, 1),
+    ('set_job_overtime_top', ApiUrl.setOverTimeStop, 3),
+])
+def test_run_bulk_unanswered(rayvision_connect, requests_mock, operation,
+                             api_url, call_count):
+    """Test a chunk sent without answer is only retried if idempotent."""
+    rayvision_connect.retry = RetryPolicy(total=0, backoff_factor=0)
+    history = requests_mock.post(
+        'https://{}{}'.format(rayvision_connect.domain, api_url),
+        exc=requests.exceptions.ReadTimeout)
+    kwargs = {'overtime': 1800} if operation == 'set_job_overtime_top' else {}
+    result = RenderJobs(rayvision_connect).run_bulk(operation, [1, 2],
+                                                    retries=1, **kwargs)
+    assert sorted(result.failed_ids) == [1, 2]
+    assert history.call_count == call_count
+
+
+def test_run_bulk_arguments(farm_connect, farm_server):
+    """Test the other arguments of the operation are sent with each chunk."""
+    farm_server.responses['setOverTimeStop'] = _control_jobs(None)
+    render_jobs = RenderJobs(farm_connect)
+    result = render_jobs.run_bulk('set_job_overtime_top', [1, 2, 3],
+                                  chunk_size=2, overtime=1800)
+    assert result.ok
+    assert sorted(body['overTime']
+                  for _, _, body in farm_server.received) == [1800, 1800]
+    with pytest.raises(ValueError):
+        render_jobs.run_bulk('update_priority', [1, 2, 3])
+
+
+def _create_task(body):
+    """Allocate consecutive task IDs."""
+    return {'code': 200, 'message': 'success', 'data': {
+        'taskIdList': list(range(5000, 5000 + body['count'])),
+        'aliasTaskIdList': [],
+        'userId': 100093088}}
+
+
+def test_submit_jobs(farm_connect, farm_server):
+    """Test the task IDs are allocated at once and the jobs submitted."""
+    farm_server.responses['createTask'] = _create_task
+    farm_server.responses['submitTask'] = lambda body: (
+        {'code': 604, 'message': 'Submit task failed.', 'data': {}}
+        if body['taskId'] == '5003' else
+        {'code': 200, 'message': 'success', 'data': {'id': body['taskId']}})
+    render_jobs = RenderJobs(farm_connect)
+    jobs_info = [{'task_info': {'frames': '1-10'}, 'shot': index}
+                 for index in range(6)]
+    submissions = render_jobs.submit_jobs(jobs_info, max_workers=3)
+    assert [submission.task_id for submission in submissions] == [
+        str(task_id) for task_id in range(5000, 5006)]
+    assert [submission.ok for submission in submissions] == [
+        True, True, True, False, True, True]
+    assert submissions[0].response == {'id': '5000'}
+    assert isinstance(submissions[3].error, RayvisionAPIError)
+    paths = [path.split('/')[-1] for path, _, _ in farm_server.received]
+    assert paths.count('createTask') == 1
+    assert paths.count('taskJsonFile') == 6
+    uploads = {body['taskId']: json.loads(body['content'])
+               for path, _, body in farm_server.received
+               if path.endswith('taskJsonFile')}
+    assert uploads['5002'] == jobs_info[2]
+    # The submission of ``submit_job`` is untouched.
+    assert not hasattr(render_jobs._local,  # pylint: disable=protected-access
+                       'submission')
+
+
+def test_upload_compressed(farm_connect, farm_server):
+    """Test the task info is uploaded compressed and compact."""
+    farm_connect.compress_min_size = 1024
+    job_info = {'scene_info': {'layers': [{'name': 'layer'}] * 1000}}
+    submissions = RenderJobs(farm_connect).submit_jobs([job_info],
+                                                       task_ids=['9'])
+    assert submissions[0].ok
+    headers, body = [(headers, body)
+                     for path, headers, body in farm_server.received
+                     if path.endswith('taskJsonFile')][0]
+    assert headers['Content-Encoding'] == 'gzip'
+    assert body['taskId'] == '9'
+    assert body['content'] == json.dumps(job_info, separators=(',', ':'))
+
+
+def test_submit_jobs_task_ids(farm_connect, farm_server):
+    """Test the jobs can be submitted to tasks allocated beforehand."""
+    render_jobs = RenderJobs(farm_connect)
+    submissions = render_jobs.submit_jobs([{}, {}], task_ids=['7', '8'])
+    assert [submission.task_id for submission in submissions] == ['7', '8']
+    assert all(submission.ok for submission in submissions)
+    assert not [path for path, _, _ in farm_server.received
+                if path.endswith('createTask')]
+    with pytest.raises(ValueError):
+        render_jobs.submit_jobs([{}, {}], task_ids=['7'])
+
+
+@pytest.fixture()
+def task_ids_server(farm_server):
+    """Allocate unique task IDs and keep the uploaded jobs by task."""
+    task_ids = itertools.count(9000)
+    lock = threading.Lock()
+    uploads = {}
+
+    def _create_task(body):
+        with lock:
+            ids = [next(task_ids) for _ in range(body['count'])]
+        return {'code': 200, 'message': 'success',
+                'data': {'taskIdList': ids}}
+
+    def _upload(body):
+        uploads[body['taskId']] = json.loads(body['content'])
+        return {'code': 200, 'message': 'success', 'data': {}}
+
+    farm_server.responses['createTask'] = _create_task
+    farm_server.responses['taskJsonFile'] = _upload
+    return uploads
+
+
+def test_task_id_until_submitted(farm_connect, task_ids_server):
+    """Test the task ID is kept until its job is submitted."""
+    render_jobs = RenderJobs(farm_connect)
+    task_id = render_jobs.task_id
+    assert render_jobs.task_id == task_id
+    assert render_jobs.submit_job({'shot': 1}, only_id=True) == task_id
+    assert task_ids_server[task_id] == {'shot': 1}
+    assert render_jobs.task_id != task_id
+
+
+def test_submission_context(farm_connect, task_ids_server):
+    """Test a submission uploads and submits to its own task."""
+    render_jobs = RenderJobs(farm_connect)
+    first = render_jobs.new_submission()
+    second = render_jobs.new_submission(task_id=42)
+    assert second.task_id == '42'
+    first.submit({'shot': 1})
+    second.submit({'shot': 2})
+    assert task_ids_server == {first.task_id: {'shot': 1},
+                               '42': {'shot': 2}}
+    with pytest.raises(ValueError):
+        first.submit({'shot': 1})
+
+
+def test_submit_job_from_threads(farm_connect, task_ids_server):
+    """Test the threads sharing the operator submit to their own task."""
+    render_jobs = RenderJobs(farm_connect)
+    submitted = {}
+    barrier = threading.Barrier(8)
+
+    def _submit(shot):
+        task_id = render_jobs.task_id
+        barrier.wait()
+        render_jobs.submit_job({'shot': shot, 'task_id': task_id})
+        submitted[shot] = task_id
+
+    threads = [threading.Thread(target=_submit, args=(shot,))
+               for shot in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(submitted.values())) == 8
+    for shot, task_id in submitted.items():
+        assert task_ids_server[task_id] == {'shot': shot, 'task_id': task_id}
@@ -0,0 +1,97 @@
+"""Test rayvision_api.retry.RetryPolicy functions."""
+
+# pylint: disable=import-error
+import pytest
+import requests
+
+from rayvision_api.exception import RayvisionAPIError
+from rayvision_api.retry import RetryPolicy
+from rayvision_api.url import ApiUrl
+
+
+def requests_mock_url(connect, api_url):
+    """str: The full url of the api url."""
+    return 'https://{}{}'.format(connect.domain, api_url)
+
+
+@pytest.fixture()
+def retry_connect(rayvision_connect):
+    """Get a connect which retries without sleeping."""
+    rayvision_connect.retry = RetryPolicy(total=3, backoff_factor=0)
+    return rayvision_connect
+
+
+def test_backoff_is_bounded():
+    """Test the delays grow exponentially up to the maximum."""
+    policy = RetryPolicy(backoff_factor=0.5, backoff_max=4, jitter=False)
+    assert [policy.get_backoff(attempt) for attempt in range(6)] == [
+        0.5, 1, 2, 4, 4, 4]
+
+
+def test_backoff_jitter():
+    """Test the jittered delays stay between zero and the bound."""
+    policy = RetryPolicy(backoff_factor=1, backoff_max=8)
+    delays = [policy.get_backoff(3) for _ in range(100)]
+    assert all(0 <= delay <= 8 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+@pytest.mark.parametrize('api_url,sent,expected', [
+    (ApiUrl.queryTaskInfo, True, True),
+    (ApiUrl.getTaskList, True, True),
+    (ApiUrl.createTask, True, False),
+    (ApiUrl.submitTask, True, False),
+    (ApiUrl.submitTask, False, True),
+])
+def test_should_retry(api_url, sent, expected):
+    """Test only the idempotent or unsent requests are replayed."""
+    policy = RetryPolicy(total=2)
+    assert policy.should_retry(api_url, 0, sent=sent) is expected
+    assert not policy.should_retry(api_url, 2, sent=sent)
+
+
+# pylint: disable=redefined-outer-name
+def test_retry_server_error(retry_connect, requests_mock):
+    """Test the idempotent request is re-signed and sent again."""
+    requests_mock.post(requests_mock_url(retry_connect, ApiUrl.queryTaskInfo),
+                       [{'status_code': 503},
+                        {'exc': requests.ConnectionError},
+                        {'json': {'code': 200, 'message': '',
+                                  'data': {'items': []}}}])
+    assert retry_connect.post(ApiUrl.queryTaskInfo,
+                              {'taskIds': [1]}) == {'items': []}
+    nonces = [request.headers['nonce']
+              for request in requests_mock.request_history]
+    assert len(nonces) == 3
+    signatures = set(request.headers['signature']
+                     for request in requests_mock.request_history)
+    assert len(signatures) == 3
+
+
+def test_retry_exhausted(retry_connect, requests_mock):
+    """Test the HTTP error is raised when the retries are exhausted."""
+    requests_mock.post(requests_mock_url(retry_connect, ApiUrl.queryTaskInfo),
+                       status_code=502, reason='Bad Gateway')
+    with pytest.raises(RayvisionAPIError) as err:
+        retry_connect.post(ApiUrl.queryTaskInfo, {'taskIds': [1]})
+    assert err.value.error_code == 502
+    assert requests_mock.call_count == 4
+
+
+def test_no_retry_for_submit(retry_connect, requests_mock):
+    """Test the non-idempotent request is not replayed."""
+    requests_mock.post(requests_mock_url(retry_connect, ApiUrl.submitTask),
+                       exc=requests.ConnectionError)
+    with pytest.raises(requests.ConnectionError):
+        retry_connect.post(ApiUrl.submitTask, {'taskId': '1'})
+    assert requests_mock.call_count == 1
+
+
+def test_retry_unsent_submit(retry_connect, requests_mock):
+    """Test the request is replayed if it never reached the server."""
+    requests_mock.post(requests_mock_url(retry_connect, ApiUrl.submitTask),
+                       [{'exc': requests.ConnectTimeout},
+                        {'json': {'code': 200, 'message': '', 'data': {}}}])
+    assert retry_connect.post(ApiUrl.submitTask, {'taskId': '1'}) == {}
+    assert requests_mock.call_count == 2
+
@@ -0,0 +1,75 @@
+"""Test the rayvision_api.schema_artifact functions."""
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api import schema_artifact
+from rayvision_api.file_operator import read_yaml
+from rayvision_api.paths import get_schema_artifact_file
+from rayvision_api.paths import get_schema_file
+
+
+@pytest.fixture()
+def schema_files(tmpdir):
+    """Get the paths of a schema file and of its artifact."""
+    schema_path = str(tmpdir.join('schema_v1.yaml'))
+    with open(schema_path, 'w') as file_object:
+        file_object.write('queryTaskInfo:\n'
+                          '  taskIds:\n'
+                          '    type: list\n')
+    artifact_path = str(tmpdir.join('schema_v1.json'))
+    schema_artifact.build_artifact(schema_path, artifact_path)
+    return schema_path, artifact_path
+
+
+def test_committed_artifact_is_fresh():
+    """Test the shipped artifact was built from the shipped schema file.
+
+    Run ``python -m rayvision_api.schema_artifact`` after editing the
+    schema file.
+
+    """
+    schema_path = get_schema_file('schema_v1')
+    artifact = schema_artifact.read_artifact(
+        get_schema_artifact_file('schema_v1'))
+    assert artifact is not None
+    assert schema_artifact.is_fresh(artifact, schema_path)
+    assert artifact['schemas'] == read_yaml(schema_path)
+
+
+# pylint: disable=redefined-outer-name
+def test_load_fresh_artifact(schema_files, mocker):
+    """Test the fresh artifact is loaded without parsing the YAML file."""
+    safe_load = mocker.patch('yaml.safe_load')
+    schemas = schema_artifact.load_schema_file(*schema_files)
+    assert schemas == {'queryTaskInfo': {'taskIds': {'type': 'list'}}}
+    assert not safe_load.called
+
+
+def test_load_stale_artifact(schema_files):
+    """Test the YAML file is parsed when the artifact is stale."""
+    schema_path, artifact_path = schema_files
+    with open(schema_path, 'a') as file_object:
+        file_object.write('    required: True\n')
+    assert schema_artifact.load_schema_file(schema_path, artifact_path) == {
+        'queryTaskInfo': {'taskIds': {'type': 'list', 'required': True}}}
+
+
+@pytest.mark.parametrize('content', [None, '', '{"format": 0}'])
+def test_load_invalid_artifact(schema_files, content):
+    """Test the YAML file is parsed when the artifact is missing."""
+    schema_path, artifact_path = schema_files
+    with open(artifact_path, 'w') as file_object:
+        file_object.write(content or '')
+    if content is None:
+        artifact_path += '.missing'
+    assert schema_artifact.load_schema_file(schema_path, artifact_path) == {
+        'queryTaskInfo': {'taskIds': {'type': 'list'}}}
+
+
+def test_load_artifact_without_schema_file(schema_files):
+    """Test the artifact is used when the YAML file is not shipped."""
+    schema_path, artifact_path = schema_files
+    schemas = schema_artifact.load_schema_file(schema_path + '.missing',
+                                               artifact_path)
+    assert schemas == {'queryTaskInfo': {'taskIds': {'type': 'list'}}}
@@ -0,0 +1,70 @@
+"""Test the rayvision_api.schema_compiler functions."""
+
+# pylint: disable=import-error
+from cerberus import Validator
+import pytest
+
+from rayvision_api.schema_compiler import compile_schema
+from rayvision_api.validator import SchemaRegistry
+
+SCHEMAS = SchemaRegistry().schemas
+
+# The values of every type, checked against every field.
+VALUES = [None, True, 0, 1.5, 'text', b'binary', [1], (1,), {'key': 1},
+          set([1])]
+
+
+def cerberus_errors(schema, document, update=False):
+    """dict: Get the errors of cerberus."""
+    validator = Validator(schema)
+    validator.allow_unknown = True
+    validator.validate(document, update=update)
+    return validator.errors
+
+
+@pytest.mark.parametrize('schema_name', sorted(SCHEMAS))
+def test_compiled_errors_match_cerberus(schema_name):
+    """Test the compiled schemas report the same errors as cerberus."""
+    schema = SCHEMAS[schema_name]
+    check = compile_schema(schema_name, schema)
+    if check is None:
+        assert schema_name in ('maya', 'houdini', 'clarisse')
+        return
+    documents = [{}, {'unknown': None}]
+    documents.extend({field: value for field in schema} for value in VALUES)
+    for field in schema:
+        documents.extend({field: value} for value in VALUES)
+    for document in documents:
+        for update in (False, True):
+            assert check(document, update) == cerberus_errors(
+                schema, document, update)
+
+
+def test_compiled_source():
+    """Test the source code of the compiled function is kept."""
+    check = compile_schema('queryTaskInfo',
+                           {'taskIds': {'type': 'list', 'required': True}})
+    assert check.__name__ == 'check_queryTaskInfo'
+    assert "['must be of list type']" in check.source
+    assert check({'taskIds': 'x'}) == {'taskIds': ['must be of list type']}
+
+
+@pytest.mark.parametrize('schema', [
+    {'taskIds': {'type': 'list', 'schema': {'type': 'integer'}}},
+    {'status': {'type': 'integer', 'allowed': [1, 2]}},
+    {'selectAll': {'type': 'ingeter'}},
+    {'taskIds': {'type': ['list', 'integer']}},
+])
+def test_not_compilable(schema):
+    """Test the schemas using other rules are left to cerberus."""
+    assert compile_schema('schema', schema) is None
+
+
+def test_registry_fast_path():
+    """Test the registry only validates the complex schemas by cerberus."""
+    registry = SchemaRegistry()
+    assert registry.get_check('queryTaskInfo') is not None
+    assert registry.get_check('maya') is None
+    assert registry.validate('queryTaskInfo', {'taskIds': 1}) == {
+        'taskIds': ['must be of list type']}
+    assert SchemaRegistry(fast_path=False).get_check('queryTaskInfo') is None
@@ -37,6 +37,71 @@ def test_generate_header_body_str(header):
     assert header_and_body == results
 
 
+def test_generate_header_body_str_without_copy(header, mocker):
+    """Test the headers and the body are neither copied nor modified."""
+    deepcopy = mocker.patch('copy.deepcopy')
+    header.update({'signature': '', 'Content-Type': 'application/json'})
+    body = {'renderEnvs': [{'envId': 1, 'pluginIds': [2, 3]}]}
+    results = ('[POST]tests.com:api_url&UTCTimestamp=32166266&accessId=xxx&'
+               'channel=4&nonce=1465&renderEnvs0.envId=1&'
+               'renderEnvs0.pluginIds0=2&renderEnvs0.pluginIds1=3&'
+               'render_platform=2&version=dev')
+    assert signature.generate_headers_body_str('tests.com', 'api_url',
+                                               header, body) == results
+    assert not deepcopy.called
+    assert header['signature'] == ''
+    assert body == {'renderEnvs': [{'envId': 1, 'pluginIds': [2, 3]}]}
+
+
+@pytest.mark.parametrize('body', [
+    {'key': 'value'},
+    {},
+    {'taskIds': [1, 2], 'selectAll': 0, 'ids': []},
+    {'renderEnvs': [{'envId': 1, 'pluginIds': [2, 3, 4]},
+                    {'envId': 3, 'pluginIds': [7, 8, 10]}]},
+    {'content': u'\u6e32\u67d3' * 100000, 'flag': True, 'none': None,
+     'price': 0.67},
+])
+def test_generate_headers_body_signature(header, body):
+    """Test the streamed signature matches the one of the whole string."""
+    msg = signature.generate_headers_body_str('tests.com', 'api_url', header,
+                                              body)
+    assert ''.join(signature.iter_headers_body_str(
+        'tests.com', 'api_url', header, body)) == msg
+    assert signature.generate_headers_body_signature(
+        'test_key', 'tests.com', 'api_url', header,
+        body) == signature.generate_signature('test_key', msg)
+
+
+@pytest.mark.parametrize('body', [
+    {},
+    {'taskIds': [1, 2], 'selectAll': 0},
+    {'renderEnvs': [{'envId': 1, 'pluginIds': [2, 3, 4]}]},
+    {'channel': 5, 'aaa': 'first', 'zzz': 'last'},
+    {'version': {'x': 1}},
+    {'content': 'x' * (signature.ENCODE_CHUNK_SIZE + 1), 'taskId': '1'},
+])
+def test_signing_context(header, body):
+    """Test the signing context gives the same signatures."""
+    context = signature.SigningContext('test_key', 'tests.com', header)
+    dynamic_headers = {'UTCTimestamp': '1584520000', 'nonce': '123456'}
+    headers = dict(header)
+    headers.update(dynamic_headers)
+    expected = signature.generate_headers_body_signature(
+        'test_key', 'tests.com', 'api_url', headers, body)
+    assert context.sign('api_url', dynamic_headers, body) == expected
+    # The keyed HMAC is copied, signing again gives the same result.
+    assert context.sign('api_url', dynamic_headers, body) == expected
+
+
+def test_signing_context_matches(header):
+    """Test the signing context knows the headers it was prepared for."""
+    context = signature.SigningContext('test_key', 'tests.com', header)
+    assert context.matches('tests.com', dict(header))
+    assert not context.matches('other.com', header)
+    assert not context.matches('tests.com', dict(header, version='2.0.0'))
+
+
 def test_headers_body_sort(header):
     """Test that we can get the correct headers sort."""
     sort_keys = list(
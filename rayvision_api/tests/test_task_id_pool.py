@@ -0,0 +1,160 @@
+"""Test rayvision_api.task_id_pool.TaskIdPool functions."""
+
+# Import built-in modules
+import itertools
+import threading
+import time
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api.exception import RayvisionAPIError
+from rayvision_api.task_id_pool import RETRY_DELAY
+from rayvision_api.task_id_pool import TaskIdPool
+
+
+class FakeRenderJobs(object):
+    """Create and delete the tasks in memory."""
+
+    def __init__(self, failures=0):
+        self._task_ids = itertools.count(1)
+        self.failures = failures
+        self.attempts = 0
+        self.created = []
+        self.deleted = []
+        self.created_event = threading.Event()
+        self.proceed = threading.Event()
+        self.proceed.set()
+
+    def create_task_ids(self, count):
+        self.attempts += 1
+        self.proceed.wait()
+        if self.failures:
+            self.failures -= 1
+            raise RayvisionAPIError(500, 'Create task failed.', '')
+        task_ids = [str(next(self._task_ids)) for _ in range(count)]
+        self.created.append(task_ids)
+        self.created_event.set()
+        return task_ids
+
+    def delete_jobs(self, task_ids):
+        self.deleted.extend(task_ids)
+
+
+def wait_for(predicate, timeout=2):
+    """Wait until the predicate is true."""
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline
+        time.sleep(0.005)
+
+
+@pytest.mark.parametrize('size, min_size', [(0, None), (4, 4), (4, 5),
+                                            (4, -1)])
+def test_invalid_sizes(size, min_size):
+    """Test the minimum size must be less than the size of the pool."""
+    with pytest.raises(ValueError):
+        TaskIdPool(FakeRenderJobs(), size=size, min_size=min_size)
+
+
+def test_refill_in_background():
+    """Test the pool is filled at once and refilled when running low."""
+    render_jobs = FakeRenderJobs()
+    with TaskIdPool(render_jobs, size=4, min_size=1) as pool:
+        wait_for(lambda: len(pool) == 4)
+        assert render_jobs.created == [['1', '2', '3', '4']]
+        assert [pool.acquire() for _ in range(3)] == ['1', '2', '3']
+        wait_for(lambda: len(pool) == 4)
+        assert render_jobs.created[1] == ['5', '6', '7']
+    # The unused tasks are deleted on shutdown.
+    assert render_jobs.deleted == ['4', '5', '6', '7']
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+
+def test_acquire_from_empty_pool():
+    """Test a task is created right away if the pool is empty."""
+    render_jobs = FakeRenderJobs()
+    pool = TaskIdPool(render_jobs, size=2)
+    assert pool.acquire() == '1'
+    assert pool.shutdown() == []
+
+
+def test_expiry(clock):
+    """Test the expired task IDs are discarded and deleted."""
+    render_jobs = FakeRenderJobs()
+    pool = TaskIdPool(render_jobs, size=2, min_size=0, max_age=60,
+                      clock=clock).start()
+    wait_for(lambda: len(pool) == 2)
+    clock.now += 60
+    # The expired IDs are skipped and a new task is created.
+    assert pool.acquire() == '3'
+    wait_for(lambda: len(render_jobs.created) == 3)
+    wait_for(lambda: len(pool) == 2)
+    assert render_jobs.deleted == ['1', '2']
+    assert sorted(pool.shutdown(release=False)) == ['4', '5']
+
+
+def test_refill_failure():
+    """Test a failed refill is reported and does not stop the pool."""
+    render_jobs = FakeRenderJobs(failures=1)
+    pool = TaskIdPool(render_jobs, size=1, min_size=0).start()
+    wait_for(lambda: pool.error is not None)
+    assert isinstance(pool.error, RayvisionAPIError)
+    assert pool.acquire() == '1'
+    pool.shutdown()
+
+
+def test_refill_backs_off(clock):
+    """Test the acquisitions do not retry a failed refill at once."""
+    render_jobs = FakeRenderJobs()
+    pool = TaskIdPool(render_jobs, size=3, min_size=2, clock=clock).start()
+    wait_for(lambda: len(pool) == 3)
+    render_jobs.failures = 10
+    assert pool.acquire() == '1'
+    wait_for(lambda: pool.error is not None)
+    assert pool.acquire() == '2'
+    time.sleep(0.05)
+    assert render_jobs.attempts == 2
+    render_jobs.failures = 0
+    clock.now += RETRY_DELAY
+    assert pool.acquire() == '3'
+    wait_for(lambda: len(pool) == 3)
+    assert render_jobs.attempts == 3
+    assert pool.error is None
+    pool.shutdown()
+
+
+def test_shutdown_during_refill():
+    """Test the IDs of a refill finished after the shutdown are deleted."""
+    render_jobs = FakeRenderJobs()
+    render_jobs.proceed.clear()
+    pool = TaskIdPool(render_jobs, size=2).start()
+    wait_for(lambda: render_jobs.attempts == 1)
+    assert pool.shutdown(wait=False) == []
+    render_jobs.proceed.set()
+    wait_for(lambda: render_jobs.deleted == ['1', '2'])
+    assert len(pool) == 0
+
+
+def test_render_jobs_pool(farm_connect, farm_server):
+    """Test the submissions take their task ID from the pool."""
+    from rayvision_api.operators import RenderJobs
+
+    task_ids = itertools.count(100)
+    farm_server.responses['createTask'] = lambda body: {
+        'code': 200, 'message': 'success',
+        'data': {'taskIdList': [next(task_ids)
+                                for _ in range(body['count'])]}}
+    render_jobs = RenderJobs(farm_connect)
+    pool = render_jobs.start_task_id_pool(size=3)
+    wait_for(lambda: len(pool) == 3)
+    del farm_server.received[:]
+    assert render_jobs.submit_job({}, only_id=True) == '100'
+    paths = [path.split('/')[-1] for path, _, _ in farm_server.received]
+    assert paths[:2] == ['taskJsonFile', 'submitTask']
+    assert sorted(render_jobs.stop_task_id_pool()) == ['101', '102']
+    assert render_jobs.task_id_pool is None
+    deleted = [body['taskIds'] for path, _, body in farm_server.received
+               if path.endswith('deleteTask')]
+    assert sorted(deleted[0]) == ['101', '102']
@@ -1,5 +1,8 @@
 """Test rayvision_api.UserOperator.UserOperator functions."""
 
+# Import built-in modules
+import threading
+
 # pylint: disable=import-error
 import pytest
 
@@ -83,3 +86,78 @@ def test_get_raysync_user_key(user_profile, mock_requests):
     assert info['raySyncUserKey'] == '8ccb94d67c1e4c17fd0691c02ab7f753cea64e3d'
     assert info['userName'] == 'test'
     assert info['platform'] == 2
+
+
+@pytest.fixture()
+def login_responses(farm_server):
+    """Answer the three queries of the login."""
+    farm_server.responses.update({
+        'queryUserProfile': {'data': {'userId': 100, 'userName': 'ray'}},
+        'queryUserSetting': {'data': {'taskOverTime': 12}},
+        'getTransferBid': {'data': {'input_bid': '10201'}},
+    })
+    return farm_server
+
+
+def test_deferred_login(farm_connect, login_responses):
+    """Test the profile is loaded once, on the first access."""
+    user_profile = UserProfile(farm_connect)
+    assert login_responses.received == []
+    assert user_profile.user_name == 'ray'
+    assert user_profile.task_over_time == 12
+    assert user_profile.input_bid == '10201'
+    assert user_profile.id == 100
+    assert sorted(path.split('/')[-1]
+                  for path, _, _ in login_responses.received) == [
+                      'getTransferBid', 'queryUserProfile', 'queryUserSetting']
+
+
+def test_no_login_for_private_attributes(farm_connect, login_responses):
+    """Test the special attributes do not load the profile."""
+    user_profile = UserProfile(farm_connect)
+    assert not hasattr(user_profile, '__getstate_missing__')
+    assert login_responses.received == []
+    with pytest.raises(AttributeError):
+        user_profile.missing_attribute  # pylint: disable=pointless-statement
+    assert len(login_responses.received) == 3
+
+
+def test_prefetch_is_concurrent(farm_connect, login_responses):
+    """Test the three queries of the prefetch are sent at the same time."""
+    barrier = threading.Barrier(3, timeout=5)
+
+    def _respond(data):
+        def _wait(_):
+            barrier.wait()
+            return {'code': 200, 'message': 'success', 'data': data}
+        return _wait
+
+    login_responses.responses.update({
+        'queryUserProfile': _respond({'userId': 100, 'userName': 'ray'}),
+        'queryUserSetting': _respond({'taskOverTime': 12}),
+        'getTransferBid': _respond({'input_bid': '10201'}),
+    })
+    user_profile = UserProfile(farm_connect, auto_login=False)
+    profile = user_profile.prefetch()
+    assert profile['user_name'] == 'ray'
+    assert profile['task_over_time'] == 12
+    assert not barrier.broken
+    # The loaded profile is not queried again.
+    assert user_profile.input_bid == '10201'
+    assert len(login_responses.received) == 3
+
+
+def test_attribute_index(rayvision_connect):
+    """Test the loaded information is indexed as attributes."""
+    user_profile = UserProfile(rayvision_connect, auto_login=False)
+    with pytest.raises(AttributeError):
+        user_profile.user_name  # pylint: disable=pointless-statement
+    # pylint: disable=protected-access
+    user_profile._merge_user_info([{'userName': 'ray', 'login': 'user',
+                                    'userId': 100}])
+    assert vars(user_profile)['user_name'] == 'ray'
+    assert user_profile.user_name == 'ray'
+    assert user_profile.id == 100
+    # The methods of the class are not shadowed by the information.
+    assert callable(user_profile.login)
+    assert user_profile.profile['login'] == 'user'
@@ -0,0 +1,76 @@
+"""Test the rayvision_api.validator functions."""
+
+# Import built-in modules
+import threading
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api import validator
+
+
+@pytest.fixture()
+def load_schemas(mocker):
+    """Count the loads of the schemas."""
+    return mocker.spy(validator, 'load_schemas')
+
+
+@pytest.fixture()
+def registry(mocker):
+    """Use a new registry of the schemas."""
+    new_registry = validator.SchemaRegistry()
+    mocker.patch.object(validator, 'registry', new_registry)
+    return new_registry
+
+
+# pylint: disable=redefined-outer-name
+@pytest.mark.usefixtures('registry')
+def test_schemas_loaded_once(load_schemas):
+    """Test the schemas are loaded once for all the requests."""
+    for _ in range(3):
+        validator.validate_data({'taskIds': [1]}, 'queryTaskInfo')
+        validator.validate_data({'taskId': '1'}, 'queryTaskFrames')
+    assert load_schemas.call_count == 1
+
+
+def test_validator_prepared_once(registry):
+    """Test one validator is prepared per schema name."""
+    assert (registry.get_validator('queryTaskInfo') is
+            registry.get_validator('queryTaskInfo'))
+    assert (registry.get_validator('queryTaskInfo') is not
+            registry.get_validator('queryTaskFrames'))
+
+
+@pytest.mark.usefixtures('registry')
+def test_validation_failure():
+    """Test the errors of the data are reported."""
+    with pytest.raises(ValueError) as error:
+        validator.validate_data({'taskIds': 1}, 'queryTaskInfo')
+    assert "{'taskIds': ['must be of list type']}" in str(error.value)
+    # The failure does not leak into the next validation.
+    assert validator.validate_data({'taskIds': [1]}, 'queryTaskInfo') == {
+        'taskIds': [1]}
+
+
+@pytest.mark.usefixtures('registry')
+def test_concurrent_validation(load_schemas):
+    """Test the threads share the validators safely."""
+    errors = []
+
+    def _validate(index):
+        for _ in range(50):
+            data = {'taskIds': [index]} if index % 2 else {'taskIds': index}
+            try:
+                validator.validate_data(data, 'queryTaskInfo')
+            except ValueError:
+                errors.append(index)
+
+    threads = [threading.Thread(target=_validate, args=(index,))
+               for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(set(errors)) == [0, 2, 4, 6]
+    assert len(errors) == 4 * 50
+    assert load_schemas.call_count == 1
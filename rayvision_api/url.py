@@ -62,3 +62,35 @@ class ApiUrl(str, Enum):
     fullSpeed = '/api/render/task/fullSpeed'
     taskJsonFile = '/api/render/task/taskJsonFile'
 
+    def __str__(self):
+        """str: The path of the API, even when formatted on Python 3.11+."""
+        return self.value
+
+
+# The API urls which are safe to send again after a transient failure: the
+# queries, and the updates which set a value (setting it twice has the same
+# effect as once).
+IDEMPOTENT_API_URLS = frozenset([
+    ApiUrl.queryPlatforms,
+    ApiUrl.queryUserProfile,
+    ApiUrl.queryUserSetting,
+    ApiUrl.getTransferBid,
+    ApiUrl.queryErrorDetail,
+    ApiUrl.getTaskList,
+    ApiUrl.queryTaskFrames,
+    ApiUrl.queryAllFrameStats,
+    ApiUrl.queryTaskInfo,
+    ApiUrl.getLabelList,
+    ApiUrl.querySupportedSoftware,
+    ApiUrl.querySupportedPlugin,
+    ApiUrl.getRenderEnv,
+    ApiUrl.getRaySyncUserKey,
+    ApiUrl.getTransferServerMsg,
+    ApiUrl.loadTaskProcessImg,
+    ApiUrl.loadingFrameThumbnail,
+    ApiUrl.updateUserSetting,
+    ApiUrl.setDefaultRenderEnv,
+    ApiUrl.updateTaskUserLevel,
+    ApiUrl.setOverTimeStop,
+    ApiUrl.taskJsonFile,
+])
@@ -1,17 +1,148 @@
 # Import built-in modules
 from pprint import pformat
+import threading
 try:
-    from functools import lru_cache
+    from collections.abc import Mapping
 except ImportError:
-    from backports.functools_lru_cache import lru_cache
-
-# Import third-party modules
-from cerberus import Validator
+    from collections import Mapping
 
 # Import local modules
-from rayvision_api.file_operator import read_yaml
 from rayvision_api.constants import API_VERSION
-from rayvision_api.paths import get_schema_file
+from rayvision_api.schema_artifact import load_schemas
+from rayvision_api.schema_compiler import compile_schema
+
+
+def new_validator(schema):
+    """Create a cerberus validator allowing the unknown fields.
+
+    cerberus is imported by the first validation it is needed for.
+
+    Args:
+        schema (dict): The schema of a request.
+
+    Returns:
+        cerberus.Validator: The validator.
+
+    """
+    from cerberus import Validator
+    validator = Validator(schema)
+    validator.allow_unknown = True
+    return validator
+
+
+class SchemaRegistry(object):
+    """The thread-safe registry of the validators of an api version.
+
+    The schemas are loaded once and one validator is prepared per schema
+    name the first time it is used. The simple schemas are compiled into
+    check functions, the others are validated by cerberus. A cerberus
+    validator keeps the state of the document being validated, so each
+    validator is used under its own lock.
+
+    """
+
+    def __init__(self, api_version=API_VERSION, fast_path=True):
+        """Initialize the registry.
+
+        Args:
+            api_version (str, optional): The version of the api schema.
+            fast_path (bool, optional): Whether the simple schemas are
+                compiled, cerberus validates all of them otherwise.
+
+        """
+        self._api_version = api_version
+        self._fast_path = fast_path
+        self._lock = threading.Lock()
+        self._schemas = None
+        self._validators = {}
+        self._checks = {}
+
+    @property
+    def schemas(self):
+        """dict: The schemas of the api version, by schema name."""
+        if self._schemas is None:
+            with self._lock:
+                if self._schemas is None:
+                    self._schemas = self._load_schemas()
+        return self._schemas
+
+    def _load_schemas(self):
+        """dict: Load the schemas of the api version."""
+        try:
+            return load_schemas(self._api_version)
+        except IOError:
+            raise ValueError("No schema found that matches the current"
+                             " version {} of api.".format(self._api_version))
+
+    def get_validator(self, schema_name):
+        """Get the validator of a schema and its lock.
+
+        Args:
+            schema_name (str): The name of the schema.
+
+        Returns:
+            tuple: The ``cerberus.Validator`` and the ``threading.Lock`` to
+                hold while using it.
+
+        """
+        try:
+            return self._validators[schema_name]
+        except KeyError:
+            pass
+        schema = self.schemas[schema_name]
+        with self._lock:
+            if schema_name not in self._validators:
+                validator = new_validator(schema)
+                self._validators[schema_name] = (validator, threading.Lock())
+            return self._validators[schema_name]
+
+    def get_check(self, schema_name):
+        """Get the compiled check function of a schema.
+
+        Args:
+            schema_name (str): The name of the schema.
+
+        Returns:
+            callable: The check function, None if the schema is validated by
+                cerberus.
+
+        """
+        try:
+            return self._checks[schema_name]
+        except KeyError:
+            pass
+        schema = self.schemas[schema_name]
+        check = None
+        if self._fast_path:
+            check = compile_schema(schema_name, schema)
+        with self._lock:
+            return self._checks.setdefault(schema_name, check)
+
+    def validate(self, schema_name, document, update=False):
+        """Validate a document against a schema.
+
+        Args:
+            schema_name (str): The name of the schema.
+            document (dict): The data to validate.
+            update (bool, optional): If True, required fields won't be
+                checked.
+
+        Returns:
+            dict: The errors by field name, empty if the document is valid.
+
+        """
+        check = self.get_check(schema_name)
+        if check is not None and isinstance(document, Mapping):
+            return check(document, update)
+        validator, lock = self.get_validator(schema_name)
+        with lock:
+            if validator.validate(document, update=update):
+                return {}
+            return validator.errors
+
+
+# The registry of the current api version.
+registry = SchemaRegistry()
 
 
 class DataValidator(object):
@@ -21,17 +152,7 @@ class DataValidator(object):
         self._data = data
         self._schema_name = schema_name
         self._api_version = API_VERSION
-        self._schema = schema or self._get_schema()
-
-    @lru_cache(maxsize=2)
-    def _get_schema(self):
-        """dict: get the schema form current api version."""
-        file_path = get_schema_file("schema_v{}".format(self._api_version))
-        try:
-            return read_yaml(file_path)
-        except IOError:
-            raise ValueError("No schema found that matches the current"
-                             " version {} of api.".format(self._api_version))
+        self._schema = schema
 
     def validate(self, ignore_required=False):
         """Validate itself against the internal schema.
@@ -44,9 +165,6 @@ class DataValidator(object):
             ValueError: If validation fails.
 
         """
-        validator = Validator(self._schema[self._schema_name])
-        validator.allow_unknown = True
-
         def _validate(dict_, update):
             """Run the actual validator.
 
@@ -58,9 +176,14 @@ class DataValidator(object):
                 ValueError: If validation fails.
 
             """
-            if not validator.validate(dict_, update=update):
-                msg = 'Validation failure(s): {0}'.format(
-                    validator.errors)
+            if self._schema is None:
+                errors = registry.validate(self._schema_name, dict_, update)
+            else:
+                validator = new_validator(self._schema[self._schema_name])
+                validator.validate(dict_, update=update)
+                errors = validator.errors
+            if errors:
+                msg = 'Validation failure(s): {0}'.format(errors)
                 raise ValueError(msg)
 
         _validate(self.data, ignore_required)
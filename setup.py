@@ -18,10 +18,18 @@ setup(
     url='https://gitlab.renderbus.com/internal/rayvision_api',
     package_dir={'': '.'},
     packages=find_packages('.'),
+    package_data={'rayvision_api': ['schemas/*.yaml', 'schemas/*.json']},
     description=('A Python-based API for Using Renderbus cloud rendering '
                  'service.'),
-    entry_points={},
+    entry_points={
+        'console_scripts': [
+            'rayvision-api-cache = rayvision_api.disk_cache:main',
+        ],
+    },
     install_requires=list(parse_requirements('requirements.txt')),
+    extras_require={
+        'async': ['aiohttp; python_version >= "3.6"'],
+    },
     classifiers=[
         'Programming Language :: Python',
         'Programming Language :: Python :: 2',